@@ -0,0 +1,52 @@
+"""Shared httpx.AsyncClient for the async cloud provider clients.
+
+AsyncGroq, AsyncOpenAI and the Gemini aio client all send requests through
+one connection pool, so keep-alive connections (and their TLS sessions) are
+reused across providers and requests. Requests are awaited on the event loop;
+no executor thread is held while waiting on the network.
+
+httpx pools are bound to the event loop that opened them, so a new client is
+created if the running loop changes (tests, benchmarks calling asyncio.run).
+"""
+
+import asyncio
+
+import httpx
+
+# Concurrent dictations are few, but chunked transcription and hedging fan
+# out; keep enough warm connections that a burst never pays a TLS handshake
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 120.0  # seconds; dictations are often minutes apart
+
+# Provider clients pass their own per-request timeout; this is the fallback
+TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """The shared client for the running event loop (must be called from it)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=TIMEOUT,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_async_http_client() -> None:
+    """Close the shared client (server shutdown)."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -5,9 +5,12 @@ Centralizes audio handling for all STT providers:
 - RMS volume calculation
 - Dynamic range compression (volume normalization)
 - Audio preprocessing pipeline
+- Pause-aligned splitting of long recordings
 """
 
+import random
 import struct
+from functools import lru_cache
 from math import gcd
 
 import numpy as np
@@ -18,6 +21,9 @@ from settings import get_min_volume_rms, get_setting
 WAV_HEADER_SIZE = 44  # Minimum header size (RIFF + fmt + data headers, no extra chunks)
 SAMPLE_RATE = 16000
 
+# Noise padding: segments are sliced from a precomputed pool per amplitude
+NOISE_POOL_SECONDS = 5
+
 
 def _find_wav_data_offset(audio_data: bytes) -> int:
     """Find the offset where PCM sample data begins in a WAV file.
@@ -61,7 +67,11 @@ def _rebuild_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
     metadata chunks that might confuse strict parsers like miniaudio.
     """
     data_bytes = samples.astype(np.int16).tobytes()
-    data_size = len(data_bytes)
+    return _wav_header(len(data_bytes), sample_rate) + data_bytes
+
+
+def _wav_header(data_size: int, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Build the 44-byte header for a mono 16-bit PCM WAV payload of data_size bytes."""
     header = bytearray(44)
     struct.pack_into("4s", header, 0, b"RIFF")
     struct.pack_into("<I", header, 4, 36 + data_size)
@@ -76,11 +86,73 @@ def _rebuild_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
     struct.pack_into("<H", header, 34, 16)  # bits per sample
     struct.pack_into("4s", header, 36, b"data")
     struct.pack_into("<I", header, 40, data_size)
-    return bytes(header) + data_bytes
+    return bytes(header)
+
+
+def as_int16_samples(audio: bytes | np.ndarray) -> np.ndarray:
+    """Get int16 samples from WAV bytes (zero-copy view) or a sample array.
+
+    Float arrays are taken to be in [-1, 1] and scaled to int16.
+    """
+    if isinstance(audio, np.ndarray):
+        if np.issubdtype(audio.dtype, np.floating):
+            return np.clip(audio * 32768.0, -32768, 32767).astype(np.int16)
+        return audio.astype(np.int16, copy=False)
+
+    data_offset = _find_wav_data_offset(audio)
+    return np.frombuffer(
+        audio,
+        dtype=np.int16,
+        offset=data_offset,
+        count=max(0, len(audio) - data_offset) // 2,
+    )
+
+
+def as_float32_samples(audio: bytes | np.ndarray) -> np.ndarray:
+    """Get float32 samples in [-1, 1] from WAV bytes or a sample array.
+
+    This is the form the MLX models consume (same scaling as their own
+    WAV loaders), so passing it skips the temp file and the decode step.
+    """
+    if isinstance(audio, np.ndarray) and audio.dtype == np.float32:
+        return audio
+    samples = as_int16_samples(audio)
+    return samples.astype(np.float32) / np.float32(32768.0)
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(
+    up: int, down: int, dtype: str = "float64"
+) -> tuple[np.ndarray, int]:
+    """Design (once per rate pair) the anti-aliasing filter used by resample_poly.
+
+    Mirrors resample_poly's defaults (Kaiser window, beta=5.0, half length
+    10 * max(up, down)) so results match scipy exactly. The returned taps are
+    shared between callers and marked read-only.
+
+    Returns:
+        (taps, n_pre_remove): zero-padded filter taps and the number of
+        leading upfirdn outputs to discard
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+
+    # Zero-pad the front so output samples sit at the filter center
+    n_pre_pad = down - half_len % down
+    n_pre_remove = (half_len + n_pre_pad) // down
+    taps = np.concatenate((np.zeros(n_pre_pad), taps)).astype(dtype)
+    taps.flags.writeable = False
+    return taps, n_pre_remove
 
 
 def resample_to_16k(
-    audio: np.ndarray, original_rate: int, target_rate: int = SAMPLE_RATE
+    audio: np.ndarray,
+    original_rate: int,
+    target_rate: int = SAMPLE_RATE,
+    dtype: type = np.float64,
 ) -> np.ndarray:
     """Resample audio from original_rate to target_rate using polyphase filtering.
 
@@ -88,10 +160,15 @@ def resample_to_16k(
     preventing the noise artifacts that occur when PortAudio does real-time
     resampling from a mic's native rate (e.g. 48kHz) to 16kHz.
 
+    The filter (same design as scipy's resample_poly) is cached per rate
+    pair, so repeated calls skip the FIR design step.
+
     Args:
         audio: Audio samples as np.int16 array
         original_rate: Source sample rate (e.g. 48000)
         target_rate: Target sample rate (default: 16000)
+        dtype: Working precision. np.float64 (default) matches resample_poly
+            exactly; np.float32 is faster and stays within 1 LSB of it.
 
     Returns:
         Resampled np.int16 array at target_rate
@@ -104,7 +181,7 @@ def resample_to_16k(
             f"Sample rates must be positive: original={original_rate}, target={target_rate}"
         )
 
-    from scipy.signal import resample_poly
+    from scipy.signal import upfirdn
 
     # Calculate up/down factors, reduced by GCD
     # e.g., 48000->16000: gcd=16000, up=1, down=3
@@ -112,15 +189,116 @@ def resample_to_16k(
     g = gcd(target_rate, original_rate)
     up = target_rate // g
     down = original_rate // g
+    taps, n_pre_remove = _polyphase_filter(up, down, np.dtype(dtype).name)
 
-    # Process in float64 for precision, resample with anti-aliasing filter
-    resampled = resample_poly(audio.astype(np.float64), up, down)
+    # Filter, then drop the filter delay (equivalent to resample_poly)
+    n_out = -(-len(audio) * up // down)  # ceil
+    filtered = upfirdn(taps, audio.astype(dtype), up, down)
+    resampled = filtered[n_pre_remove : n_pre_remove + n_out]
 
     # Clip to int16 range (filter overshoot can exceed original range)
     np.clip(resampled, -32768, 32767, out=resampled)
     return resampled.astype(np.int16)
 
 
+class StreamingResampler:
+    """Incremental polyphase resampler with the same output as resample_to_16k().
+
+    Feed audio chunks as they are captured with process(); each call returns
+    the output samples whose filter window is already complete, and keeps the
+    input history needed for the next ones. flush() returns the remaining
+    tail. The concatenated outputs are identical to resampling the whole
+    recording at once, so the work happens while the user is still speaking.
+
+    Usage:
+        resampler = StreamingResampler(48000)
+        parts = [resampler.process(chunk) for chunk in chunks]
+        parts.append(resampler.flush())
+        audio_16k = np.concatenate(parts)
+    """
+
+    def __init__(self, original_rate: int, target_rate: int = SAMPLE_RATE):
+        if original_rate <= 0 or target_rate <= 0:
+            raise ValueError(
+                f"Sample rates must be positive: original={original_rate}, target={target_rate}"
+            )
+
+        self.original_rate = original_rate
+        self.target_rate = target_rate
+
+        g = gcd(target_rate, original_rate)
+        self._up = target_rate // g
+        self._down = original_rate // g
+        self._passthrough = original_rate == target_rate
+        if not self._passthrough:
+            self._taps, self._n_pre_remove = _polyphase_filter(self._up, self._down)
+        self._reset()
+
+    def _reset(self) -> None:
+        """Clear stream state so the instance can be reused."""
+        # Retained input; _buffer_start is its absolute index and is kept a
+        # multiple of `down` so upfirdn on the buffer stays phase-aligned
+        self._buffer = np.zeros(0, dtype=np.float64)
+        self._buffer_start = 0
+        self._received = 0
+        # Next upfirdn output index to emit (the first n_pre_remove are dropped)
+        self._next_output = 0 if self._passthrough else self._n_pre_remove
+
+    def _emit(self, stop: int) -> np.ndarray:
+        """Return upfirdn outputs [_next_output, stop) as int16, trimming history."""
+        if stop <= self._next_output:
+            return np.zeros(0, dtype=np.int16)
+
+        from scipy.signal import upfirdn
+
+        up, down = self._up, self._down
+        filtered = upfirdn(self._taps, self._buffer, up, down)
+        offset = self._buffer_start * up // down
+        out = filtered[self._next_output - offset : stop - offset]
+        self._next_output = stop
+
+        # Drop input that no future output's filter window reaches
+        keep_from = max(0, stop * down - (len(self._taps) - 1)) // up
+        keep_from -= keep_from % down
+        if keep_from > self._buffer_start:
+            self._buffer = self._buffer[keep_from - self._buffer_start :]
+            self._buffer_start = keep_from
+
+        np.clip(out, -32768, 32767, out=out)
+        return out.astype(np.int16)
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Add a chunk of int16 samples and return the newly completed output.
+
+        Accepts 1-D arrays or (frames, 1) arrays as delivered by sounddevice.
+        """
+        chunk = np.asarray(chunk).reshape(-1)
+        self._received += len(chunk)
+        if self._passthrough:
+            return chunk.astype(np.int16, copy=True)
+
+        self._buffer = np.concatenate((self._buffer, chunk.astype(np.float64)))
+        # Output k is complete once input floor(k * down / up) has arrived
+        ready = (self._received * self._up - 1) // self._down + 1
+        return self._emit(ready)
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining output (input treated as zero past the end) and reset."""
+        if self._passthrough or self._received == 0:
+            self._reset()
+            return np.zeros(0, dtype=np.int16)
+
+        up, down = self._up, self._down
+        n_out = -(-self._received * up // down)  # ceil
+        # Trailing zeros let upfirdn produce the last outputs' full windows
+        self._buffer = np.concatenate(
+            (self._buffer, np.zeros(len(self._taps) // up + down))
+        )
+        out = self._emit(n_out + self._n_pre_remove)
+        self._reset()
+        return out
+
+
 def calculate_audio_rms(audio_data: bytes) -> float:
     """Calculate RMS (root mean square) volume of WAV audio data.
 
@@ -199,18 +377,80 @@ def normalize_audio(
     return _rebuild_wav(samples_out), current_rms, gain_db, final_rms
 
 
+@lru_cache(maxsize=4)
+def _noise_pool(noise_amplitude: float) -> np.ndarray:
+    """Precomputed int16 Gaussian noise at the given amplitude (read-only)."""
+    rng = np.random.default_rng()
+    pool = (
+        rng.standard_normal(NOISE_POOL_SECONDS * SAMPLE_RATE) * noise_amplitude
+    ).astype(np.int16)
+    pool.flags.writeable = False
+    return pool
+
+
+def _noise_segment(num_samples: int, noise_amplitude: float) -> np.ndarray:
+    """Slice num_samples of noise from a random offset in the pool."""
+    pool = _noise_pool(float(noise_amplitude))
+    if num_samples > len(pool):
+        # Longer than the pool (unusual): generate fresh noise
+        rng = np.random.default_rng()
+        return (rng.standard_normal(num_samples) * noise_amplitude).astype(np.int16)
+    start = random.randrange(len(pool) - num_samples + 1)
+    return pool[start : start + num_samples]
+
+
+def pad_samples_with_noise(
+    samples: np.ndarray,
+    pre_samples: int,
+    post_samples: int,
+    noise_amplitude: float = 30.0,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Write noise + samples + noise into one output array.
+
+    Args:
+        samples: int16 signal
+        pre_samples: Noise samples before the signal
+        post_samples: Noise samples after the signal
+        noise_amplitude: Noise standard deviation in int16 units
+        out: Optional preallocated int16 array of exactly
+            pre_samples + len(samples) + post_samples elements (e.g. a view
+            into a WAV payload). Allocated if not given.
+
+    Returns:
+        The padded array (`out` when provided)
+    """
+    total = pre_samples + len(samples) + post_samples
+    if out is None:
+        out = np.empty(total, dtype=np.int16)
+    elif len(out) != total:
+        raise ValueError(f"Output has {len(out)} samples, expected {total}")
+
+    # One slice split in two, so leading and trailing noise never repeat
+    noise = _noise_segment(pre_samples + post_samples, noise_amplitude)
+    end = pre_samples + len(samples)
+    out[:pre_samples] = noise[:pre_samples]
+    out[pre_samples:end] = samples
+    out[end:] = noise[pre_samples:]
+    return out
+
+
 def add_noise_padding(
     audio_data: bytes,
     pre_ms: int = 200,
     post_ms: int = 300,
     noise_amplitude: float = 30.0,
-) -> bytes:
+) -> bytes | bytearray:
     """Add low-level noise padding before and after audio.
 
     Unlike zero-silence padding, noise padding mimics ambient mic noise.
     This prevents Gemma 4 from hallucinating at speech boundaries — the model
     was trained on real-world audio with natural ambient noise, not digital silence.
 
+    Noise comes from a precomputed pool (random offset per call) and is written
+    with the signal straight into one preallocated WAV buffer, so there is no
+    RNG pass or intermediate array per request.
+
     Args:
         audio_data: Raw WAV file bytes (with valid WAV header)
         pre_ms: Milliseconds of noise to add before audio
@@ -219,23 +459,104 @@ def add_noise_padding(
             roughly -60dB, similar to ambient mic self-noise)
 
     Returns:
-        Padded WAV bytes with clean 44-byte header
+        Padded WAV with clean 44-byte header, as the bytearray it was built in
+        (not copied to bytes)
     """
     if len(audio_data) <= WAV_HEADER_SIZE:
         return audio_data
 
-    data_offset = _find_wav_data_offset(audio_data)
-    samples = np.frombuffer(audio_data[data_offset:], dtype=np.int16)
+    samples = as_int16_samples(audio_data)
 
     pre_samples = (pre_ms * SAMPLE_RATE) // 1000
     post_samples = (post_ms * SAMPLE_RATE) // 1000
+    total = pre_samples + len(samples) + post_samples
 
-    rng = np.random.default_rng()
-    pre_noise = (rng.standard_normal(pre_samples) * noise_amplitude).astype(np.int16)
-    post_noise = (rng.standard_normal(post_samples) * noise_amplitude).astype(np.int16)
+    wav = bytearray(WAV_HEADER_SIZE + total * 2)
+    wav[:WAV_HEADER_SIZE] = _wav_header(total * 2)
+    payload = np.frombuffer(wav, dtype=np.int16, offset=WAV_HEADER_SIZE)
+    pad_samples_with_noise(
+        samples, pre_samples, post_samples, noise_amplitude, out=payload
+    )
+    return wav
 
-    padded = np.concatenate([pre_noise, samples, post_noise])
-    return _rebuild_wav(padded)
+
+def split_at_pauses(
+    samples: np.ndarray,
+    target_duration: float = 30.0,
+    search_window: float = 5.0,
+    overlap: float = 0.5,
+    frame_ms: int = 30,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[tuple[int, int]]:
+    """Split audio into chunks, cutting at the quietest point near each target.
+
+    Each cut is placed at the lowest-energy frame within +/- search_window
+    seconds of the ideal boundary, so words are rarely split. Every chunk
+    after the first starts `overlap` seconds before its cut, giving the
+    merge step some shared context to de-duplicate.
+
+    Args:
+        samples: Audio samples as np.int16 array
+        target_duration: Preferred chunk length in seconds
+        search_window: How far (seconds) a cut may move to find a pause
+        overlap: Seconds of audio shared between consecutive chunks
+        frame_ms: Energy analysis frame size in milliseconds
+        sample_rate: Sample rate of `samples`
+
+    Returns:
+        List of (start, end) sample indices covering the whole input
+    """
+    total = len(samples)
+    target = int(target_duration * sample_rate)
+    if total <= target or target <= 0:
+        return [(0, total)]
+
+    frame = max(1, (frame_ms * sample_rate) // 1000)
+    n_frames = total // frame
+    frames = samples[: n_frames * frame].astype(np.float32).reshape(n_frames, frame)
+    energy = np.mean(frames * frames, axis=1)
+
+    window = int(search_window * sample_rate) // frame
+    overlap_samples = int(overlap * sample_rate)
+
+    cuts = []
+    last_cut = 0
+    while total - last_cut > target:
+        ideal = (last_cut + target) // frame
+        lo = max(last_cut // frame + 1, ideal - window)
+        hi = min(n_frames, ideal + window + 1)
+        if lo >= hi:
+            cut = last_cut + target
+        else:
+            # Centre of the quietest frame in the search window
+            quietest = lo + int(np.argmin(energy[lo:hi]))
+            cut = quietest * frame + frame // 2
+        # Don't leave a sliver at the end that's shorter than the overlap
+        if total - cut <= overlap_samples:
+            break
+        cuts.append(cut)
+        last_cut = cut
+
+    bounds = [0, *cuts, total]
+    return [
+        (max(0, bounds[i] - overlap_samples) if i > 0 else 0, bounds[i + 1])
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def split_wav_at_pauses(audio_data: bytes, **kwargs) -> list[bytes]:
+    """Split a 16kHz WAV into pause-aligned chunks (see split_at_pauses).
+
+    Returns:
+        List of WAV bytes, each with a clean 44-byte header. A recording
+        shorter than the target duration comes back as a single chunk.
+    """
+    data_offset = _find_wav_data_offset(audio_data)
+    samples = np.frombuffer(audio_data[data_offset:], dtype=np.int16)
+    bounds = split_at_pauses(samples, **kwargs)
+    if len(bounds) == 1:
+        return [audio_data]
+    return [_rebuild_wav(samples[start:end]) for start, end in bounds]
 
 
 def add_silence_padding(
@@ -0,0 +1,183 @@
+"""Latency-aware provider choice for the `auto` STT provider.
+
+Every transcription (whichever provider ran it) updates exponentially
+weighted moving averages of that provider's latency per audio second and
+its error rate, kept per clip-length band and language. `auto` sends each
+request to the provider expected to finish first for that clip, and every
+EXPLORE_EVERY-th request goes to the provider whose estimate is stalest so
+the numbers keep tracking reality. A provider that has been tried but has
+never succeeded ranks after every provider with a latency estimate.
+"""
+
+import threading
+import time
+
+# EWMA weight of the newest observation
+ALPHA = 0.2
+# Every Nth auto request explores instead of exploiting
+EXPLORE_EVERY = 10
+# Expected time is inflated by error_rate * this (a failure costs a retry)
+ERROR_PENALTY = 3.0
+# Clip-length bands (upper bounds, seconds); fixed overhead dominates short clips
+LENGTH_BANDS = ((5.0, "short"), (30.0, "medium"), (float("inf"), "long"))
+# Floor so silent/very short clips don't divide by ~0
+MIN_DURATION = 0.5
+
+
+def length_band(duration: float) -> str:
+    """Clip-length band name for a duration in seconds."""
+    for upper, name in LENGTH_BANDS:
+        if duration < upper:
+            return name
+    return LENGTH_BANDS[-1][1]
+
+
+class _Estimate:
+    """EWMA of seconds-per-audio-second and error rate for one bucket."""
+
+    __slots__ = ("error_rate", "rate", "samples", "successes", "updated_at")
+
+    def __init__(self):
+        self.rate: float | None = None
+        self.error_rate = 0.0
+        self.samples = 0  # Attempts, successful or not
+        self.successes = 0
+        self.updated_at = 0.0
+
+    def update(self, rate: float | None, ok: bool) -> None:
+        if ok and rate is not None:
+            self.rate = (
+                rate if self.rate is None else (ALPHA * rate + (1 - ALPHA) * self.rate)
+            )
+            self.successes += 1
+        self.error_rate = ALPHA * (0.0 if ok else 1.0) + (1 - ALPHA) * self.error_rate
+        self.samples += 1
+        self.updated_at = time.monotonic()
+
+    def as_dict(self) -> dict:
+        return {
+            "sec_per_audio_sec": round(self.rate, 4) if self.rate is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "samples": self.samples,
+            "successes": self.successes,
+            "age_s": round(time.monotonic() - self.updated_at, 1)
+            if self.samples
+            else None,
+        }
+
+
+class AutoRouter:
+    """Per-provider latency / error estimates and the `auto` choice."""
+
+    def __init__(self, explore_every: int = EXPLORE_EVERY):
+        self.explore_every = explore_every
+        self._estimates: dict[tuple[str, str, str], _Estimate] = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def observe(
+        self,
+        provider: str,
+        duration: float,
+        language: str | None,
+        latency: float,
+        ok: bool = True,
+    ) -> None:
+        """Record one finished request (latency in seconds)."""
+        rate = latency / max(duration, MIN_DURATION) if ok else None
+        keys = [
+            (provider, length_band(duration), language or "auto"),
+            # Provider-wide estimate, used while a bucket has no data
+            (provider, "*", "*"),
+        ]
+        with self._lock:
+            for key in keys:
+                self._estimates.setdefault(key, _Estimate()).update(rate, ok)
+
+    def _estimate(self, provider: str, band: str, language: str) -> _Estimate | None:
+        """Bucket estimate with a latency, else any attempted one (None if untried)."""
+        attempted = None
+        for key in ((provider, band, language), (provider, "*", "*")):
+            estimate = self._estimates.get(key)
+            if estimate is None:
+                continue
+            if estimate.rate is not None:
+                return estimate
+            attempted = attempted or estimate
+        return attempted
+
+    @staticmethod
+    def _expected(estimate: _Estimate | None, duration: float) -> float | None:
+        if estimate is None or estimate.rate is None:
+            return None
+        return (
+            estimate.rate
+            * max(duration, MIN_DURATION)
+            * (1 + ERROR_PENALTY * estimate.error_rate)
+        )
+
+    def expected_seconds(
+        self, provider: str, duration: float, language: str | None
+    ) -> float | None:
+        """Expected time to an answer, or None if the provider never succeeded."""
+        with self._lock:
+            estimate = self._estimate(
+                provider, length_band(duration), language or "auto"
+            )
+            return self._expected(estimate, duration)
+
+    def choose(
+        self, candidates: list[str], duration: float, language: str | None
+    ) -> tuple[str, str]:
+        """Pick a provider for this clip; returns (provider, reason)."""
+        band, lang = length_band(duration), language or "auto"
+        with self._lock:
+            self._requests += 1
+            explore = len(candidates) > 1 and self._requests % self.explore_every == 0
+            estimates = {p: self._estimate(p, band, lang) for p in candidates}
+            expected = {p: self._expected(e, duration) for p, e in estimates.items()}
+            error_rates = {
+                p: e.error_rate for p, e in estimates.items() if e is not None
+            }
+            updated = {
+                p: (self._estimates.get((p, band, lang)) or _Estimate()).updated_at
+                for p in candidates
+            }
+
+        untried = [p for p, estimate in estimates.items() if estimate is None]
+        if untried:
+            return untried[0], "untried"
+
+        if explore:
+            return min(candidates, key=updated.__getitem__), "exploring"
+
+        succeeded = [p for p in candidates if expected[p] is not None]
+        if succeeded:
+            best = min(succeeded, key=expected.__getitem__)
+            return best, f"expected {expected[best]:.2f}s"
+
+        # Every candidate has only failed so far: the least-failing one
+        best = min(candidates, key=error_rates.__getitem__)
+        return best, f"no successes (error rate {error_rates[best]:.0%})"
+
+    def estimates(self) -> dict:
+        """Live estimates: {provider: {"band/language": {...}}}."""
+        with self._lock:
+            items = sorted(self._estimates.items())
+            result: dict[str, dict] = {}
+            for (provider, band, language), estimate in items:
+                bucket = "all" if band == "*" else f"{band}/{language}"
+                result.setdefault(provider, {})[bucket] = estimate.as_dict()
+        return result
+
+
+# Singleton instance
+_router: AutoRouter | None = None
+
+
+def get_auto_router() -> AutoRouter:
+    """Get or create the auto-routing estimator singleton."""
+    global _router
+    if _router is None:
+        _router = AutoRouter()
+    return _router
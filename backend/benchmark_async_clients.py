@@ -0,0 +1,156 @@
+"""Load test: sync SDK client in the executor vs the native async client.
+
+Starts a local stand-in for the Groq transcription endpoint (answers every
+request after a fixed delay, like a provider's network + inference time) and
+sends N concurrent transcriptions through GroqSTT two ways:
+
+    executor   transcribe() in loop.run_in_executor — the old server path; at
+               most min(32, cpu + 4) requests are in flight at once, the rest
+               queue for a thread
+    async      transcribe_async() awaited on the loop over the shared
+               httpx.AsyncClient pool (async_http.py)
+
+Once concurrency passes the executor's thread count, executor wall time grows
+in steps of the server delay while the async path stays flat (until the
+connection pool limit, MAX_CONNECTIONS).
+
+Usage:
+    uv run python benchmark_async_clients.py
+    uv run python benchmark_async_clients.py --delay 0.5 --concurrency 16 64 256
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio_utils import SAMPLE_RATE, _rebuild_wav
+
+DEFAULT_CONCURRENCY = [8, 32, 64, 128]
+
+
+def _stand_in_app(delay: float):
+    """Minimal OpenAI-compatible transcription endpoint with a fixed delay."""
+    from fastapi import FastAPI, Request
+
+    app = FastAPI()
+
+    @app.post("/openai/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        await request.body()
+        await asyncio.sleep(delay)
+        return {"text": "stand-in transcript", "language": "english", "duration": 1.0}
+
+    return app
+
+
+def _start_server(delay: float) -> str:
+    """Run the stand-in server on a free localhost port; returns its base URL."""
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    config = uvicorn.Config(
+        _stand_in_app(delay),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        backlog=4096,
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def _percentile_ms(latencies: list[float], q: float) -> float:
+    return float(np.percentile(latencies, q)) * 1000
+
+
+async def _run(stt, wav: bytes, n: int, mode: str) -> dict:
+    """Send n concurrent requests; returns wall time and latency percentiles."""
+    loop = asyncio.get_running_loop()
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        if mode == "executor":
+            await loop.run_in_executor(None, stt.transcribe, wav, "en")
+        else:
+            await stt.transcribe_async(wav, "en")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    wall = time.perf_counter() - start
+    return {
+        "wall_s": wall,
+        "throughput": n / wall,
+        "p50_ms": _percentile_ms(latencies, 50),
+        "p95_ms": _percentile_ms(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async vs executor provider load test")
+    parser.add_argument(
+        "--delay", type=float, default=0.3, help="Stand-in server delay (seconds)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=DEFAULT_CONCURRENCY,
+        help="Concurrent request counts to test",
+    )
+    args = parser.parse_args()
+
+    base_url = _start_server(args.delay)
+    # Point the real GroqSTT client (sync and async SDKs) at the stand-in
+    os.environ["GROQ_API_KEY"] = "stand-in"
+    os.environ["GROQ_BASE_URL"] = base_url
+
+    from groq_stt import GroqSTT
+
+    stt = GroqSTT()
+    wav = _rebuild_wav(np.zeros(SAMPLE_RATE, dtype=np.int16))
+    executor_threads = min(32, (os.cpu_count() or 1) + 4)
+    print(f"Stand-in server at {base_url}, {args.delay * 1000:.0f}ms per request")
+    print(f"Default executor: {executor_threads} threads\n")
+
+    async def bench():
+        await _run(stt, wav, 4, "async")  # Warm up connections
+        rows = []
+        for n in args.concurrency:
+            for mode in ("executor", "async"):
+                rows.append((n, mode, await _run(stt, wav, n, mode)))
+        return rows
+
+    # Silence the per-request client logging
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = asyncio.run(bench())
+
+    print("| Concurrency | Mode | Wall | Req/s | p50 | p95 |")
+    print("|-------------|------|------|-------|-----|-----|")
+    for n, mode, s in rows:
+        print(
+            f"| {n} | {mode} | {s['wall_s']:.2f}s | {s['throughput']:.0f} | "
+            f"{s['p50_ms']:.0f}ms | {s['p95_ms']:.0f}ms |"
+        )
+
+
+if __name__ == "__main__":
+    main()
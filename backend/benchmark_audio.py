@@ -0,0 +1,341 @@
+"""Benchmark the audio pipeline on synthetic speech-like recordings.
+
+Self-contained: no audio files, ffmpeg or models needed. Generates
+speech-shaped signals (syllable envelope, pitch glide, harmonics, pauses,
+breath noise) for every combination of:
+- duration: 0.3s to 300s
+- capture rate: 16kHz, 44.1kHz, 48kHz, 96kHz
+- level: normal, quiet (~-45 dBFS) and clipped (overdriven)
+
+and times every audio_utils function plus preprocess_audio end to end.
+Each measurement reports the best wall time, throughput in audio-seconds per
+second (x realtime), and the peak Python allocation from tracemalloc (taken
+on a separate run so tracing does not skew timings).
+
+Settings-dependent code (normalization, silence padding, volume threshold)
+runs with schema defaults, not settings.json, so runs are comparable across
+machines.
+
+Usage:
+    uv run python benchmark_audio.py
+    uv run python benchmark_audio.py --quick --output results.json
+    uv run python benchmark_audio.py --compare baseline.json --threshold 1.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import audio_utils
+import settings
+from audio_utils import (
+    SAMPLE_RATE,
+    StreamingResampler,
+    _find_wav_data_offset,
+    _rebuild_wav,
+    add_noise_padding,
+    add_silence_padding,
+    as_float32_samples,
+    as_int16_samples,
+    calculate_audio_rms,
+    normalize_audio,
+    pad_samples_with_noise,
+    preprocess_audio,
+    resample_to_16k,
+    split_at_pauses,
+    split_wav_at_pauses,
+)
+
+DURATIONS = [0.3, 1, 5, 30, 120, 300]
+QUICK_DURATIONS = [0.3, 5, 30]
+RATES = [16000, 44100, 48000, 96000]
+LEVELS = ["normal", "quiet", "clipped"]
+CAPTURE_BLOCK = 512  # Typical PortAudio callback size
+
+# Peak amplitude per level (clipped is driven well past full scale)
+LEVEL_PEAK = {"normal": 8000.0, "quiet": 180.0, "clipped": 120000.0}
+
+
+def speech_like(duration: float, rate: int, level: str, seed: int = 0) -> np.ndarray:
+    """Synthetic speech-shaped int16 signal.
+
+    Voiced "syllables" at ~4Hz with a gliding 100-250Hz pitch and decaying
+    harmonics, grouped into phrases separated by short pauses, over a low
+    breath-noise floor.
+    """
+    rng = np.random.default_rng(seed)
+    n = max(1, int(duration * rate))
+    t = np.arange(n) / rate
+
+    # Pitch glide and its phase
+    f0 = 170 + 60 * np.sin(2 * np.pi * 0.3 * t + rng.uniform(0, np.pi))
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voice = sum(np.sin(k * phase) / k**1.5 for k in range(1, 7))
+
+    # Syllable envelope, gated into ~2.5s phrases with ~0.4s pauses
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    phrase = ((t % 2.9) < 2.5).astype(np.float64)
+    signal = voice * syllables * phrase
+    signal += rng.standard_normal(n) * 0.01
+
+    peak = np.max(np.abs(signal)) or 1.0
+    audio = signal / peak * LEVEL_PEAK[level]
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def _default_setting(key: str):
+    return settings.SETTINGS_SCHEMA[key]["default"]
+
+
+@contextlib.contextmanager
+def _schema_defaults():
+    """Run audio_utils with schema-default settings and silenced logging."""
+    saved = (audio_utils.get_setting, audio_utils.get_min_volume_rms)
+    audio_utils.get_setting = _default_setting
+    audio_utils.get_min_volume_rms = lambda: int(_default_setting("min_volume_rms"))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        audio_utils.get_setting, audio_utils.get_min_volume_rms = saved
+
+
+def _streaming_resample(audio: np.ndarray, rate: int) -> np.ndarray:
+    """Feed capture-sized blocks through StreamingResampler."""
+    resampler = StreamingResampler(rate)
+    parts = [
+        resampler.process(audio[i : i + CAPTURE_BLOCK])
+        for i in range(0, len(audio), CAPTURE_BLOCK)
+    ]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+def _pipeline(audio: np.ndarray, rate: int) -> tuple[bytes, dict]:
+    """Capture-rate samples -> 16kHz WAV -> preprocess_audio (server path)."""
+    samples = resample_to_16k(audio, rate) if rate != SAMPLE_RATE else audio
+    return preprocess_audio(_rebuild_wav(samples))
+
+
+def _operations(audio: np.ndarray, rate: int) -> dict:
+    """Named zero-argument callables to measure for one recording."""
+    ops = {}
+    if rate != SAMPLE_RATE:
+        ops["resample_to_16k"] = lambda: resample_to_16k(audio, rate)
+        ops["resample_to_16k_f32"] = lambda: resample_to_16k(
+            audio, rate, dtype=np.float32
+        )
+        ops["StreamingResampler"] = lambda: _streaming_resample(audio, rate)
+        ops["pipeline"] = lambda: _pipeline(audio, rate)
+        return ops
+
+    wav = _rebuild_wav(audio)
+    return {
+        "_rebuild_wav": lambda: _rebuild_wav(audio),
+        "_find_wav_data_offset": lambda: _find_wav_data_offset(wav),
+        "as_int16_samples": lambda: as_int16_samples(wav),
+        "as_float32_samples": lambda: as_float32_samples(wav),
+        "calculate_audio_rms": lambda: calculate_audio_rms(wav),
+        "normalize_audio": lambda: normalize_audio(wav),
+        "pad_samples_with_noise": lambda: pad_samples_with_noise(audio, 3200, 4800),
+        "add_noise_padding": lambda: add_noise_padding(wav),
+        "add_silence_padding": lambda: add_silence_padding(wav),
+        "split_at_pauses": lambda: split_at_pauses(audio),
+        "split_wav_at_pauses": lambda: split_wav_at_pauses(wav),
+        "preprocess_audio": lambda: preprocess_audio(wav),
+        "preprocess_audio_skip": lambda: preprocess_audio(wav, skip_transforms=True),
+        "pipeline": lambda: _pipeline(audio, rate),
+    }
+
+
+def _best_time(fn, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_alloc(fn) -> int:
+    """Peak bytes allocated (tracemalloc) during one call."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _repeat_for(duration: float, repeat: int) -> int:
+    """Fewer repeats for long recordings (keeps a full run in minutes)."""
+    if duration >= 120:
+        return max(1, repeat // 3)
+    return repeat
+
+
+def run(durations: list[float], rates: list[int], repeat: int) -> list[dict]:
+    """Measure every operation for every (rate, duration, level) recording."""
+    results = []
+    with _schema_defaults():
+        for rate in rates:
+            # Warm filter caches so cached paths are measured steady-state
+            if rate != SAMPLE_RATE:
+                resample_to_16k(np.zeros(rate, dtype=np.int16), rate)
+                resample_to_16k(np.zeros(rate, dtype=np.int16), rate, dtype=np.float32)
+
+            for duration in durations:
+                for level in LEVELS:
+                    audio = speech_like(duration, rate, level)
+                    for name, fn in _operations(audio, rate).items():
+                        fn()  # Warm-up (noise pool, lazy imports)
+                        seconds = _best_time(fn, _repeat_for(duration, repeat))
+                        results.append(
+                            {
+                                "id": f"{name}@{rate}/{duration:g}s/{level}",
+                                "function": name,
+                                "rate": rate,
+                                "duration_s": duration,
+                                "level": level,
+                                "time_ms": seconds * 1000,
+                                "throughput_x": duration / seconds
+                                if seconds > 0
+                                else float("inf"),
+                                "peak_alloc_kb": _peak_alloc(fn) / 1024,
+                            }
+                        )
+                    sys.stderr.write(f"  {rate}Hz {duration:g}s {level}: done\n")
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    """Markdown table of results."""
+    lines = [
+        "| Function | Input | Time | Throughput | Peak alloc |",
+        "|----------|-------|------|------------|------------|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r['function']} | {r['rate'] / 1000:g}kHz {r['duration_s']:g}s "
+            f"{r['level']} | {r['time_ms']:.2f}ms | {r['throughput_x']:,.0f}x | "
+            f"{r['peak_alloc_kb']:,.0f} KB |"
+        )
+    return "\n".join(lines)
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[dict]:
+    """Match results to a baseline run by id and flag slowdowns.
+
+    Returns the measurements whose time or peak allocation grew by more than
+    `threshold` (e.g. 1.3 = 30% worse). Sub-0.05ms timings are ignored, as
+    they are dominated by timer noise.
+    """
+    base_by_id = {r["id"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        base = base_by_id.get(r["id"])
+        if base is None:
+            continue
+        time_ratio = r["time_ms"] / base["time_ms"] if base["time_ms"] > 0 else 1.0
+        alloc_ratio = (
+            r["peak_alloc_kb"] / base["peak_alloc_kb"]
+            if base["peak_alloc_kb"] > 0
+            else 1.0
+        )
+        slower = time_ratio > threshold and r["time_ms"] > 0.05
+        if slower or alloc_ratio > threshold:
+            regressions.append(
+                {
+                    "id": r["id"],
+                    "time_ratio": time_ratio,
+                    "alloc_ratio": alloc_ratio,
+                }
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the audio pipeline")
+    parser.add_argument(
+        "--durations",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Recording lengths in seconds (default: 0.3 1 5 30 120 300)",
+    )
+    parser.add_argument(
+        "--rates",
+        type=int,
+        nargs="+",
+        default=RATES,
+        help="Capture sample rates (default: 16000 44100 48000 96000)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Short recordings only (0.3 5 30)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per measurement (best kept)"
+    )
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON from a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.3,
+        help="Regression ratio vs baseline (default: 1.3 = 30%% slower)",
+    )
+    args = parser.parse_args()
+
+    durations = args.durations or (QUICK_DURATIONS if args.quick else DURATIONS)
+
+    print("Audio Pipeline Benchmark")
+    print("=" * 60)
+    results = run(durations, args.rates, args.repeat)
+    print()
+    print(format_results(results))
+
+    if args.output:
+        payload = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": f"{platform.system()} {platform.machine()}",
+            "durations": durations,
+            "rates": args.rates,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nSaved {len(results)} measurements to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:g}x)")
+        for r in regressions:
+            print(
+                f"  REGRESSION {r['id']}: time {r['time_ratio']:.2f}x, "
+                f"alloc {r['alloc_ratio']:.2f}x"
+            )
+        if regressions:
+            sys.exit(1)
+        print("  No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measure Gemma 4 time-to-first-token with and without the prompt-prefix cache.
+
+Runs Gemma4STT.transcribe() on each clip with an 85-word vocabulary, first
+with the prefix cache disabled (instruction + vocabulary prefilled every call)
+then enabled (prefix KV state reused), and reports median TTFT per mode.
+
+Clips are 16kHz mono WAV files given on the command line; without any, short
+synthetic speech-like clips are used (the transcripts are meaningless, but
+the prefill work and TTFT are representative).
+
+Usage:
+    uv run python benchmark_gemma_ttft.py
+    uv run python benchmark_gemma_ttft.py /tmp/stt_test_23.wav /tmp/stt_test_24.wav --runs 5
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import gemma4_stt
+from audio_utils import _rebuild_wav
+from benchmark_audio import speech_like
+
+SYNTHETIC_DURATIONS = [2, 5, 10]
+VOCAB_SIZE = 85
+
+
+def _vocabulary(size: int) -> list[str]:
+    """Plausible custom-vocabulary entries (product names, jargon)."""
+    stems = ["Kube", "Fast", "Py", "Tensor", "Graph", "Data", "Lambda", "Vector"]
+    suffixes = [
+        "API",
+        "Flow",
+        "Torch",
+        "QL",
+        "Hub",
+        "Ops",
+        "DB",
+        "Kit",
+        "Net",
+        "Lab",
+        "IO",
+    ]
+    words = [f"{s}{x}" for s in stems for x in suffixes]
+    return words[:size]
+
+
+def _clips(paths: list[str]) -> list[tuple[str, bytes]]:
+    if paths:
+        return [(Path(p).name, Path(p).read_bytes()) for p in paths]
+    return [
+        (f"synthetic_{d}s", _rebuild_wav(speech_like(d, 16000, "normal")))
+        for d in SYNTHETIC_DURATIONS
+    ]
+
+
+def _run_mode(stt, clips, language: str, runs: int, use_cache: bool) -> dict:
+    """Transcribe every clip `runs` times; return median TTFT per clip (ms)."""
+    real_get_setting = gemma4_stt.get_setting
+    gemma4_stt.get_setting = lambda key: (
+        use_cache if key == "gemma4_prompt_cache" else real_get_setting(key)
+    )
+    stt._prompts.clear()
+    try:
+        results = {}
+        for name, audio in clips:
+            ttfts = []
+            for _ in range(runs):
+                mode = "cached" if use_cache else "uncached"
+                before = len(stt.ttft_ms[mode])
+                stt.transcribe(audio, language=language)
+                if len(stt.ttft_ms[mode]) > before:
+                    ttfts.append(stt.ttft_ms[mode][-1])
+            results[name] = float(np.median(ttfts)) if ttfts else float("nan")
+        return results
+    finally:
+        gemma4_stt.get_setting = real_get_setting
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Gemma 4 TTFT with/without prefix cache"
+    )
+    parser.add_argument(
+        "wavs", nargs="*", help="16kHz mono WAV clips (default: synthetic)"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Runs per clip per mode")
+    parser.add_argument("--language", default="en", help="Language code (default: en)")
+    parser.add_argument("--vocab", type=int, default=VOCAB_SIZE, help="Vocabulary size")
+    args = parser.parse_args()
+
+    if not gemma4_stt.is_gemma4_available():
+        print("mlx-vlm not installed (uv sync --extra local-gemma)")
+        sys.exit(1)
+
+    stt = gemma4_stt.get_gemma4_stt()
+    stt.set_vocabulary(_vocabulary(args.vocab))
+    clips = _clips(args.wavs)
+
+    # Load + warm up outside the measurements
+    stt.transcribe(clips[0][1], language=args.language)
+
+    uncached = _run_mode(stt, clips, args.language, args.runs, use_cache=False)
+    cached = _run_mode(stt, clips, args.language, args.runs, use_cache=True)
+
+    print()
+    print(
+        f"| Clip | TTFT (no cache) | TTFT (prefix cache) | Saved |  vocab={args.vocab}"
+    )
+    print("|------|-----------------|---------------------|-------|")
+    for name, _ in clips:
+        saved = uncached[name] - cached[name]
+        print(
+            f"| {name} | {uncached[name]:.0f}ms | {cached[name]:.0f}ms | {saved:.0f}ms |"
+        )
+
+
+if __name__ == "__main__":
+    main()
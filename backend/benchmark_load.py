@@ -0,0 +1,466 @@
+"""Load test the server with concurrent virtual clients and observers.
+
+Replays N virtual hotkey clients against the HTTP API while M web UI
+observers stay connected to /ws. Each client loops like the real hotkey
+client does per dictation:
+
+    POST /api/status {recording: true}    (recording starts)
+    ... records for the clip length (only with --realtime)
+    POST /api/status {recording: false}
+    POST /api/log                         (client log line)
+    POST /api/transcribe                  (the clip)
+    ... pauses for an exponential think time
+
+Clip lengths follow a log-normal distribution (median 4s, most between 1s
+and 15s, capped at 60s), like real dictation. Every clip is a distinct
+speech-like signal, so the result cache never short-circuits a request.
+
+Reported per endpoint: p50/p95/p99 latency and error rate. For transcribe
+also queue wait (end-to-end latency minus the provider's processing_time:
+upload, preprocessing, rate limit and scheduler queues, provider slot
+waits), throughput in requests/s and audio-seconds/s, and whether every
+observer received every final result broadcast.
+
+By default a server is started in-process on a free port with the simulated
+provider and throwaway settings/history/vocabulary files (the real ones are
+never touched), so it runs on any machine. --set overrides settings of that
+server (e.g. simulated latency or error rate). With --url the load goes to
+an already running server and its current settings instead.
+
+Usage:
+    uv run python benchmark_load.py
+    uv run python benchmark_load.py --clients 32 --requests 20 --observers 4
+    uv run python benchmark_load.py --set simulated_error_rate=0.05 simulated_max_concurrency=4
+    uv run python benchmark_load.py --url http://127.0.0.1:8000 --output load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio_utils import SAMPLE_RATE, _rebuild_wav
+from benchmark_audio import speech_like
+
+# Dictation clip lengths: log-normal around a 4s median
+CLIP_MEDIAN_S = 4.0
+CLIP_SIGMA = 0.8
+CLIP_MIN_S = 0.5
+CLIP_MAX_S = 60.0
+
+# Settings of the in-process server (before --set overrides)
+SERVER_SETTINGS = {
+    "stt_provider": "simulated",
+    "save_debug_audio": False,
+    "prewarm_on_record": True,
+}
+
+# Time left for the last broadcasts to reach observers before they close
+OBSERVER_DRAIN_S = 0.5
+
+
+def clip_lengths(n: int, seed: int = 0) -> list[float]:
+    """Realistic dictation lengths in seconds."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.lognormal(np.log(CLIP_MEDIAN_S), CLIP_SIGMA, n)
+    return [round(float(x), 2) for x in np.clip(lengths, CLIP_MIN_S, CLIP_MAX_S)]
+
+
+def parse_overrides(pairs: list[str]) -> dict:
+    """key=value pairs; values are JSON when they parse (numbers, booleans)."""
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[key] = value
+    return overrides
+
+
+def isolate_state(state_dir: Path, settings_values: dict) -> None:
+    """Point every file the app writes at a throwaway directory.
+
+    Settings come from `settings_values` (schema defaults for the rest);
+    history, vocabulary, replacements and the filter log start empty.
+    """
+    import content_filter
+    import history
+    import replacements
+    import settings
+    import vocabulary
+
+    settings.SETTINGS_FILE = state_dir / "settings.json"
+    history.HISTORY_FILE = state_dir / "history.json"
+    replacements.REPLACEMENTS_FILE = state_dir / "replacements.json"
+    vocabulary.VOCABULARY_FILE = state_dir / "vocabulary.txt"
+    vocabulary.USAGE_FILE = state_dir / "vocabulary_usage.json"
+    content_filter._log_path = state_dir / "filter_log.txt"
+    settings.SETTINGS_FILE.write_text(json.dumps(settings_values))
+
+
+def _start_server() -> str:
+    """Run the app on a free localhost port; returns its base URL."""
+    import uvicorn
+
+    import main
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    config = uvicorn.Config(
+        main.app, host="127.0.0.1", port=port, log_level="warning", backlog=4096
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def percentiles_ms(values: list[float]) -> dict:
+    """p50/p95/p99/max of durations in seconds, as milliseconds."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+    return {
+        "p50": round(float(p50), 1),
+        "p95": round(float(p95), 1),
+        "p99": round(float(p99), 1),
+        "max": round(max(values) * 1000, 1),
+    }
+
+
+async def _timed(
+    records: list, endpoint: str, request
+) -> tuple[httpx.Response | None, dict]:
+    """Await an HTTP request, recording its latency and outcome."""
+    start = time.perf_counter()
+    error = None
+    try:
+        response = await request
+        if response.status_code != 200:
+            error = str(response.status_code)
+    except httpx.HTTPError as e:
+        # e.g. ReadError: the server dropped a pooled keep-alive connection
+        response, error = None, type(e).__name__
+    record = {
+        "endpoint": endpoint,
+        "latency": time.perf_counter() - start,
+        "ok": error is None,
+        "error": error,
+    }
+    records.append(record)
+    return response, record
+
+
+async def _virtual_client(
+    client_id: int,
+    http: httpx.AsyncClient,
+    clips: list[tuple[float, bytes]],
+    think_time: float,
+    realtime: bool,
+    records: list,
+) -> None:
+    """One hotkey client dictating `clips` back to back."""
+    rng = np.random.default_rng(client_id)
+    for n, (duration, wav) in enumerate(clips):
+        await _timed(
+            records, "status", http.post("/api/status", json={"recording": True})
+        )
+        if realtime:
+            await asyncio.sleep(duration)
+        await _timed(
+            records, "status", http.post("/api/status", json={"recording": False})
+        )
+        await _timed(
+            records,
+            "log",
+            http.post(
+                "/api/log",
+                json={"message": f"client {client_id}: clip {n} ({duration:.1f}s)"},
+            ),
+        )
+
+        response, record = await _timed(
+            records,
+            "transcribe",
+            http.post(
+                "/api/transcribe", files={"file": ("audio.wav", wav, "audio/wav")}
+            ),
+        )
+        record["audio_s"] = duration
+        if response is not None and record["ok"]:
+            result = response.json()
+            record["provider"] = result.get("provider")
+            processing = result.get("processing_time")
+            if processing is not None:
+                record["queue_wait"] = max(0.0, record["latency"] - processing)
+
+        if think_time > 0:
+            await asyncio.sleep(rng.exponential(think_time))
+
+
+async def _observer(
+    ws_url: str, counts: dict, ready: asyncio.Event, stop: asyncio.Event
+):
+    """Web UI stand-in: counts broadcast messages by type until stopped."""
+    import websockets
+
+    async with websockets.connect(ws_url) as ws:
+        ready.set()
+        while not stop.is_set():
+            try:
+                message = await asyncio.wait_for(ws.recv(), timeout=0.1)
+            except TimeoutError:
+                continue
+            kind = json.loads(message).get("type", "?")
+            counts[kind] = counts.get(kind, 0) + 1
+
+
+async def run_load(
+    base_url: str,
+    clients: int,
+    requests: int,
+    observers: int,
+    think_time: float,
+    realtime: bool,
+    seed: int = 0,
+) -> dict:
+    """Run the load and return the report dict."""
+    lengths = clip_lengths(clients * requests, seed)
+    clips = [
+        (d, _rebuild_wav(speech_like(d, SAMPLE_RATE, "normal", seed=seed + i)))
+        for i, d in enumerate(lengths)
+    ]
+
+    ws_url = base_url.replace("http", "ws", 1) + "/ws"
+    stop = asyncio.Event()
+    observer_counts = [{} for _ in range(observers)]
+    readies = [asyncio.Event() for _ in range(observers)]
+    watchers = [
+        asyncio.create_task(_observer(ws_url, counts, ready, stop))
+        for counts, ready in zip(observer_counts, readies, strict=True)
+    ]
+    await asyncio.gather(*(ready.wait() for ready in readies))
+
+    records: list[dict] = []
+    limits = httpx.Limits(
+        max_connections=clients * 2, max_keepalive_connections=clients
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=120.0, limits=limits
+    ) as http:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _virtual_client(
+                    i,
+                    http,
+                    clips[i * requests : (i + 1) * requests],
+                    think_time,
+                    realtime,
+                    records,
+                )
+                for i in range(clients)
+            )
+        )
+        wall = time.perf_counter() - start
+        await asyncio.sleep(OBSERVER_DRAIN_S)
+        stats = await http.get("/api/stats")
+
+    stop.set()
+    await asyncio.gather(*watchers)
+
+    return summarize(records, wall, observer_counts, stats.json())
+
+
+def summarize(
+    records: list[dict], wall: float, observer_counts: list[dict], server_stats: dict
+) -> dict:
+    """Aggregate per-request records into the report."""
+    endpoints = {}
+    for endpoint in ("transcribe", "status", "log"):
+        rows = [r for r in records if r["endpoint"] == endpoint]
+        if not rows:
+            continue
+        errors = {}
+        for r in rows:
+            if not r["ok"]:
+                errors[r["error"]] = errors.get(r["error"], 0) + 1
+        total_errors = sum(errors.values())
+        endpoints[endpoint] = {
+            "requests": len(rows),
+            "errors": total_errors,
+            "error_rate": round(total_errors / len(rows), 4),
+            "error_kinds": errors,
+            "latency_ms": percentiles_ms([r["latency"] for r in rows if r["ok"]]),
+        }
+
+    transcribes = [r for r in records if r["endpoint"] == "transcribe"]
+    ok = [r for r in transcribes if r["ok"]]
+    providers = {}
+    for r in ok:
+        providers[r.get("provider")] = providers.get(r.get("provider"), 0) + 1
+    if "transcribe" in endpoints:
+        endpoints["transcribe"]["queue_wait_ms"] = percentiles_ms(
+            [r["queue_wait"] for r in ok if "queue_wait" in r]
+        )
+
+    finals = [counts.get("final", 0) for counts in observer_counts]
+    return {
+        "wall_s": round(wall, 2),
+        "throughput_rps": round(len(ok) / wall, 2) if wall > 0 else None,
+        "audio_s_per_s": round(sum(r["audio_s"] for r in ok) / wall, 1)
+        if wall > 0
+        else None,
+        "endpoints": endpoints,
+        "providers": providers,
+        "observers": {
+            "count": len(observer_counts),
+            "finals_expected": len(ok),
+            "finals_received_min": min(finals) if finals else None,
+            "messages": observer_counts,
+        },
+        "server_stats": server_stats,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Markdown summary of a report."""
+
+    def ms(value) -> str:
+        return "-" if value is None else f"{value:.0f}ms"
+
+    lines = [
+        "| Endpoint | Requests | Errors | p50 | p95 | p99 |",
+        "|----------|----------|--------|-----|-----|-----|",
+    ]
+    for name, e in report["endpoints"].items():
+        lat = e["latency_ms"]
+        kinds = ", ".join(f"{k}: {v}" for k, v in e["error_kinds"].items())
+        errors = f"{e['errors']} ({e['error_rate']:.1%})" + (
+            f" {kinds}" if kinds else ""
+        )
+        lines.append(
+            f"| {name} | {e['requests']} | {errors} | "
+            f"{ms(lat['p50'])} | {ms(lat['p95'])} | {ms(lat['p99'])} |"
+        )
+    transcribe = report["endpoints"].get("transcribe")
+    if transcribe:
+        wait = transcribe["queue_wait_ms"]
+        lines.append(
+            f"| transcribe queue wait | | | {ms(wait['p50'])} | "
+            f"{ms(wait['p95'])} | {ms(wait['p99'])} |"
+        )
+    lines.append("")
+    lines.append(
+        f"Throughput: {report['throughput_rps']} req/s, "
+        f"{report['audio_s_per_s']} audio-s/s over {report['wall_s']}s"
+    )
+    lines.append(f"Providers: {report['providers']}")
+    obs = report["observers"]
+    if obs["count"]:
+        lines.append(
+            f"Observers: {obs['count']}, final broadcasts received "
+            f"{obs['finals_received_min']}/{obs['finals_expected']} (worst observer)"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test of the server")
+    parser.add_argument("--url", help="Existing server (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=8, help="Virtual hotkey clients")
+    parser.add_argument(
+        "--requests", type=int, default=10, help="Transcriptions per client"
+    )
+    parser.add_argument(
+        "--observers", type=int, default=2, help="WebSocket observers (web UIs)"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.5,
+        help="Mean pause between a client's dictations in seconds (exponential)",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Wait the clip length between recording start and upload",
+    )
+    parser.add_argument(
+        "--set",
+        nargs="+",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Settings for the in-process server (e.g. simulated_latency_ms=800)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Clip generation seed")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    load = {
+        "clients": args.clients,
+        "requests": args.requests,
+        "observers": args.observers,
+        "think_time": args.think_time,
+        "realtime": args.realtime,
+        "seed": args.seed,
+    }
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        if args.url:
+            base_url = args.url.rstrip("/")
+            print(f"Load testing {base_url} (its current settings)")
+            report = asyncio.run(run_load(base_url, **load))
+        else:
+            overrides = parse_overrides(args.set)
+            isolate_state(Path(state_dir), {**SERVER_SETTINGS, **overrides})
+            # Server logs every request; keep the output to the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                base_url = _start_server()
+                report = asyncio.run(run_load(base_url, **load))
+            print(
+                f"In-process server, settings: { ({**SERVER_SETTINGS, **overrides}) }"
+            )
+
+    print(
+        f"{args.clients} clients x {args.requests} dictations, "
+        f"{args.observers} observers\n"
+    )
+    print(format_report(report))
+
+    if args.output:
+        payload = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "url": args.url,
+            "settings": None
+            if args.url
+            else {**SERVER_SETTINGS, **parse_overrides(args.set)},
+            "load": load,
+            "report": report,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nSaved report to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
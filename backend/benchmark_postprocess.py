@@ -0,0 +1,357 @@
+"""Benchmark the text post-processing hot paths at scale.
+
+Every transcription passes through, in order:
+- vocabulary.find_matches (one regex search per vocabulary word)
+- ReplacementManager.apply_replacements (one regex substitution per rule)
+- ContentFilter.filter (better_profanity scan against its censor word set)
+
+This measures each one while scaling the number of vocabulary words / rules /
+censor words (10 -> 10,000) and the transcript length (5 -> 5,000 words),
+for Latin, CJK (no spaces between words) and mixed-script text. Per call it
+reports wall time (steady state, after one warm-up call) and the peak memory
+allocated during the call (tracemalloc).
+
+Python's re module caches 512 compiled patterns, so per-word / per-rule
+regexes recompile on every call once the list grows past that; the jump
+shows up between the 100 and 1,000 rows.
+
+Sizes that would take longer than --max-call per call (extrapolated from
+the smaller sizes) are reported as estimates instead of being run.
+
+The replacement cap (MAX_REPLACEMENTS) is lifted for the run; every file
+the managers write goes to a temp directory.
+
+Usage:
+    uv run python benchmark_postprocess.py
+    uv run python benchmark_postprocess.py --counts 10 100 --words 50 500 --scripts latin
+    uv run python benchmark_postprocess.py --functions find_matches --output post.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_load import isolate_state
+
+DEFAULT_COUNTS = [10, 100, 1000, 10000]
+DEFAULT_WORDS = [5, 50, 500, 5000]
+SCRIPTS = ["latin", "cjk", "mixed"]
+FUNCTIONS = ["find_matches", "apply_replacements", "filter"]
+
+# Distinct terms to draw vocabulary, rules and transcripts from
+POOL_SIZE = 20000
+
+# Share of transcript words taken from the vocabulary / rules (dictation
+# mostly uses ordinary words; a few are the user's custom terms)
+HIT_RATE = 0.05
+
+_SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+# CJK Unified Ideographs block (common hanzi / kanji)
+_CJK_START, _CJK_END = 0x4E00, 0x9FA5
+
+
+def _latin_term(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _cjk_term(rng: random.Random) -> str:
+    return "".join(
+        chr(rng.randint(_CJK_START, _CJK_END)) for _ in range(rng.randint(2, 3))
+    )
+
+
+def term_pool(script: str, size: int = POOL_SIZE, seed: int = 0) -> list[str]:
+    """Distinct terms for a script; mixed is half Latin, half CJK."""
+    rng = random.Random(f"{script}-{seed}")
+    makers = {
+        "latin": [_latin_term],
+        "cjk": [_cjk_term],
+        "mixed": [_latin_term, _cjk_term],
+    }[script]
+    terms: set[str] = set()
+    while len(terms) < size:
+        terms.add(rng.choice(makers)(rng))
+    return sorted(terms)
+
+
+def transcript(
+    script: str, pool: list[str], custom: list[str], words: int, seed: int = 0
+) -> str:
+    """Transcript of `words` terms, HIT_RATE of them from `custom`.
+
+    CJK is written without spaces, mixed-script with spaces only around
+    Latin terms (as dictation output usually is).
+    """
+    rng = random.Random(f"{script}-{words}-{seed}")
+    terms = [
+        rng.choice(custom) if custom and rng.random() < HIT_RATE else rng.choice(pool)
+        for _ in range(words)
+    ]
+    if script == "cjk":
+        return (
+            "。".join("".join(terms[i : i + 12]) for i in range(0, len(terms), 12))
+            + "。"
+        )
+    if script == "mixed":
+        return (
+            "".join(f" {t} " if t.isascii() else t for t in terms)
+            .strip()
+            .replace("  ", " ")
+        )
+    sentences = [" ".join(terms[i : i + 12]) for i in range(0, len(terms), 12)]
+    return ". ".join(s.capitalize() for s in sentences) + "."
+
+
+def per_call_seconds(fn, min_time: float) -> float:
+    """Mean seconds per call, looping until at least `min_time` has elapsed."""
+    fn()  # Warm-up: compile and cache patterns, load word sets
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / number
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def peak_alloc_bytes(fn) -> int:
+    """Peak memory allocated during one call (above what was live before)."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before
+
+
+def _setups(custom: list[str], pool: list[str]) -> dict:
+    """Build each function under test for `custom` words / rules."""
+    from better_profanity import profanity
+
+    import content_filter
+    import replacements
+    import vocabulary
+
+    def setup_find_matches():
+        return lambda text: vocabulary.find_matches(text, custom)
+
+    def setup_apply_replacements():
+        replacements.MAX_REPLACEMENTS = max(replacements.MAX_REPLACEMENTS, len(custom))
+        manager = replacements.ReplacementManager()
+        # Rule targets are other pool terms so outputs stay the same size
+        manager.set_replacements(
+            [{"from": w, "to": pool[-1 - i]} for i, w in enumerate(custom)]
+        )
+        return manager.apply_replacements
+
+    def setup_filter():
+        content_filter_ = content_filter.ContentFilter()  # Loads the default list
+        profanity.load_censor_words(custom)
+        return content_filter_.filter
+
+    return {
+        "find_matches": setup_find_matches,
+        "apply_replacements": setup_apply_replacements,
+        "filter": setup_filter,
+    }
+
+
+def _estimate(measured: dict, count: int, words: int) -> float | None:
+    """Seconds per call extrapolated linearly from the largest smaller run."""
+    smaller = [(c, w) for c, w in measured if c <= count and w <= words]
+    if not smaller:
+        return None
+    c, w = max(smaller, key=lambda size: size[0] * size[1])
+    return measured[(c, w)] * (count / c) * (words / w)
+
+
+def run(
+    scripts: list[str],
+    functions: list[str],
+    counts: list[int],
+    word_counts: list[int],
+    min_time: float,
+    max_call: float,
+) -> list[dict]:
+    """Measure every script x function x count x length.
+
+    Sizes whose per-call time, extrapolated from smaller sizes, exceeds
+    `max_call` seconds are not run; their row carries the estimate instead.
+    """
+    results = []
+    for script in scripts:
+        pool = term_pool(script)
+        for function in functions:
+            measured: dict[tuple[int, int], float] = {}
+            for count in sorted(counts):
+                custom = pool[:: max(1, len(pool) // count)][:count]
+                # The managers log every rule load; keep the table readable
+                with contextlib.redirect_stdout(io.StringIO()):
+                    fn = _setups(custom, pool)[function]()
+                for words in sorted(word_counts):
+                    text = transcript(script, pool, custom, words)
+                    row = {
+                        "script": script,
+                        "function": function,
+                        "count": count,
+                        "words": words,
+                        "chars": len(text),
+                    }
+                    results.append(row)
+
+                    estimate = _estimate(measured, count, words)
+                    if estimate is not None and estimate > max_call:
+                        row["estimated_us"] = round(estimate * 1e6, -3)
+                        print(
+                            f"  {script:<6} {function:<18} n={count:<6} words={words:<5} "
+                            f"skipped (~{_fmt_time(row['estimated_us'])} per call)",
+                            flush=True,
+                        )
+                        continue
+
+                    # filter() prints on every hit
+                    def call(fn=fn, text=text):
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            return fn(text)
+
+                    seconds = per_call_seconds(call, min_time)
+                    measured[(count, words)] = seconds
+                    row["us_per_call"] = round(seconds * 1e6, 1)
+                    row["peak_alloc_kb"] = round(peak_alloc_bytes(call) / 1024, 1)
+                    if function == "find_matches":
+                        row["matches"] = len(call())
+                    print(
+                        f"  {script:<6} {function:<18} n={count:<6} words={words:<5} "
+                        f"{_fmt_time(row['us_per_call']):>9}  "
+                        f"alloc={row['peak_alloc_kb']:,.1f}KB",
+                        flush=True,
+                    )
+    return results
+
+
+def _fmt_time(us: float) -> str:
+    if us >= 1e6:
+        return f"{us / 1e6:.2f}s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f}ms"
+    return f"{us:.1f}us"
+
+
+def _fmt_cell(row: dict) -> str:
+    if "us_per_call" not in row:
+        return f"~{_fmt_time(row['estimated_us'])} (est.)"
+    return f"{_fmt_time(row['us_per_call'])} / {row['peak_alloc_kb']:,.0f}KB"
+
+
+def format_results(results: list[dict]) -> str:
+    """Markdown table per function: rows are script x count, columns are lengths."""
+    sections = []
+    for function in dict.fromkeys(r["function"] for r in results):
+        rows = [r for r in results if r["function"] == function]
+        word_counts = list(dict.fromkeys(r["words"] for r in rows))
+        header = " | ".join(f"{w} words" for w in word_counts)
+        lines = [
+            f"### {function}",
+            "",
+            f"| Script | Count | {header} |",
+            "|--------|-------|"
+            + "|".join("-" * (len(f"{w} words") + 2) for w in word_counts)
+            + "|",
+        ]
+        for key in dict.fromkeys((r["script"], r["count"]) for r in rows):
+            cells = {r["words"]: r for r in rows if (r["script"], r["count"]) == key}
+            lines.append(
+                f"| {key[0]} | {key[1]:,} | "
+                + " | ".join(_fmt_cell(cells[w]) for w in word_counts)
+                + " |"
+            )
+        sections.append("\n".join(lines))
+    return (
+        "\n\n".join(sections)
+        + "\n\n(time per call / peak allocation per call; est. = extrapolated, not run)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text post-processing")
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=DEFAULT_COUNTS,
+        help="Vocabulary words / replacement rules / censor words (default: 10 100 1000 10000)",
+    )
+    parser.add_argument(
+        "--words",
+        type=int,
+        nargs="+",
+        default=DEFAULT_WORDS,
+        help="Transcript lengths in words (default: 5 50 500 5000)",
+    )
+    parser.add_argument("--scripts", nargs="+", choices=SCRIPTS, default=SCRIPTS)
+    parser.add_argument("--functions", nargs="+", choices=FUNCTIONS, default=FUNCTIONS)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Seconds to loop each measurement for (default: 0.2)",
+    )
+    parser.add_argument(
+        "--max-call",
+        type=float,
+        default=2.0,
+        help="Skip sizes estimated to take longer per call (default: 2.0s)",
+    )
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    print("Post-processing Benchmark")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as state_dir:
+        isolate_state(Path(state_dir), {})
+        try:
+            results = run(
+                args.scripts,
+                args.functions,
+                args.counts,
+                args.words,
+                args.min_time,
+                args.max_call,
+            )
+        finally:
+            from better_profanity import profanity
+
+            profanity.load_censor_words()
+    print()
+    print(format_results(results))
+
+    if args.output:
+        payload = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nSaved {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
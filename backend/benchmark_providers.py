@@ -0,0 +1,508 @@
+"""Benchmark STT providers and models over a manifest of reference clips.
+
+Runs every clip of a manifest through the full transcription path
+(stt_engine.transcribe_audio_with_provider: preprocessing, routing,
+post-processing) for each target and reports, per target:
+
+- accuracy: WER, or CER for Chinese / Japanese (no word boundaries),
+  corpus-level over all clips after lowercasing and stripping punctuation
+- latency p50/p95/p99 and real-time factor (latency / audio duration)
+- peak memory: growth of the process peak RSS while the target ran, plus
+  the MLX peak (model weights + activations) when MLX is installed
+
+Targets are `provider` or `provider:model`:
+    groq, groq:whisper-large-v3      Groq, default or named Whisper model
+    openai:gpt-4o-transcribe         any model the client's API accepts
+    gemini:gemini-2.5-flash
+    local:e2b, local:e4b             Gemma 4 tier (e2b = fast path, clips <= 30s)
+    local, auto, simulated
+
+A target that fails over to another provider counts as a failure for that
+clip (it measured the wrong provider).
+
+Runs use schema-default settings (plus --set overrides) and throwaway
+settings/history/vocabulary files, so results are comparable across machines
+and the real files are never touched. The result cache is off.
+
+Manifest: JSON Lines (or a JSON list), one clip per entry; audio paths are
+relative to the manifest. WAV is used directly (resampled to 16kHz mono if
+needed); other formats are converted with ffmpeg.
+
+    {"audio": "clips/en_01.wav", "reference": "Send the report today.", "language": "en"}
+    {"audio": "clips/zh_01.m4a", "reference": "今天下午开会", "language": "zh", "id": "zh_meeting"}
+
+Usage:
+    uv run python benchmark_providers.py manifest.jsonl --targets local:e2b local:e4b groq
+    uv run python benchmark_providers.py manifest.jsonl --targets groq --repeat 3 --output groq.json
+    uv run python benchmark_providers.py manifest.jsonl --targets groq --compare groq.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+import wave
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio_utils import SAMPLE_RATE, _rebuild_wav, resample_to_16k
+from benchmark_load import isolate_state, parse_overrides, percentiles_ms
+
+# Languages scored by character (no spaces between words)
+CER_LANGUAGES = {"zh", "ja"}
+
+# Settings for every run (before --set and per-target overrides)
+BASE_SETTINGS = {
+    "save_debug_audio": False,
+    "result_cache_enabled": False,
+    "prewarm_on_record": False,
+}
+
+# Load .env for cloud API keys
+env_path = Path(__file__).parent / ".env"
+if env_path.exists():
+    for line in env_path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, _, value = line.partition("=")
+            os.environ.setdefault(key.strip(), value.strip())
+
+
+# =============================================================================
+# Scoring
+# =============================================================================
+
+
+def _tokens(text: str, language: str | None) -> list[str]:
+    """Lowercased tokens without punctuation: characters for CJK, else words."""
+    cleaned = "".join(
+        " " if unicodedata.category(c).startswith("P") else c for c in text.lower()
+    )
+    if language in CER_LANGUAGES:
+        return [c for c in cleaned if not c.isspace()]
+    return cleaned.split()
+
+
+def edit_distance(reference: list[str], hypothesis: list[str]) -> int:
+    """Levenshtein distance (substitutions + deletions + insertions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        current = [i]
+        for j, hyp in enumerate(hypothesis, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref != hyp),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def score(reference: str, hypothesis: str, language: str | None) -> dict:
+    """Errors and reference length for one clip (WER or CER units)."""
+    ref = _tokens(reference, language)
+    hyp = _tokens(hypothesis, language)
+    errors = edit_distance(ref, hyp)
+    return {
+        "metric": "cer" if language in CER_LANGUAGES else "wer",
+        "errors": errors,
+        "ref_len": len(ref),
+        "rate": round(errors / len(ref), 4) if ref else None,
+    }
+
+
+# =============================================================================
+# Manifest
+# =============================================================================
+
+
+def _load_audio(path: Path) -> bytes:
+    """16kHz mono 16-bit WAV bytes for any audio file."""
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as w:
+            rate, channels, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+            frames = w.readframes(w.getnframes())
+        if width == 2:
+            samples = np.frombuffer(frames, dtype=np.int16)
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+            if rate != SAMPLE_RATE:
+                samples = resample_to_16k(samples, rate)
+            return _rebuild_wav(samples)
+
+    # Compressed or unusual WAV: let ffmpeg decode and resample
+    with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-i",
+                str(path),
+                "-ar",
+                str(SAMPLE_RATE),
+                "-ac",
+                "1",
+                "-sample_fmt",
+                "s16",
+                "-f",
+                "wav",
+                tmp.name,
+            ],
+            capture_output=True,
+            check=True,
+        )
+        return _load_audio(Path(tmp.name))
+
+
+def load_manifest(path: Path) -> list[dict]:
+    """Clips with decoded audio, duration, reference and language."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    clips = []
+    for entry in entries:
+        audio = _load_audio(path.parent / entry["audio"])
+        clips.append(
+            {
+                "id": entry.get("id", Path(entry["audio"]).stem),
+                "audio": audio,
+                "duration": (len(audio) - 44) / (SAMPLE_RATE * 2),
+                "reference": entry["reference"],
+                "language": entry.get("language"),
+            }
+        )
+    return clips
+
+
+# =============================================================================
+# Running
+# =============================================================================
+
+
+def _peak_rss_mb() -> float:
+    """Process peak RSS (ru_maxrss is bytes on macOS, KB on Linux)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _mlx_peak(reset: bool = False) -> float | None:
+    """MLX peak memory in MB since the last reset, or None without MLX."""
+    try:
+        import mlx.core as mx
+    except ImportError:
+        return None
+    if reset:
+        mx.reset_peak_memory()
+        return None
+    return mx.get_peak_memory() / (1024 * 1024)
+
+
+def _target_settings(provider: str, model: str | None) -> dict:
+    """Setting overrides that select a local model tier."""
+    import settings
+
+    if provider != "local" or model is None:
+        return {}
+    if model == "e2b":
+        longest = settings.SETTINGS_SCHEMA["local_fast_path_max_duration"]["max"]
+        return {"local_fast_path": True, "local_fast_path_max_duration": longest}
+    if model == "e4b":
+        return {"local_fast_path": False}
+    raise ValueError(f"Unknown local model {model!r} (use e2b or e4b)")
+
+
+@contextlib.contextmanager
+def _cloud_model(provider: str, model: str | None):
+    """Temporarily point the provider's client at another model."""
+    import stt_engine
+
+    stt = stt_engine._cloud_stt(provider) if provider != "local" else None
+    if model is None or stt is None:
+        yield
+        return
+    previous = stt.model
+    stt.model = model
+    try:
+        yield
+    finally:
+        stt.model = previous
+
+
+def _transcribe(clip: dict, provider: str, auto_language: bool) -> dict:
+    import stt_engine
+
+    language = None if auto_language else clip["language"]
+    # The router logs every step; keep the output to the benchmark's
+    with contextlib.redirect_stdout(io.StringIO()):
+        return stt_engine.transcribe_audio_with_provider(
+            clip["audio"], language, provider=provider
+        )
+
+
+def run_target(
+    target: str,
+    clips: list[dict],
+    settings_values: dict,
+    repeat: int,
+    warmup: int,
+    auto_language: bool,
+) -> dict:
+    """Benchmark one provider[:model] over every clip."""
+    import settings
+
+    provider, _, model = target.partition(":")
+    model = model or None
+    settings.SETTINGS_FILE.write_text(
+        json.dumps({**settings_values, **_target_settings(provider, model)})
+    )
+
+    rows = []
+    rss_before = _peak_rss_mb()
+    _mlx_peak(reset=True)
+    with _cloud_model(provider, model):
+        for clip in clips[:warmup]:
+            with contextlib.suppress(Exception):
+                _transcribe(clip, provider, auto_language)
+
+        for clip in clips:
+            print(f"  {target} {clip['id']} ({clip['duration']:.1f}s)", flush=True)
+            for run in range(repeat):
+                row = {"clip": clip["id"], "run": run, "duration_s": clip["duration"]}
+                start = time.perf_counter()
+                try:
+                    result = _transcribe(clip, provider, auto_language)
+                except Exception as e:
+                    row["error"] = f"{type(e).__name__}: {e}"
+                    rows.append(row)
+                    continue
+                row["latency_s"] = time.perf_counter() - start
+                row["text"] = result.get("text", "")
+                if result.get("failover_from"):
+                    row["error"] = f"failed over to {result.get('provider')}"
+                row.update(score(clip["reference"], row["text"], clip["language"]))
+                rows.append(row)
+
+    return {
+        "target": target,
+        "provider": provider,
+        "model": model,
+        "clips": rows,
+        "summary": summarize(
+            rows,
+            rss_growth=_peak_rss_mb() - rss_before,
+            mlx_peak=_mlx_peak(),
+        ),
+    }
+
+
+def summarize(rows: list[dict], rss_growth: float, mlx_peak: float | None) -> dict:
+    """Per-target accuracy, latency, RTF and memory."""
+    ok = [r for r in rows if "error" not in r]
+    summary = {
+        "runs": len(rows),
+        "failures": len(rows) - len(ok),
+        "latency_ms": percentiles_ms([r["latency_s"] for r in ok]),
+    }
+    rtf = [r["latency_s"] / r["duration_s"] for r in ok if r["duration_s"] > 0]
+    summary["rtf"] = {
+        "p50": round(float(np.percentile(rtf, 50)), 4) if rtf else None,
+        "mean": round(float(np.mean(rtf)), 4) if rtf else None,
+    }
+    for metric in ("wer", "cer"):
+        scored = [r for r in ok if r["metric"] == metric]
+        ref_len = sum(r["ref_len"] for r in scored)
+        if ref_len:
+            summary[metric] = round(sum(r["errors"] for r in scored) / ref_len, 4)
+    summary["peak_rss_growth_mb"] = round(rss_growth, 1)
+    summary["mlx_peak_mb"] = round(mlx_peak, 1) if mlx_peak is not None else None
+    return summary
+
+
+def format_results(targets: list[dict]) -> str:
+    """Markdown table of per-target summaries."""
+
+    def fmt(value, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    lines = [
+        "| Target | WER | CER | p50 | p95 | p99 | RTF p50 | Peak mem | Failures |",
+        "|--------|-----|-----|-----|-----|-----|---------|----------|----------|",
+    ]
+    for t in targets:
+        s = t["summary"]
+        lat = s["latency_ms"]
+        memory = (
+            s["mlx_peak_mb"]
+            if s["mlx_peak_mb"] is not None
+            else s["peak_rss_growth_mb"]
+        )
+        lines.append(
+            f"| {t['target']} | {fmt(s.get('wer'), '.1%')} | {fmt(s.get('cer'), '.1%')} | "
+            f"{fmt(lat['p50'], '.0f')}ms | {fmt(lat['p95'], '.0f')}ms | "
+            f"{fmt(lat['p99'], '.0f')}ms | {fmt(s['rtf']['p50'], '.3f')} | "
+            f"{fmt(memory, ',.0f')} MB | {s['failures']}/{s['runs']} |"
+        )
+    return "\n".join(lines)
+
+
+def compare(
+    targets: list[dict], baseline: dict, threshold: float, error_tolerance: float
+) -> list[dict]:
+    """Match targets to a baseline run and flag regressions.
+
+    A target regresses when its WER/CER grows by more than `error_tolerance`
+    (absolute), its p50 or p95 latency or peak memory grows by more than
+    `threshold` (e.g. 1.3 = 30% worse), or it has more failures.
+    """
+    base_by_target = {t["target"]: t["summary"] for t in baseline.get("targets", [])}
+    regressions = []
+    for t in targets:
+        base = base_by_target.get(t["target"])
+        if base is None:
+            continue
+        s = t["summary"]
+        reasons = []
+        for metric in ("wer", "cer"):
+            if (
+                metric in s
+                and metric in base
+                and s[metric] - base[metric] > error_tolerance
+            ):
+                reasons.append(f"{metric} {base[metric]:.1%} -> {s[metric]:.1%}")
+        for q in ("p50", "p95"):
+            now, before = s["latency_ms"][q], base["latency_ms"][q]
+            if now and before and now / before > threshold:
+                reasons.append(f"latency {q} {now / before:.2f}x")
+        memory_key = (
+            "mlx_peak_mb" if s["mlx_peak_mb"] is not None else "peak_rss_growth_mb"
+        )
+        now, before = s[memory_key], base.get(memory_key)
+        # RSS growth is 0 once the process peak is reached; only compare real growth
+        if now and before and before > 1 and now / before > threshold:
+            reasons.append(f"{memory_key} {now / before:.2f}x")
+        if s["failures"] > base["failures"]:
+            reasons.append(f"failures {base['failures']} -> {s['failures']}")
+        if reasons:
+            regressions.append({"target": t["target"], "reasons": reasons})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark STT providers and models")
+    parser.add_argument("manifest", help="JSONL/JSON manifest of clips with references")
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        required=True,
+        help="provider or provider:model (e.g. local:e2b local:e4b groq openai:whisper-1)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per clip")
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Clips transcribed (unmeasured) before each target",
+    )
+    parser.add_argument(
+        "--auto-language",
+        action="store_true",
+        help="Let providers detect the language instead of passing the manifest's",
+    )
+    parser.add_argument(
+        "--set",
+        nargs="+",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Setting overrides (e.g. short_clip_vocab_limit=0)",
+    )
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON from a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.3,
+        help="Latency/memory regression ratio vs baseline (default: 1.3 = 30%% worse)",
+    )
+    parser.add_argument(
+        "--error-tolerance",
+        type=float,
+        default=0.02,
+        help="Allowed absolute WER/CER increase vs baseline (default: 0.02)",
+    )
+    args = parser.parse_args()
+
+    clips = load_manifest(Path(args.manifest))
+    total_audio = sum(c["duration"] for c in clips)
+    settings_values = {**BASE_SETTINGS, **parse_overrides(args.set)}
+
+    print("Provider Benchmark")
+    print("=" * 60)
+    print(f"{len(clips)} clips, {total_audio:.1f}s of audio, targets: {args.targets}")
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        isolate_state(Path(state_dir), settings_values)
+        targets = [
+            run_target(
+                target,
+                clips,
+                settings_values,
+                args.repeat,
+                args.warmup,
+                args.auto_language,
+            )
+            for target in args.targets
+        ]
+    print()
+    print(format_results(targets))
+
+    if args.output:
+        payload = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "manifest": args.manifest,
+            "clips": len(clips),
+            "audio_s": round(total_audio, 1),
+            "repeat": args.repeat,
+            "settings": settings_values,
+            "targets": targets,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"\nSaved {len(targets)} targets to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(targets, baseline, args.threshold, args.error_tolerance)
+        print(
+            f"\nCompared with {args.compare} (threshold {args.threshold:g}x, "
+            f"error tolerance {args.error_tolerance:g})"
+        )
+        for r in regressions:
+            print(f"  REGRESSION {r['target']}: {', '.join(r['reasons'])}")
+        if regressions:
+            sys.exit(1)
+        print("  No regressions")
+
+
+if __name__ == "__main__":
+    main()
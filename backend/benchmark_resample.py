@@ -0,0 +1,146 @@
+"""Benchmark capture-rate -> 16kHz resampling for common interface sample rates.
+
+Compares, for 44.1kHz, 48kHz and 96kHz input at several recording lengths:
+- scipy resample_poly (previous implementation: filter designed every call)
+- resample_to_16k float64 (cached filter taps, bit-identical output)
+- resample_to_16k float32 (cached filter taps, within 1 LSB)
+- StreamingResampler tail (work left after key release when fed in 512-frame chunks)
+
+Usage:
+    uv run python benchmark_resample.py
+    uv run python benchmark_resample.py --durations 10 60 240 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio_utils import StreamingResampler, resample_to_16k
+
+RATES = [44100, 48000, 96000]
+DEFAULT_DURATIONS = [10, 60, 240]
+CAPTURE_BLOCK = 512  # Typical PortAudio callback size
+
+
+def _speech_like(duration: float, rate: int) -> np.ndarray:
+    """Amplitude-modulated tones plus noise, roughly speech-shaped."""
+    rng = np.random.default_rng(rate)
+    t = np.arange(int(duration * rate)) / rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)  # ~syllable rate
+    voice = sum(np.sin(2 * np.pi * f * t) / i for i, f in enumerate((180, 360, 720), 1))
+    audio = envelope * voice * 6000 + rng.standard_normal(len(t)) * 300
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def _best_of(fn, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _scipy_resample(audio: np.ndarray, rate: int) -> np.ndarray:
+    """Previous resample_to_16k body: resample_poly on float64."""
+    from math import gcd
+
+    from scipy.signal import resample_poly
+
+    g = gcd(16000, rate)
+    resampled = resample_poly(audio.astype(np.float64), 16000 // g, rate // g)
+    np.clip(resampled, -32768, 32767, out=resampled)
+    return resampled.astype(np.int16)
+
+
+def _streaming_tail(audio: np.ndarray, rate: int) -> float:
+    """Feed capture-sized blocks, return only the time spent in flush()."""
+    resampler = StreamingResampler(rate)
+    for i in range(0, len(audio), CAPTURE_BLOCK):
+        resampler.process(audio[i : i + CAPTURE_BLOCK])
+    start = time.perf_counter()
+    resampler.flush()
+    return time.perf_counter() - start
+
+
+def _measure(audio: np.ndarray, rate: int, repeat: int) -> dict:
+    """Time every resampling path on one input."""
+    return {
+        "scipy_ms": _best_of(lambda: _scipy_resample(audio, rate), repeat) * 1000,
+        "float64_ms": _best_of(lambda: resample_to_16k(audio, rate), repeat) * 1000,
+        "float32_ms": _best_of(
+            lambda: resample_to_16k(audio, rate, dtype=np.float32), repeat
+        )
+        * 1000,
+        "stream_tail_ms": min(_streaming_tail(audio, rate) for _ in range(repeat))
+        * 1000,
+    }
+
+
+def run(durations: list[float], repeat: int) -> list[dict]:
+    results = []
+    for rate in RATES:
+        # Warm the filter cache so the cached paths are measured steady-state
+        resample_to_16k(np.zeros(rate, dtype=np.int16), rate)
+        resample_to_16k(np.zeros(rate, dtype=np.int16), rate, dtype=np.float32)
+
+        for duration in durations:
+            audio = _speech_like(duration, rate)
+            row = {
+                "rate": rate,
+                "duration_s": duration,
+                **_measure(audio, rate, repeat),
+            }
+            results.append(row)
+            print(
+                f"  {rate}Hz {duration:>5.0f}s: scipy={row['scipy_ms']:.1f}ms "
+                f"f64={row['float64_ms']:.1f}ms f32={row['float32_ms']:.1f}ms "
+                f"stream tail={row['stream_tail_ms']:.2f}ms"
+            )
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    """Format results as a markdown table."""
+    lines = [
+        "| Input | Length | resample_poly | float64 (cached) | float32 (cached) | Streaming tail |",
+        "|-------|--------|---------------|------------------|------------------|----------------|",
+    ]
+    for r in results:
+        lines.append(
+            f"| {r['rate'] / 1000:g}kHz | {r['duration_s']:g}s | {r['scipy_ms']:.1f}ms | "
+            f"{r['float64_ms']:.1f}ms | {r['float32_ms']:.1f}ms | {r['stream_tail_ms']:.2f}ms |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resampling to 16kHz")
+    parser.add_argument(
+        "--durations",
+        type=float,
+        nargs="+",
+        default=DEFAULT_DURATIONS,
+        help="Recording lengths in seconds (default: 10 60 240)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per measurement (best kept)"
+    )
+    args = parser.parse_args()
+
+    print("Resampling Benchmark")
+    print("=" * 60)
+    results = run(args.durations, args.repeat)
+    print()
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Compare ways of handing audio to lightning-whisper-mlx.
+
+For 1s, 10s and 60s clips, times how long it takes to get Whisper's input
+(a float32 16kHz array) from the preprocessed recording:
+
+    temp file + ffmpeg   write a temp WAV, decode it with lightning-whisper-mlx's
+                         load_audio (an ffmpeg subprocess) — the old path
+    WAV bytes            decode the in-memory WAV with as_float32_samples()
+    float32 array        the array threaded from the router (no decode at all)
+
+With --inference (Apple Silicon, lightning-whisper-mlx installed), the full
+transcribe_audio() call is also timed with a file path vs the array.
+
+Usage:
+    uv run python benchmark_whisper_input.py
+    uv run python benchmark_whisper_input.py --inference --runs 3
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio_utils import SAMPLE_RATE, _rebuild_wav, as_float32_samples
+from benchmark_audio import speech_like
+
+DURATIONS = [1, 10, 60]
+
+
+def _ffmpeg_load(path: str) -> np.ndarray:
+    """Same command as lightning_whisper_mlx.audio.load_audio."""
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-threads",
+        "0",
+        "-i",
+        path,
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-",
+    ]
+    out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def _via_temp_file(wav: bytes) -> np.ndarray:
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        f.write(wav)
+        path = f.name
+    try:
+        return _ffmpeg_load(path)
+    finally:
+        os.unlink(path)
+
+
+def _best_ms(fn, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def _inference_ms(wav: bytes, array: np.ndarray, runs: int) -> tuple[float, float]:
+    """Full transcribe_audio() time: temp file path vs float32 array."""
+    from lightning_whisper_mlx.transcribe import transcribe_audio
+
+    from stt_engine import get_engine
+
+    engine = get_engine()
+    if engine.model is None:
+        engine.load_model()
+
+    def from_file():
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            f.write(wav)
+            path = f.name
+        try:
+            transcribe_audio(
+                audio=path,
+                path_or_hf_repo=engine._model_path,
+                batch_size=engine.batch_size,
+            )
+        finally:
+            os.unlink(path)
+
+    def from_array():
+        transcribe_audio(
+            audio=array,
+            path_or_hf_repo=engine._model_path,
+            batch_size=engine.batch_size,
+        )
+
+    return _best_ms(from_file, runs), _best_ms(from_array, runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper input path timing")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument(
+        "--inference",
+        action="store_true",
+        help="Also time full transcribe_audio() (needs lightning-whisper-mlx)",
+    )
+    args = parser.parse_args()
+
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    if not has_ffmpeg:
+        print("ffmpeg not found — skipping the temp file + ffmpeg column")
+
+    print()
+    print("| Clip | temp file + ffmpeg | WAV bytes | float32 array |")
+    print("|------|--------------------|-----------|---------------|")
+    clips = {}
+    for duration in DURATIONS:
+        wav = _rebuild_wav(speech_like(duration, SAMPLE_RATE, "normal"))
+        array = as_float32_samples(wav).copy()
+        clips[duration] = (wav, array)
+
+        ffmpeg_ms = (
+            f"{_best_ms(lambda wav=wav: _via_temp_file(wav), args.runs):.2f}ms"
+            if has_ffmpeg
+            else "n/a"
+        )
+        bytes_ms = _best_ms(lambda wav=wav: as_float32_samples(wav), args.runs)
+        array_ms = _best_ms(lambda array=array: as_float32_samples(array), args.runs)
+        print(f"| {duration}s | {ffmpeg_ms} | {bytes_ms:.3f}ms | {array_ms:.4f}ms |")
+
+    if args.inference:
+        print()
+        print("| Clip | transcribe_audio(path) | transcribe_audio(array) | Saved |")
+        print("|------|------------------------|-------------------------|-------|")
+        for duration, (wav, array) in clips.items():
+            file_ms, array_ms = _inference_ms(wav, array, args.runs)
+            print(
+                f"| {duration}s | {file_ms:.0f}ms | {array_ms:.0f}ms | "
+                f"{file_ms - array_ms:.0f}ms |"
+            )
+
+
+if __name__ == "__main__":
+    main()
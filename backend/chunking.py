@@ -0,0 +1,145 @@
+"""
+Parallel chunked transcription for long recordings on cloud providers.
+
+A 4-minute dictation sent as one file costs one long round trip. Instead, the
+audio is cut at pauses into ~30s chunks, the chunks are sent to the provider
+concurrently (bounded by a concurrency cap), and the texts are stitched back
+together in order. Chunks share a short overlap, so the words that appear at
+the end of one chunk and the start of the next are de-duplicated on merge.
+"""
+
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_utils import SAMPLE_RATE, WAV_HEADER_SIZE, split_wav_at_pauses
+
+# Scripts written without spaces between words — merged character by character
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+# Max tokens considered when looking for a duplicated overlap
+MAX_OVERLAP_WORDS = 10
+MAX_OVERLAP_CHARS = 30
+# A single shared token is usually a genuinely repeated word, not overlap
+MIN_OVERLAP_TOKENS = 2
+
+
+def _normalize_token(token: str) -> str:
+    """Lowercase and strip punctuation so 'Meeting.' matches 'meeting'."""
+    return re.sub(r"[^\w]", "", token.lower())
+
+
+def _join_with_overlap(previous: str, following: str) -> str:
+    """Join two chunk texts, dropping the longest duplicated overlap.
+
+    Looks for the longest run of at least MIN_OVERLAP_TOKENS tokens at the
+    end of `previous` that also starts `following` (case- and
+    punctuation-insensitive) and keeps only one copy of it.
+    """
+    cjk = bool(_CJK_RE.search(previous) or _CJK_RE.search(following))
+    if cjk:
+        prev_tokens = list(previous)
+        next_tokens = list(following)
+        limit = MAX_OVERLAP_CHARS
+        joiner = ""
+    else:
+        prev_tokens = previous.split()
+        next_tokens = following.split()
+        limit = MAX_OVERLAP_WORDS
+        joiner = " "
+
+    prev_norm = [_normalize_token(t) for t in prev_tokens[-limit:]]
+    next_norm = [_normalize_token(t) for t in next_tokens[:limit]]
+
+    for size in range(min(len(prev_norm), len(next_norm)), MIN_OVERLAP_TOKENS - 1, -1):
+        tail = prev_norm[-size:]
+        if tail == next_norm[:size] and any(tail):
+            remainder = joiner.join(next_tokens[size:])
+            merged = joiner.join(prev_tokens)
+            return f"{merged}{joiner}{remainder}" if remainder else merged
+
+    return f"{previous}{joiner}{following}"
+
+
+def merge_chunk_texts(texts: list[str]) -> str:
+    """Merge per-chunk transcriptions in order, de-duplicating overlaps."""
+    merged = ""
+    for text in texts:
+        text = text.strip()
+        if not text:
+            continue
+        merged = _join_with_overlap(merged, text) if merged else text
+    return merged
+
+
+def transcribe_chunked(
+    stt,
+    audio_data: bytes,
+    language: str | None = None,
+    max_vocab_words: int = 0,
+    target_duration: float = 30.0,
+    max_concurrency: int = 4,
+) -> dict:
+    """Transcribe a long recording as concurrent pause-aligned chunks.
+
+    Args:
+        stt: Provider instance with a `transcribe(audio_data, language,
+            max_vocab_words=...)` method (GroqSTT, OpenAISTT, GeminiSTT)
+        audio_data: Raw audio bytes (WAV format, 16kHz mono 16-bit PCM)
+        language: Language code (fr, en, etc.) or None for auto-detect
+        max_vocab_words: Max vocabulary words in prompt (0 = no limit)
+        target_duration: Preferred chunk length in seconds
+        max_concurrency: Max chunks in flight at once
+
+    Returns:
+        Dict with 'text', 'language', 'duration', 'processing_time',
+        'provider' and 'chunks' (number of chunks sent)
+    """
+    start = time.time()
+
+    chunks = split_wav_at_pauses(audio_data, target_duration=target_duration)
+    if len(chunks) == 1:
+        return stt.transcribe(audio_data, language, max_vocab_words=max_vocab_words)
+
+    duration = max(0, (len(audio_data) - WAV_HEADER_SIZE) / (SAMPLE_RATE * 2))
+    workers = max(1, min(int(max_concurrency), len(chunks)))
+    print(
+        f"  [Chunked] {duration:.1f}s audio -> {len(chunks)} chunks "
+        f"({workers} in parallel)"
+    )
+
+    def transcribe_one(chunk: bytes) -> dict:
+        return stt.transcribe(chunk, language, max_vocab_words=max_vocab_words)
+
+    # pool.map keeps results in chunk order and re-raises the first failure
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="stt-chunk"
+    ) as pool:
+        results = list(pool.map(transcribe_one, chunks))
+
+    text = merge_chunk_texts([r.get("text", "") for r in results])
+
+    # Most common language across chunks that produced text
+    detected = [r.get("language") for r in results if r.get("text")]
+    detected_language = (
+        Counter(detected).most_common(1)[0][0] if detected else language or "unknown"
+    )
+
+    total_time = time.time() - start
+    print(
+        f"  [Chunked] Merged {len(chunks)} chunks in {total_time * 1000:.0f}ms "
+        f"(audio={duration:.1f}s)"
+    )
+
+    return {
+        "text": text,
+        "language": detected_language,
+        "language_probability": min(
+            (r.get("language_probability", 1.0) for r in results), default=1.0
+        ),
+        "duration": duration,
+        "processing_time": total_time,
+        "provider": results[0].get("provider", "unknown"),
+        "chunks": len(chunks),
+    }
@@ -0,0 +1,130 @@
+"""Per-provider circuit breakers for fast cloud failover.
+
+closed     Requests flow; consecutive failures are counted.
+open       After `failure_threshold` consecutive failures the provider is
+           skipped (the router moves down the fallback order) for
+           `reset_timeout` seconds.
+half_open  Once the timeout passes, a background probe sends a tiny synthetic
+           clip. Success closes the breaker; failure opens it again. Without a
+           probe, the next real request is let through as the trial instead.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from audio_utils import SAMPLE_RATE, _rebuild_wav
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Probe clip: a short quiet tone, enough for every provider to accept
+PROBE_SECONDS = 0.5
+PROBE_FREQUENCY_HZ = 440
+PROBE_AMPLITUDE = 3000
+
+
+def probe_clip() -> bytes:
+    """Tiny synthetic WAV used to test whether a provider is back."""
+    t = np.arange(int(SAMPLE_RATE * PROBE_SECONDS)) / SAMPLE_RATE
+    return _rebuild_wav(PROBE_AMPLITUDE * np.sin(2 * np.pi * PROBE_FREQUENCY_HZ * t))
+
+
+class CircuitBreaker:
+    """closed / open / half_open state machine for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        probe: Callable[[], object] | None = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_error: str | None = None
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent to the provider now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                print(f"[Breaker] {self.name} half-open")
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            if self.probe is None:
+                return True  # This request is the trial
+        threading.Thread(
+            target=self._run_probe, name=f"probe-{self.name}", daemon=True
+        ).start()
+        return False
+
+    def _run_probe(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.probe()
+        except Exception as e:
+            print(f"[Breaker] {self.name} probe failed: {e}")
+            self.record_failure(e)
+            return
+        print(
+            f"[Breaker] {self.name} probe ok "
+            f"({(time.perf_counter() - start) * 1000:.0f}ms)"
+        )
+        self.record_success()
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"[Breaker] {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self, error: BaseException | None = None) -> None:
+        with self._lock:
+            self.failures += 1
+            if error is not None:
+                self.last_error = str(error)[:200]
+            self._trial_running = False
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                print(
+                    f"[Breaker] {self.name} open after {self.failures} failure(s), "
+                    f"retry in {self.reset_timeout:.0f}s"
+                )
+
+    def snapshot(self) -> dict:
+        """State for /api/health."""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+                retry_in = round(max(0.0, remaining), 1)
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "retry_in_s": retry_in,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,76 @@
+"""Shared fixtures for the backend tests."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+class FakeCloud:
+    """Synchronous cloud provider stand-in that records its calls."""
+
+    def __init__(self, name, error=None, calls=None):
+        self.name = name
+        self.error = error
+        self.calls = 0
+        self._log = calls if calls is not None else []
+
+    def transcribe(self, audio_data, language=None, max_vocab_words=0):
+        self.calls += 1
+        self._log.append(self.name)
+        if self.error:
+            raise self.error
+        return {"text": self.name, "language": "en", "provider": self.name}
+
+
+@pytest.fixture
+def router_settings():
+    """Setting overrides for `router`; override this fixture in a test module."""
+    return {}
+
+
+@pytest.fixture
+def router(monkeypatch, router_settings):
+    """stt_engine routed to fake groq / gemini clouds, on a 1s test clip.
+
+    Settings are the defaults plus `router_settings`, with no result cache
+    or debug audio. Breakers and rate limiters start fresh.
+    """
+    import audio_utils
+    import rate_limit
+    import stt_engine
+    from audio_utils import _rebuild_wav
+    from settings import _get_defaults
+
+    settings = {
+        **_get_defaults(),
+        "save_debug_audio": False,
+        "result_cache_enabled": False,
+        **router_settings,
+    }
+    monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+    monkeypatch.setattr(audio_utils, "get_setting", settings.get)
+    monkeypatch.setattr(audio_utils, "get_min_volume_rms", lambda: 0)
+    monkeypatch.setattr(stt_engine, "get_stt_provider", lambda: "groq")
+    monkeypatch.setattr(stt_engine, "_breakers", {})
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+
+    calls = []
+
+    def cloud_cls(name, error=None):
+        return FakeCloud(name, error, calls)
+
+    clouds = {"groq": cloud_cls("groq"), "gemini": cloud_cls("gemini")}
+    monkeypatch.setattr(stt_engine, "_cloud_stt", clouds.get)
+
+    samples = (np.sin(np.arange(16000) / 10) * 3000).astype(np.int16)
+    wav = _rebuild_wav(samples)
+    return SimpleNamespace(
+        engine=stt_engine,
+        settings=settings,
+        clouds=clouds,
+        calls=calls,
+        cloud_cls=cloud_cls,
+        wav=wav,
+        run=lambda: stt_engine._transcribe_uncached(wav, "en"),
+    )
@@ -9,21 +9,34 @@ Model:
 - gemini-3.1-flash-lite-preview: Fast, cheap LLM-based transcription
 """
 
+import asyncio
 import os
 import time
+from typing import ClassVar
 
 from google import genai
 from google.genai import types
 
 import replacements
 import vocabulary
+from async_http import get_async_http_client
 from content_filter import get_filter
 from settings import get_setting
 
+# Fail fast (no client-side timeout by default) so the router can fail over
+REQUEST_TIMEOUT = 30.0  # seconds
+API_HOST = "https://generativelanguage.googleapis.com/"
+
 
 class GeminiSTT:
     """Gemini API client for audio transcription."""
 
+    # Accepted audio inputs; WAV bytes are sent inline in the request
+    CAPABILITIES: ClassVar[dict] = {
+        "input_forms": ("wav_bytes",),
+        "backend_input": "inline_bytes",
+    }
+
     def __init__(self):
         """Initialize the Gemini client."""
         api_key = os.environ.get("GEMINI_API_KEY")
@@ -32,7 +45,14 @@ class GeminiSTT:
                 "GEMINI_API_KEY environment variable not set. "
                 "Get your API key from https://aistudio.google.com/apikey"
             )
-        self.client = genai.Client(api_key=api_key)
+        self.api_key = api_key
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(timeout=int(REQUEST_TIMEOUT * 1000)),
+        )
+        # Created on first async use, on the shared connection pool
+        self._aclient: genai.Client | None = None
+        self._aclient_http = None
         self.model = "gemini-3.1-flash-lite-preview"
 
         # Custom vocabulary for prompt
@@ -93,40 +113,51 @@ class GeminiSTT:
 
         return "\n".join(parts)
 
-    def transcribe(
-        self,
-        audio_data: bytes,
-        language: str | None = None,
-        max_vocab_words: int = 0,
-    ) -> dict:
-        """Transcribe audio data using Gemini API.
+    def _async_models(self):
+        """Async models API on the shared connection pool (rebuilt if the pool is)."""
+        http_client = get_async_http_client()
+        if self._aclient is None or self._aclient_http is not http_client:
+            self._aclient = genai.Client(
+                api_key=self.api_key,
+                http_options=types.HttpOptions(
+                    timeout=int(REQUEST_TIMEOUT * 1000),
+                    httpx_async_client=http_client,
+                ),
+            )
+            self._aclient_http = http_client
+        return self._aclient.aio.models
 
-        Args:
-            audio_data: Raw audio bytes (WAV format)
-            language: Language code (fr, en, etc.) or None for auto-detect
-            max_vocab_words: Max vocabulary words in prompt (0 = no limit)
+    async def prewarm(self) -> None:
+        """Open (or refresh) a pooled connection to the API host.
 
-        Returns:
-            Dict with 'text', 'language', 'duration', 'processing_time', 'provider'
+        Any HTTP response will do; the point is the TCP + TLS handshake, so
+        the next request reuses a warm keep-alive connection.
         """
-        total_start = time.time()
+        self._async_models()  # Build the aio client now, not on the first request
+        await get_async_http_client().head(API_HOST)
 
-        # Guard against empty/tiny audio — Gemini hallucinates from prompt vocabulary
+    def _too_short(self, audio_data: bytes, language: str | None) -> dict | None:
+        """Empty result for empty/tiny audio — Gemini hallucinates from prompt vocabulary."""
         min_duration = get_setting("min_recording_duration") or 0.3
         estimated_duration = max(0, (len(audio_data) - 44) / (16000 * 2))
-        if estimated_duration < min_duration:
-            print(
-                f"  [Gemini] Audio too short ({estimated_duration:.2f}s < {min_duration}s), skipping"
-            )
-            return {
-                "text": "",
-                "language": language or "unknown",
-                "language_probability": 0.0,
-                "duration": estimated_duration,
-                "processing_time": 0.0,
-                "provider": "gemini",
-            }
+        if estimated_duration >= min_duration:
+            return None
+        print(
+            f"  [Gemini] Audio too short ({estimated_duration:.2f}s < {min_duration}s), skipping"
+        )
+        return {
+            "text": "",
+            "language": language or "unknown",
+            "language_probability": 0.0,
+            "duration": estimated_duration,
+            "processing_time": 0.0,
+            "provider": "gemini",
+        }
 
+    def _contents(
+        self, audio_data: bytes, language: str | None, max_vocab_words: int
+    ) -> list:
+        """Request contents: inline audio bytes followed by the prompt."""
         lang_mode = language.upper() if language else "AUTO-DETECT"
         print(f"  [Gemini] transcribe() called with language={lang_mode}")
 
@@ -141,17 +172,18 @@ class GeminiSTT:
             )
             print(f"  [Gemini] Using prompt with {used} vocab words (no char limit)")
 
-        # --- Send inline audio bytes and call API ---
-        inference_start = time.time()
-
         audio_part = types.Part.from_bytes(data=audio_data, mime_type="audio/wav")
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=[audio_part, prompt],
-        )
-
-        inference_time = (time.time() - inference_start) * 1000
+        return [audio_part, prompt]
 
+    def _build_result(
+        self,
+        response,
+        audio_data: bytes,
+        language: str | None,
+        total_start: float,
+        inference_time: float,
+    ) -> dict:
+        """Post-process the API response into the result dict."""
         full_text = response.text.strip() if response.text else ""
 
         # Track vocabulary usage (pure match detection, no rewrite)
@@ -189,6 +221,69 @@ class GeminiSTT:
             "provider": "gemini",
         }
 
+    def transcribe(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Transcribe audio data using Gemini API.
+
+        Args:
+            audio_data: Raw audio bytes (WAV format)
+            language: Language code (fr, en, etc.) or None for auto-detect
+            max_vocab_words: Max vocabulary words in prompt (0 = no limit)
+
+        Returns:
+            Dict with 'text', 'language', 'duration', 'processing_time', 'provider'
+        """
+        total_start = time.time()
+        skipped = self._too_short(audio_data, language)
+        if skipped is not None:
+            return skipped
+        contents = self._contents(audio_data, language, max_vocab_words)
+
+        # --- Send inline audio bytes and call API ---
+        inference_start = time.time()
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=contents,
+        )
+        inference_time = (time.time() - inference_start) * 1000
+
+        return self._build_result(
+            response, audio_data, language, total_start, inference_time
+        )
+
+    async def transcribe_async(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Async transcribe(): awaited on the event loop via the shared pool."""
+        total_start = time.time()
+        skipped = self._too_short(audio_data, language)
+        if skipped is not None:
+            return skipped
+        contents = self._contents(audio_data, language, max_vocab_words)
+
+        inference_start = time.time()
+        response = await self._async_models().generate_content(
+            model=self.model,
+            contents=contents,
+        )
+        inference_time = (time.time() - inference_start) * 1000
+
+        return await asyncio.to_thread(
+            self._build_result,
+            response,
+            audio_data,
+            language,
+            total_start,
+            inference_time,
+        )
+
 
 # Singleton instance
 _gemini_stt: GeminiSTT | None = None
@@ -6,15 +6,21 @@ weaker for Chinese. Best suited as an offline fallback when cloud APIs
 are unavailable.
 
 Model: mlx-community/gemma-4-e4b-it-4bit (~5.2 GB, needs ~6 GB unified memory)
+Fast tier: mlx-community/gemma-4-e2b-it-4bit (~1 GB), used for short clips
+when the local fast path is enabled (see stt_engine routing)
 Requires: mlx-vlm >= 0.4.3 (install with: uv sync --extra local-gemma)
 """
 
-import gc
+import copy
 import logging
 import re
-import tempfile
 import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
 from pathlib import Path
+from typing import ClassVar
+
+import numpy as np
 
 import replacements
 import vocabulary
@@ -25,16 +31,171 @@ logger = logging.getLogger(__name__)
 
 MODEL_ID = "mlx-community/gemma-4-e4b-it-4bit"
 
+# Model tiers: E2B is the fast path for short clips, E4B the default
+MODELS = {
+    "e2b": "mlx-community/gemma-4-e2b-it-4bit",
+    "e4b": MODEL_ID,
+}
+DEFAULT_TIER = "e4b"
+
+# Token budget: generous upper bound on speech rate, in output tokens per
+# second of audio (CJK is ~1 token per character, spoken at up to ~8 chars/s)
+MAX_TOKENS = 500
+MIN_TOKENS = 32
+TOKENS_PER_SECOND = {"zh": 12.0, "ja": 14.0}
+DEFAULT_TOKENS_PER_SECOND = 8.0
+
+# Prefilled prompt prefixes kept (one per language / vocab-limit combination)
+MAX_PROMPT_CACHE_ENTRIES = 4
+
+
+def token_budget(duration: float, language: str | None = None) -> int:
+    """Max output tokens for a clip: proportional to duration, capped at MAX_TOKENS."""
+    rate = TOKENS_PER_SECOND.get(language or "", DEFAULT_TOKENS_PER_SECOND)
+    return int(min(MAX_TOKENS, MIN_TOKENS + duration * rate))
+
+
+class RepetitionDetector:
+    """Detects a generation loop from the token stream.
+
+    Flags when the most recent tokens are one short unit (up to max_period
+    tokens) repeated back to back: 8+ times for single tokens, 4+ times for
+    longer units, and at least min_span tokens in all. Tokens are not
+    words: Gemma's tokenizer emits one token per digit, so "100000000" is
+    a run of '0' tokens. Units without a letter (digits, punctuation) are
+    therefore never flagged, and the span floor keeps short spoken
+    repeats ("no, no, no, no") intact.
+    """
+
+    def __init__(
+        self,
+        max_period: int = 16,
+        min_repeats: int = 4,
+        min_single_repeats: int = 8,
+        min_span: int = 32,
+    ):
+        self.max_period = max_period
+        self.min_repeats = min_repeats
+        self.min_single_repeats = min_single_repeats
+        self.min_span = min_span
+        self.tokens: list[int] = []
+        self.texts: list[str | None] = []
+        self.period = 0  # Length of the repeated unit while the tail loops
+
+    def add(self, token: int, text: str | None = None) -> bool:
+        """Add a token (and its text, if known); True while the tail is looping."""
+        self.tokens.append(token)
+        self.texts.append(text)
+        tokens = self.tokens
+        self.period = 0
+        for period in range(1, self.max_period + 1):
+            repeats = self.min_single_repeats if period == 1 else self.min_repeats
+            span = period * max(repeats, -(-self.min_span // period))
+            if span > len(tokens):
+                break
+            tail = tokens[-span:]
+            if all(tail[i] == tail[i % period] for i in range(period, span)):
+                if self._has_letters(self.texts[-period:]):
+                    self.period = period
+                    return True
+        return False
+
+    @staticmethod
+    def _has_letters(texts: list[str | None]) -> bool:
+        """Whether a unit contains a letter (unknown text counts as one)."""
+        if any(text is None for text in texts):
+            return True
+        return any(char.isalpha() for text in texts for char in text)
+
+    @property
+    def loop_start(self) -> int:
+        """Index of the first token of the repeated run (keeps one copy of the unit)."""
+        if not self.period:
+            return len(self.tokens)
+        tokens, period = self.tokens, self.period
+        start = len(tokens) - period
+        while (
+            start - period >= 0
+            and tokens[start - period : start] == tokens[start : start + period]
+        ):
+            start -= period
+        return start + period
+
+
+def _snapshot_cache(prompt_cache: list) -> list:
+    """Copy per-layer KV caches so they can be restored for every request.
+
+    Full-attention buffers are trimmed to their filled length, so a restored
+    copy has to grow (concatenate) on its first update instead of writing
+    into the shared arrays. Sliding-window caches filled by one prefill
+    already have no spare room.
+    """
+    snapshot = []
+    for layer in prompt_cache:
+        layer = copy.copy(layer)
+        keys = getattr(layer, "keys", None)
+        if (
+            keys is not None
+            and not hasattr(layer, "max_size")
+            and layer.offset < keys.shape[2]
+        ):
+            layer.keys = layer.keys[..., : layer.offset, :]
+            layer.values = layer.values[..., : layer.offset, :]
+        snapshot.append(layer)
+    return snapshot
+
+
+class _PromptPrefixState:
+    """Prefilled instruction/vocabulary prefix, reused across transcriptions.
+
+    Stands in for mlx-vlm's PromptCacheState: stream_generate() reads
+    `cache`, asks find_prefix_length() how many leading tokens it may skip,
+    then calls update(). Unlike PromptCacheState, only the text before the
+    audio is ever reused — audio placeholder tokens have the same ids for
+    every clip, so matching past them would reuse another clip's audio.
+    """
+
+    def __init__(self, token_ids: list[int], snapshot: list):
+        self.token_ids = token_ids
+        self._snapshot = snapshot
+        self.reused = 0  # Tokens skipped on the last request
+
+    @property
+    def cache(self) -> list:
+        # Fresh copies each time: generation appends audio and output tokens
+        return [copy.copy(layer) for layer in self._snapshot]
+
+    def find_prefix_length(self, new_ids: list) -> int:
+        n = len(self.token_ids)
+        self.reused = n if new_ids[:n] == self.token_ids else 0
+        return self.reused
+
+    def update(self, token_ids: list, kv_cache: list) -> None:
+        """Keep the prefix snapshot unchanged."""
+
 
 class Gemma4STT:
     """Gemma 4 E4B local STT using mlx-vlm."""
 
-    def __init__(self):
+    # Accepted audio inputs; mlx-vlm is handed a float32 array (no temp file)
+    CAPABILITIES: ClassVar[dict] = {
+        "input_forms": ("wav_bytes", "int16_array", "float32_array"),
+        "backend_input": "float32_array",
+    }
+
+    def __init__(self, model_id: str = MODEL_ID):
+        self.model_id = model_id
         self.model = None
         self.processor = None
         self.vocabulary: list[str] = []
         self._loaded = False
 
+        # (language, max_words) -> (chat prompt, prefilled prefix or None)
+        self._prompts: OrderedDict[tuple, tuple[str, _PromptPrefixState | None]] = (
+            OrderedDict()
+        )
+        self.ttft_ms = {"cached": deque(maxlen=50), "uncached": deque(maxlen=50)}
+
     def _ensure_model_loaded(self):
         """Lazy-load the model on first use."""
         if self._loaded:
@@ -42,10 +203,12 @@ class Gemma4STT:
 
         from mlx_vlm import load
 
-        logger.info(f"Loading Gemma 4 E4B model: {MODEL_ID}")
-        print(f"  [Gemma4] Loading model {MODEL_ID} (first call, may take a few seconds)...")
+        logger.info(f"Loading Gemma 4 model: {self.model_id}")
+        print(
+            f"  [Gemma4] Loading model {self.model_id} (first call, may take a few seconds)..."
+        )
         load_start = time.perf_counter()
-        self.model, self.processor = load(MODEL_ID)
+        self.model, self.processor = load(self.model_id)
         load_time = time.perf_counter() - load_start
         print(f"  [Gemma4] Model loaded in {load_time:.1f}s")
         self._loaded = True
@@ -55,27 +218,11 @@ class Gemma4STT:
 
     def _warmup(self):
         """Run a short dummy inference to warm up the model."""
-        import struct
-
         from mlx_vlm import generate
         from mlx_vlm.prompt_utils import apply_chat_template
 
-        # Create a 0.1s silence WAV (16kHz, mono, 16-bit PCM)
-        num_samples = 1600  # 0.1s at 16kHz
-        wav_data = bytearray()
-        # WAV header
-        data_size = num_samples * 2
-        wav_data.extend(b"RIFF")
-        wav_data.extend(struct.pack("<I", 36 + data_size))
-        wav_data.extend(b"WAVEfmt ")
-        wav_data.extend(struct.pack("<IHHIIHH", 16, 1, 1, 16000, 32000, 2, 16))
-        wav_data.extend(b"data")
-        wav_data.extend(struct.pack("<I", data_size))
-        wav_data.extend(b"\x00" * data_size)
-
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(bytes(wav_data))
-            warmup_path = f.name
+        # 0.1s of silence at 16kHz, passed as an array (no WAV file needed)
+        silence = np.zeros(1600, dtype=np.float32)
 
         try:
             prompt = apply_chat_template(
@@ -83,18 +230,183 @@ class Gemma4STT:
                 "Transcribe the audio.", num_audios=1,
             )
             generate(
-                self.model, self.processor, prompt,
-                audio=[warmup_path], max_tokens=10, temperature=0.0,
+                self.model,
+                self.processor,
+                prompt,
+                audio=[silence],
+                max_tokens=10,
+                temperature=0.0,
             )
             print("  [Gemma4] Warmup inference done")
         except Exception as e:
             logger.warning(f"Warmup inference failed (non-fatal): {e}")
-        finally:
-            Path(warmup_path).unlink(missing_ok=True)
+
+    def prepare(self, language: str | None = None, max_words: int = 0) -> None:
+        """Load the model and build this prompt (and its prefilled prefix) ahead of a request.
+
+        Must run on the thread that runs inference (the local scheduler's worker).
+        """
+        self._ensure_model_loaded()
+        self._get_prompt(language, max_words)
 
     def set_vocabulary(self, words: list[str]) -> None:
         """Set custom vocabulary for biasing transcription."""
         self.vocabulary = words
+        # Prompts (and their prefilled KV state) embed the vocabulary
+        self._prompts.clear()
+
+    def _get_prompt(
+        self, language: str | None, max_words: int
+    ) -> tuple[str, "_PromptPrefixState | None"]:
+        """Chat prompt for this language/vocab limit, plus its prefilled prefix.
+
+        Both are built once per (language, vocabulary) and reused; the
+        vocabulary part is dropped by set_vocabulary().
+        """
+        from mlx_vlm.prompt_utils import apply_chat_template
+
+        key = (language, max_words)
+        use_prefix_cache = get_setting("gemma4_prompt_cache")
+
+        if key in self._prompts:
+            self._prompts.move_to_end(key)
+            prompt, prefix = self._prompts[key]
+        else:
+            prompt_text = self._build_prompt(language=language, max_words=max_words)
+            prompt = apply_chat_template(
+                self.processor,
+                self.model.config,
+                prompt_text,
+                num_audios=1,
+            )
+            prefix = None
+
+        if use_prefix_cache and prefix is None:
+            prefix = self._prefill_prefix(prompt)
+
+        self._prompts[key] = (prompt, prefix)
+        while len(self._prompts) > MAX_PROMPT_CACHE_ENTRIES:
+            self._prompts.popitem(last=False)
+
+        return prompt, prefix if use_prefix_cache else None
+
+    def _prefill_prefix(self, prompt: str) -> "_PromptPrefixState | None":
+        """Run the text before the audio through the model once and keep its KV cache."""
+        import mlx.core as mx
+        from mlx_vlm.models import cache as mlx_cache
+
+        audio_token = getattr(self.processor, "audio_token", "")
+        if not audio_token or audio_token not in prompt:
+            return None
+
+        try:
+            start = time.perf_counter()
+            tokenizer = getattr(self.processor, "tokenizer", self.processor)
+            token_ids = tokenizer.encode(
+                prompt[: prompt.index(audio_token)], add_special_tokens=False
+            )
+            if not token_ids:
+                return None
+
+            input_ids = mx.array([token_ids])
+            prompt_cache = mlx_cache.make_prompt_cache(self.model.language_model)
+            embeddings = self.model.get_input_embeddings(input_ids=input_ids)
+            self.model.language_model(
+                inputs=input_ids,
+                inputs_embeds=embeddings.inputs_embeds,
+                per_layer_inputs=embeddings.per_layer_inputs,
+                cache=prompt_cache,
+            )
+            mx.eval([c.state for c in prompt_cache])
+
+            elapsed = (time.perf_counter() - start) * 1000
+            print(
+                f"  [Gemma4] Prefilled prompt prefix: {len(token_ids)} tokens in {elapsed:.0f}ms"
+            )
+            return _PromptPrefixState(token_ids, _snapshot_cache(prompt_cache))
+        except Exception as e:
+            logger.warning(f"Prompt prefix prefill failed (non-fatal): {e}")
+            return None
+
+    def _generate(
+        self,
+        prompt: str,
+        audio_input: np.ndarray,
+        prefix: "_PromptPrefixState | None",
+        max_tokens: int = MAX_TOKENS,
+        on_partial: Callable[[str], None] | None = None,
+    ) -> dict:
+        """Stream tokens for one clip, trimming a loop that ran to the budget.
+
+        A loop is only cut when generation also hit max_tokens while still
+        looping; a repeat the model ends on its own is kept as dictated.
+
+        on_partial, if given, receives the raw text generated so far after
+        each token (no replacements or filtering yet).
+
+        Returns:
+            Dict with 'text', 'ttft' (seconds to first token), 'tokens' and
+            'stop_reason' ("eos", "max_tokens" or "repetition")
+        """
+        from mlx_vlm import stream_generate
+
+        # generate() resets the stop tokens before streaming; do the same
+        tokenizer = getattr(self.processor, "tokenizer", self.processor)
+        tokenizer.stopping_criteria.reset(self.model.config.eos_token_id)
+
+        kwargs = {"prompt_cache_state": prefix} if prefix is not None else {}
+        detector = RepetitionDetector()
+        start = time.perf_counter()
+        ttft = None
+        parts: list[str] = []  # Text segment per token (final flush appended)
+        generated = 0
+        looping = False
+        stop_reason = "eos"
+
+        for chunk in stream_generate(
+            self.model,
+            self.processor,
+            prompt,
+            audio=[audio_input],
+            max_tokens=max_tokens,
+            temperature=0.0,
+            **kwargs,
+        ):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            parts.append(chunk.text)
+
+            # The last chunk repeats the final token count (detokenizer flush)
+            if chunk.generation_tokens > generated:
+                generated = chunk.generation_tokens
+                looping = detector.add(chunk.token, chunk.text)
+
+            if on_partial is not None and chunk.text:
+                on_partial("".join(parts).strip())
+
+        if generated >= max_tokens:
+            if looping:
+                stop_reason = "repetition"
+                parts = parts[: detector.loop_start]
+            else:
+                stop_reason = "max_tokens"
+
+        return {
+            "text": "".join(parts),
+            "ttft": ttft or 0.0,
+            "tokens": generated,
+            "stop_reason": stop_reason,
+        }
+
+    def get_ttft_stats(self) -> dict:
+        """Median time-to-first-token (ms) with and without the prefix cache."""
+        return {
+            mode: {
+                "count": len(values),
+                "median_ms": float(np.median(values)) if values else None,
+            }
+            for mode, values in self.ttft_ms.items()
+        }
 
     def _build_prompt(self, language: str | None = None, max_words: int = 0) -> str:
         """Build transcription prompt with optional language and vocabulary hints."""
@@ -136,25 +448,27 @@ class Gemma4STT:
         audio_data: bytes,
         language: str | None = None,
         max_vocab_words: int = 0,
+        on_partial: Callable[[str], None] | None = None,
     ) -> dict:
         """Transcribe audio data using Gemma 4 E4B locally.
 
         Args:
-            audio_data: Raw audio bytes (WAV format, 16kHz mono 16-bit PCM)
+            audio_data: Raw audio bytes (WAV format, 16kHz mono 16-bit PCM),
+                or a 16kHz int16/float32 sample array
             language: Language code (fr, en, etc.) or None for auto-detect
             max_vocab_words: Max vocabulary words in prompt (0 = no limit)
+            on_partial: Called with the raw text so far as tokens are generated
 
         Returns:
-            Dict with 'text', 'language', 'duration', 'processing_time', 'provider'
+            Dict with 'text', 'language', 'duration', 'processing_time', 'provider',
+            'stop_reason' and 'ttft' (seconds to first generated token)
         """
-        import mlx.core as mx
-        from mlx_vlm import generate
-        from mlx_vlm.prompt_utils import apply_chat_template
+        from audio_utils import SAMPLE_RATE, as_int16_samples
 
         total_start = time.perf_counter()
 
-        # Estimate duration from WAV size
-        estimated_duration = max(0, (len(audio_data) - 44) / (16000 * 2))
+        samples = as_int16_samples(audio_data)
+        estimated_duration = len(samples) / SAMPLE_RATE
 
         # Guard against empty/tiny audio
         min_duration = get_setting("min_recording_duration") or 0.3
@@ -188,14 +502,15 @@ class Gemma4STT:
 
         # Add noise padding to prevent garbled first/last words — Gemma 4
         # needs natural-sounding boundaries, not digital silence or hard cuts
-        from audio_utils import add_noise_padding
-
-        audio_data = add_noise_padding(audio_data, pre_ms=200, post_ms=300)
+        from audio_utils import _rebuild_wav, as_float32_samples, pad_samples_with_noise
 
-        # Write audio to temp file (mlx-vlm takes file paths)
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio_data)
-            wav_path = f.name
+        padded = pad_samples_with_noise(
+            samples,
+            pre_samples=SAMPLE_RATE * 200 // 1000,
+            post_samples=SAMPLE_RATE * 300 // 1000,
+        )
+        # mlx-vlm accepts float32 arrays directly (no temp file or WAV decode)
+        audio_input = as_float32_samples(padded)
 
         # Save debug audio for quality diagnostics
         if get_setting("save_debug_audio"):
@@ -204,35 +519,47 @@ class Gemma4STT:
             debug_dir.mkdir(exist_ok=True)
             ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:18]
             debug_path = debug_dir / f"{ts}_{estimated_duration:.1f}s_gemma4_input.wav"
-            debug_path.write_bytes(audio_data)
-            print(f"  [Gemma4] Debug audio saved: {debug_path.name} ({len(audio_data)} bytes)")
-
-        try:
-            prompt_text = self._build_prompt(language=language, max_words=max_vocab_words)
-            vocab_count = len(self.vocabulary)
-            if vocab_count > 0:
-                used = min(max_vocab_words, vocab_count) if max_vocab_words > 0 else vocab_count
-                print(f"  [Gemma4] Using prompt with {used} vocab words")
-
-            prompt = apply_chat_template(
-                self.processor, self.model.config, prompt_text, num_audios=1,
+            debug_wav = _rebuild_wav(padded)
+            debug_path.write_bytes(debug_wav)
+            print(
+                f"  [Gemma4] Debug audio saved: {debug_path.name} ({len(debug_wav)} bytes)"
             )
 
-            inference_start = time.perf_counter()
-            gen_result = generate(
-                self.model, self.processor, prompt,
-                audio=[wav_path], max_tokens=500, temperature=0.0,
+        prompt, prefix = self._get_prompt(language, max_vocab_words)
+        vocab_count = len(self.vocabulary)
+        if vocab_count > 0:
+            used = (
+                min(max_vocab_words, vocab_count)
+                if max_vocab_words > 0
+                else vocab_count
             )
-            inference_time = (time.perf_counter() - inference_start) * 1000
+            print(f"  [Gemma4] Using prompt with {used} vocab words")
 
-            # Extract text from GenerationResult
-            if hasattr(gen_result, "text"):
-                full_text = gen_result.text.strip()
-            else:
-                full_text = str(gen_result).strip()
+        max_tokens = token_budget(estimated_duration, language)
 
-        finally:
-            Path(wav_path).unlink(missing_ok=True)
+        inference_start = time.perf_counter()
+        generation = self._generate(
+            prompt,
+            audio_input,
+            prefix,
+            max_tokens=max_tokens,
+            on_partial=on_partial,
+        )
+        inference_time = (time.perf_counter() - inference_start) * 1000
+        full_text = generation["text"].strip()
+        ttft = generation["ttft"]
+        stop_reason = generation["stop_reason"]
+        if stop_reason != "eos":
+            print(
+                f"  [Gemma4] Generation stopped early ({stop_reason}) after "
+                f"{generation['tokens']}/{max_tokens} tokens"
+            )
+
+        reused = prefix.reused if prefix is not None else 0
+        self.ttft_ms["cached" if reused else "uncached"].append(ttft * 1000)
+        cache_note = (
+            f"prefix cache: {reused} tokens reused" if reused else "no prefix cache"
+        )
 
         # Strip spurious spaces between non-ASCII characters (Japanese/Chinese
         # never have inter-character spaces; Gemma 4 sometimes inserts them)
@@ -257,14 +584,11 @@ class Gemma4STT:
         total_time = time.perf_counter() - total_start
 
         print(
-            f"  [Timing] inference={inference_time:.0f}ms | "
+            f"  [Timing] ttft={ttft * 1000:.0f}ms ({cache_note}) | "
+            f"inference={inference_time:.0f}ms ({generation['tokens']} tokens, {stop_reason}) | "
             f"total={total_time * 1000:.0f}ms | audio={estimated_duration:.1f}s"
         )
 
-        # Release MLX/Metal memory to prevent accumulation
-        mx.clear_cache()
-        gc.collect()
-
         return {
             "text": full_text,
             "language": language or "unknown",
@@ -272,19 +596,38 @@ class Gemma4STT:
             "duration": estimated_duration,
             "processing_time": total_time,
             "provider": "local",
+            "stop_reason": stop_reason,
+            "ttft": ttft,
         }
 
 
-# Singleton instance
-_gemma4_stt: Gemma4STT | None = None
+# One instance per model tier (each loads its model lazily)
+_gemma4_stts: dict[str, Gemma4STT] = {}
+_vocabulary: list[str] = []
+
+
+def get_gemma4_stt(tier: str = DEFAULT_TIER) -> Gemma4STT:
+    """Get or create the Gemma 4 STT instance for a model tier ("e4b" or "e2b")."""
+    if tier not in _gemma4_stts:
+        stt = Gemma4STT(MODELS[tier])
+        stt.set_vocabulary(_vocabulary)
+        _gemma4_stts[tier] = stt
+    return _gemma4_stts[tier]
+
+
+def reset_gemma4_stt() -> None:
+    """Drop every tier's instance and the shared vocabulary (fresh state for tests)."""
+    global _vocabulary
+    _gemma4_stts.clear()
+    _vocabulary = []
 
 
-def get_gemma4_stt() -> Gemma4STT:
-    """Get or create the Gemma 4 STT singleton."""
-    global _gemma4_stt
-    if _gemma4_stt is None:
-        _gemma4_stt = Gemma4STT()
-    return _gemma4_stt
+def set_gemma4_vocabulary(words: list[str]) -> None:
+    """Set vocabulary on every tier (including tiers created later)."""
+    global _vocabulary
+    _vocabulary = list(words)
+    for stt in _gemma4_stts.values():
+        stt.set_vocabulary(_vocabulary)
 
 
 def is_gemma4_available() -> bool:
@@ -9,22 +9,36 @@ Models available:
 - distil-whisper-large-v3-en: Fastest, English-only (~13% WER), $0.02/hr
 """
 
+import asyncio
+import io
 import os
-import tempfile
 import time
-from pathlib import Path
+from typing import ClassVar
 
-from groq import Groq
+from groq import AsyncGroq, Groq
 
 import replacements
 import vocabulary
+from async_http import get_async_http_client
 from content_filter import get_filter
+from rate_limit import get_rate_limiter
 from settings import get_setting
 
+# Fail fast instead of waiting out the SDK default (10 minutes, 2 retries)
+# so the router can fail over to the next provider
+REQUEST_TIMEOUT = 30.0  # seconds
+REQUEST_RETRIES = 1
+
 
 class GroqSTT:
     """Groq Whisper API client."""
 
+    # Accepted audio inputs; WAV bytes are uploaded as an in-memory file
+    CAPABILITIES: ClassVar[dict] = {
+        "input_forms": ("wav_bytes",),
+        "backend_input": "in_memory_file",
+    }
+
     def __init__(self):
         """Initialize the Groq client."""
         api_key = os.environ.get("GROQ_API_KEY")
@@ -33,7 +47,13 @@ class GroqSTT:
                 "GROQ_API_KEY environment variable not set. "
                 "Get your API key from https://console.groq.com"
             )
-        self.client = Groq(api_key=api_key)
+        self.api_key = api_key
+        self.client = Groq(
+            api_key=api_key, timeout=REQUEST_TIMEOUT, max_retries=REQUEST_RETRIES
+        )
+        # Created on first async use, on the shared connection pool
+        self._aclient: AsyncGroq | None = None
+        self._aclient_http = None
         # Default to turbo model (good balance of speed/accuracy/cost)
         self.model = "whisper-large-v3-turbo"
 
@@ -82,6 +102,112 @@ class GroqSTT:
 
         return f"{prefix}{', '.join(words)}{suffix}"
 
+    def _async_client(self) -> AsyncGroq:
+        """Async client on the shared connection pool (rebuilt if the pool is)."""
+        http_client = get_async_http_client()
+        if self._aclient is None or self._aclient_http is not http_client:
+            self._aclient = AsyncGroq(
+                api_key=self.api_key,
+                timeout=REQUEST_TIMEOUT,
+                max_retries=REQUEST_RETRIES,
+                http_client=http_client,
+            )
+            self._aclient_http = http_client
+        return self._aclient
+
+    async def prewarm(self) -> None:
+        """Open (or refresh) a pooled connection to the API host.
+
+        Any HTTP response will do; the point is the TCP + TLS handshake, so
+        the next request reuses a warm keep-alive connection.
+        """
+        client = self._async_client()
+        await get_async_http_client().head(str(client.base_url))
+
+    def _api_params(
+        self, audio_data: bytes, language: str | None, max_vocab_words: int
+    ) -> dict:
+        """Request parameters, with the audio wrapped as an in-memory file."""
+        lang_mode = language.upper() if language else "AUTO-DETECT"
+        print(f"  [Groq] transcribe() called with language={lang_mode}")
+
+        # --- Wrap audio in an in-memory file (no temp file round trip) ---
+        audio_file = ("audio.wav", io.BytesIO(audio_data), "audio/wav")
+
+        prompt = self._build_prompt(max_words=max_vocab_words)
+        if prompt:
+            vocab_in_prompt = prompt.count(",") + 1 if "," in prompt else 1
+            total_vocab = len(self.vocabulary)
+            if vocab_in_prompt < total_vocab:
+                print(
+                    f"  [Groq] Using {vocab_in_prompt}/{total_vocab} vocab words (truncated to fit 896 char limit)"
+                )
+            else:
+                print(f"  [Groq] Using prompt with {vocab_in_prompt} vocab words")
+
+        # Build API call parameters
+        api_params = {
+            "model": self.model,
+            "file": audio_file,
+            "response_format": "verbose_json",
+        }
+
+        if language:
+            api_params["language"] = language
+        if prompt:
+            api_params["prompt"] = prompt
+        return api_params
+
+    def _build_result(
+        self,
+        response,
+        audio_data: bytes,
+        language: str | None,
+        total_start: float,
+        inference_time: float,
+    ) -> dict:
+        """Post-process the API response into the result dict."""
+        full_text = response.text.strip() if response.text else ""
+
+        # Track vocabulary usage (pure match detection, no rewrite)
+        matched = vocabulary.find_matches(full_text, self.vocabulary)
+        if matched:
+            vocabulary.get_manager().record_usage(matched)
+
+        # Apply word replacements (if enabled)
+        if get_setting("replacements_enabled"):
+            full_text = replacements.get_manager().apply_replacements(full_text)
+
+        # Filter profanity (if enabled)
+        if get_setting("content_filter"):
+            full_text = get_filter().filter(full_text)
+
+        # Get duration from response
+        duration = getattr(response, "duration", 0) or 0
+
+        if duration == 0:
+            # Fallback: estimate from WAV size
+            duration = max(0, (len(audio_data) - 44) / (16000 * 2))
+
+        # Get detected language
+        detected_language = getattr(response, "language", language or "unknown")
+
+        total_time = time.time() - total_start
+
+        print(
+            f"  [Timing] API={inference_time:.0f}ms | "
+            f"total={total_time * 1000:.0f}ms | audio={duration:.1f}s"
+        )
+
+        return {
+            "text": full_text,
+            "language": detected_language,
+            "language_probability": 1.0,
+            "duration": duration,
+            "processing_time": total_time,
+            "provider": "groq",
+        }
+
     def transcribe(
         self,
         audio_data: bytes,
@@ -99,95 +225,45 @@ class GroqSTT:
             Dict with 'text', 'language', 'duration', 'processing_time'
         """
         total_start = time.time()
+        api_params = self._api_params(audio_data, language, max_vocab_words)
 
-        lang_mode = language.upper() if language else "AUTO-DETECT"
-        print(f"  [Groq] transcribe() called with language={lang_mode}")
+        inference_start = time.time()
+        # Raw response for the x-ratelimit-* headers
+        raw = self.client.audio.transcriptions.with_raw_response.create(**api_params)
+        get_rate_limiter("groq").observe_headers(raw.headers)
+        response = raw.parse()
+        inference_time = (time.time() - inference_start) * 1000
 
-        # --- Write audio to temp file ---
-        prep_start = time.time()
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio_data)
-            temp_path = f.name
-        prep_time = (time.time() - prep_start) * 1000
-
-        try:
-            # --- API call ---
-            inference_start = time.time()
-
-            prompt = self._build_prompt(max_words=max_vocab_words)
-            if prompt:
-                vocab_in_prompt = prompt.count(",") + 1 if "," in prompt else 1
-                total_vocab = len(self.vocabulary)
-                if vocab_in_prompt < total_vocab:
-                    print(
-                        f"  [Groq] Using {vocab_in_prompt}/{total_vocab} vocab words (truncated to fit 896 char limit)"
-                    )
-                else:
-                    print(f"  [Groq] Using prompt with {vocab_in_prompt} vocab words")
-
-            # Open file for API call
-            with open(temp_path, "rb") as audio_file:
-                # Build API call parameters
-                api_params = {
-                    "model": self.model,
-                    "file": audio_file,
-                    "response_format": "verbose_json",
-                }
-
-                if language:
-                    api_params["language"] = language
-                if prompt:
-                    api_params["prompt"] = prompt
-
-                # Make API call
-                response = self.client.audio.transcriptions.create(**api_params)
-
-            inference_time = (time.time() - inference_start) * 1000
-
-            full_text = response.text.strip() if response.text else ""
-
-            # Track vocabulary usage (pure match detection, no rewrite)
-            matched = vocabulary.find_matches(full_text, self.vocabulary)
-            if matched:
-                vocabulary.get_manager().record_usage(matched)
-
-            # Apply word replacements (if enabled)
-            if get_setting("replacements_enabled"):
-                full_text = replacements.get_manager().apply_replacements(full_text)
-
-            # Filter profanity (if enabled)
-            if get_setting("content_filter"):
-                full_text = get_filter().filter(full_text)
-
-            # Get duration from response
-            duration = getattr(response, "duration", 0) or 0
-
-            if duration == 0:
-                # Fallback: estimate from WAV size
-                duration = max(0, (len(audio_data) - 44) / (16000 * 2))
-
-            # Get detected language
-            detected_language = getattr(response, "language", language or "unknown")
-
-            total_time = time.time() - total_start
-
-            print(
-                f"  [Timing] prep={prep_time:.0f}ms | API={inference_time:.0f}ms | "
-                f"total={total_time * 1000:.0f}ms | audio={duration:.1f}s"
-            )
+        return self._build_result(
+            response, audio_data, language, total_start, inference_time
+        )
 
-            return {
-                "text": full_text,
-                "language": detected_language,
-                "language_probability": 1.0,
-                "duration": duration,
-                "processing_time": total_time,
-                "provider": "groq",
-            }
-
-        finally:
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
+    async def transcribe_async(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Async transcribe(): awaited on the event loop via the shared pool."""
+        total_start = time.time()
+        api_params = self._api_params(audio_data, language, max_vocab_words)
+
+        inference_start = time.time()
+        client = self._async_client()
+        raw = await client.audio.transcriptions.with_raw_response.create(**api_params)
+        get_rate_limiter("groq").observe_headers(raw.headers)
+        response = await raw.parse()
+        inference_time = (time.time() - inference_start) * 1000
+
+        # Vocabulary matching, replacements and filtering can take a while
+        return await asyncio.to_thread(
+            self._build_result,
+            response,
+            audio_data,
+            language,
+            total_start,
+            inference_time,
+        )
 
 
 # Singleton instance
@@ -0,0 +1,219 @@
+"""Hedged cloud requests: race a second provider when the first is slow.
+
+If the primary provider has not answered within its observed p90 latency for
+a clip of that length (p90 seconds per audio second x clip duration), the
+same audio is sent to a secondary provider and whichever answer arrives
+first wins. A per-request cost cap keeps hedging cheap: the secondary is only
+used when its estimated price for the clip fits under the cap.
+
+transcribe_hedged_async() races the providers' async clients and cancels the
+losing request. The synchronous transcribe_hedged() cannot abort a request
+mid-flight; the loser is abandoned (left to finish on its own thread, its
+result discarded, its latency still recorded for the p90 estimate).
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+# Approximate list prices (USD per audio minute) for the default models
+COST_PER_MINUTE_USD = {
+    "groq": 0.04 / 60,  # whisper-large-v3-turbo, $0.04/hour
+    "openai": 0.006,  # whisper-1
+    "gemini": 0.0006,  # flash-lite audio input (~32 tokens/s) + short output
+}
+
+# Hedge delay used until a provider has enough latency samples
+DEFAULT_HEDGE_DELAY = 3.0
+MIN_SAMPLES_FOR_P90 = 5
+# Floor for the scaled delay: very short clips are dominated by the round trip
+MIN_HEDGE_DELAY = 0.5
+
+
+def estimated_cost_cents(provider: str, audio_duration: float) -> float:
+    """Estimated price of transcribing the clip on a provider, in US cents."""
+    return COST_PER_MINUTE_USD.get(provider, 0.0) * audio_duration / 60 * 100
+
+
+class HedgeStats:
+    """Counters for hedged requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.secondary_wins = 0
+        self.skipped_cost = 0
+
+    def count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "secondary_wins": self.secondary_wins,
+            "primary_wins_after_hedge": self.hedges - self.secondary_wins,
+            "skipped_cost": self.skipped_cost,
+        }
+
+
+def _start(call: Callable[[], dict]) -> Future:
+    """Run `call` on its own daemon thread.
+
+    Not a shared pool: an abandoned loser holds its thread until the request
+    times out, and new primaries must never queue behind it.
+    """
+    future: Future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(call())
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="hedge", daemon=True).start()
+    return future
+
+
+def _hedge_won(
+    result: dict,
+    winner: str,
+    secondary_name: str,
+    secondary_won: bool,
+    hedge_start: float,
+    stats: HedgeStats,
+) -> dict:
+    """Count and log the winner of a hedged race; mark its result."""
+    if secondary_won:
+        stats.count("secondary_wins")
+    print(
+        f"  [Hedge] {winner} won "
+        f"({(time.perf_counter() - hedge_start) * 1000:.0f}ms after hedging)"
+    )
+    result["hedged"] = True
+    result["hedge_provider"] = secondary_name
+    return result
+
+
+def transcribe_hedged(
+    primary: tuple[str, Callable[[], dict]],
+    secondary: tuple[str, Callable[[], dict]],
+    delay: float,
+    stats: HedgeStats,
+) -> dict:
+    """Run primary; start secondary after `delay` (or on primary failure).
+
+    Args:
+        primary: (provider name, zero-arg call returning a result dict)
+        secondary: Same, for the hedge provider
+        delay: Seconds to wait for the primary before hedging
+        stats: Counters to update
+
+    Returns:
+        The first successful result, with 'hedged' and 'hedge_provider' set
+        when the secondary was started. Raises the primary's error if both fail.
+    """
+    primary_name, primary_call = primary
+    secondary_name, secondary_call = secondary
+    stats.count("requests")
+
+    primary_future = _start(primary_call)
+    done, _ = wait([primary_future], timeout=delay)
+    if done and primary_future.exception() is None:
+        return primary_future.result()
+
+    reason = "failed" if done else f"no answer after {delay:.1f}s"
+    print(f"  [Hedge] {primary_name} {reason}, also sending to {secondary_name}")
+    stats.count("hedges")
+    hedge_start = time.perf_counter()
+    secondary_future = _start(secondary_call)
+    names: dict[Future, str] = {
+        primary_future: primary_name,
+        secondary_future: secondary_name,
+    }
+
+    pending = set(names)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                continue
+            return _hedge_won(
+                future.result(),
+                names[future],
+                secondary_name,
+                future is secondary_future,
+                hedge_start,
+                stats,
+            )
+
+    raise primary_future.exception()
+
+
+async def transcribe_hedged_async(
+    primary: tuple[str, Callable[[], Awaitable[dict]]],
+    secondary: tuple[str, Callable[[], Awaitable[dict]]],
+    delay: float,
+    stats: HedgeStats,
+) -> dict:
+    """Async transcribe_hedged(): the calls return coroutines.
+
+    The losing request is cancelled as soon as the other one succeeds, and
+    both are cancelled if the caller is.
+    """
+    primary_name, primary_call = primary
+    secondary_name, secondary_call = secondary
+    stats.count("requests")
+
+    primary_task = asyncio.ensure_future(primary_call())
+    names: dict[asyncio.Future, str] = {primary_task: primary_name}
+    try:
+        done, _ = await asyncio.wait([primary_task], timeout=delay)
+        if done and primary_task.exception() is None:
+            return primary_task.result()
+
+        reason = "failed" if done else f"no answer after {delay:.1f}s"
+        print(f"  [Hedge] {primary_name} {reason}, also sending to {secondary_name}")
+        stats.count("hedges")
+        hedge_start = time.perf_counter()
+        secondary_task = asyncio.ensure_future(secondary_call())
+        names[secondary_task] = secondary_name
+
+        pending = set(names)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    continue
+                return _hedge_won(
+                    task.result(),
+                    names[task],
+                    secondary_name,
+                    task is secondary_task,
+                    hedge_start,
+                    stats,
+                )
+
+        raise primary_task.exception()
+    finally:
+        for task in names:
+            task.cancel()
+
+
+# Singleton instance
+_stats: HedgeStats | None = None
+
+
+def get_hedge_stats() -> HedgeStats:
+    """Get or create the hedge counters singleton."""
+    global _stats
+    if _stats is None:
+        _stats = HedgeStats()
+    return _stats
@@ -11,7 +11,9 @@ Usage:
 
 import gc
 import io
+import json
 import os
+import queue
 import resource
 import subprocess
 import sys
@@ -141,6 +143,8 @@ class RecordingIndicator:
 SERVER_URL = "http://127.0.0.1:8000"
 SAMPLE_RATE = 16000
 CHANNELS = 1
+# Run GC after a transcription only once the client grows past this
+MEMORY_HIGH_WATER_MB = 300
 
 # Modifier keys that should be silently ignored (not cancel recording).
 # Covers right-side keys and Option/Alt keys which are never used as triggers.
@@ -174,6 +178,12 @@ class HotkeyClient:
         self.native_sample_rate: int = SAMPLE_RATE
         self.lock = threading.Lock()
 
+        # Capture-time resampling: audio_callback feeds native-rate chunks to a
+        # worker that resamples them to 16kHz while the user is still speaking
+        self._resample_queue: Optional[queue.Queue] = None
+        self._resample_thread: Optional[threading.Thread] = None
+        self._resampled: list[np.ndarray] = []
+
         # Settings from server
         self.keybinding = "ctrl"  # Will be fetched from server
         self.language_display = "AUTO"
@@ -183,6 +193,11 @@ class HotkeyClient:
         self.max_recording_duration = 240  # Will be fetched from server (4 min default)
         self.save_debug_audio = False  # Debug mode: saves audio files + logs key events
 
+        # Forces a full GC only past a high-water mark, not after every request
+        from memory_policy import MemoryPolicy
+
+        self.memory_policy = MemoryPolicy(rss_high_mb=MEMORY_HIGH_WATER_MB, label="Mem")
+
         # Persistent HTTP client for server communication (reused across calls)
         self._http_client: Optional[httpx.Client] = None
 
@@ -655,7 +670,57 @@ class HotkeyClient:
         if status:
             print(f"Audio status: {status}")
         if self.is_recording:
-            self.audio_data.append(indata.copy())
+            chunk = indata.copy()
+            self.audio_data.append(chunk)
+            if self._resample_queue is not None:
+                self._resample_queue.put(chunk)
+
+    def _resample_worker(self, resampler, chunks: queue.Queue, output: list):
+        """Resample captured chunks incrementally until a None sentinel arrives."""
+        parts = []
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    parts.append(resampler.flush())
+                    break
+                parts.append(resampler.process(chunk))
+            output.append(np.concatenate(parts))
+        except Exception as e:
+            print(f"⚠️  Streaming resample failed: {e}")
+
+    def _start_streaming_resample(self, native_rate: int):
+        """Start the capture-time resample worker (no-op at 16kHz)."""
+        if native_rate == SAMPLE_RATE:
+            return
+        from audio_utils import StreamingResampler
+
+        self._resampled = []
+        self._resample_queue = queue.Queue()
+        self._resample_thread = threading.Thread(
+            target=self._resample_worker,
+            args=(
+                StreamingResampler(native_rate),
+                self._resample_queue,
+                self._resampled,
+            ),
+            daemon=True,
+        )
+        self._resample_thread.start()
+
+    def _finish_streaming_resample(self) -> Optional[np.ndarray]:
+        """Stop the resample worker and return its 16kHz audio (None if unavailable)."""
+        chunks, thread = self._resample_queue, self._resample_thread
+        self._resample_queue = None
+        self._resample_thread = None
+        if thread is None:
+            return None
+
+        chunks.put(None)
+        thread.join(timeout=5.0)
+        if thread.is_alive() or not self._resampled:
+            return None
+        return self._resampled.pop()
 
     def start_recording(self):
         """Start recording audio."""
@@ -725,6 +790,7 @@ class HotkeyClient:
                 return
 
             # Only set recording state after stream is successfully opened
+            self._start_streaming_resample(native_rate)
             self.is_recording = True
             self.recording_start_time = time.time()
             self.stream = stream
@@ -767,6 +833,7 @@ class HotkeyClient:
             # Skip if recording was too short (accidental tap)
             if recording_duration < self.min_recording_duration:
                 print(f"⏭️  Recording too short ({recording_duration:.2f}s), skipping")
+                self._finish_streaming_resample()
                 self.indicator.hide()
                 self.send_status(recording=False, cancelled=True)
                 return
@@ -811,6 +878,7 @@ class HotkeyClient:
                 self.stream = None
 
             # Discard audio data
+            self._finish_streaming_resample()
             self.audio_data = []
 
         self.indicator.hide()
@@ -836,6 +904,39 @@ class HotkeyClient:
                 break
             time.sleep(0.5)  # Check every 500ms
 
+    def _request_transcription(self, client: httpx.Client, wav_buffer) -> dict:
+        """POST audio with streaming enabled and return the final result.
+
+        The server sends newline-delimited JSON: partial text while a local
+        model generates (shown on one live line), then the final result.
+        """
+        result: dict = {}
+        shown_partial = False
+        with client.stream(
+            "POST",
+            "/api/transcribe",
+            params={"stream": "true"},
+            files={"file": ("audio.wav", wav_buffer, "audio/wav")},
+            timeout=60.0,  # Long timeout for actual transcription
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if message.get("type") == "partial":
+                    preview = message.get("text", "")[-70:]
+                    print(f"\r\033[K   … {preview}", end="", flush=True)
+                    shown_partial = True
+                elif message.get("type") == "error":
+                    raise RuntimeError(message.get("error", "transcription failed"))
+                else:
+                    result = message
+
+        if shown_partial:
+            print("\r\033[K", end="", flush=True)
+        return result
+
     def _process_audio(self):
         """Convert audio and send to server."""
         try:
@@ -862,15 +963,24 @@ class HotkeyClient:
                 f"loss={loss:.3f}s ({loss_pct:.1f}%)"
             )
 
-            # Resample from native rate to 16kHz with proper anti-aliasing
+            # Resample from native rate to 16kHz with proper anti-aliasing.
+            # Most of the work was done during capture; only the tail remains.
             if native_rate != SAMPLE_RATE:
-                from audio_utils import resample_to_16k
-
                 pre_len = len(audio)
-                audio = resample_to_16k(audio, native_rate)
+                resample_start = time.time()
+                streamed = self._finish_streaming_resample()
+                if streamed is not None:
+                    audio = streamed
+                    mode = "streamed"
+                else:
+                    from audio_utils import resample_to_16k
+
+                    audio = resample_to_16k(audio, native_rate)
+                    mode = "one-shot"
                 print(
-                    f"  [Resample] {native_rate}Hz -> {SAMPLE_RATE}Hz | "
-                    f"{pre_len} -> {len(audio)} samples"
+                    f"  [Resample] {native_rate}Hz -> {SAMPLE_RATE}Hz ({mode}) | "
+                    f"{pre_len} -> {len(audio)} samples | "
+                    f"{(time.time() - resample_start) * 1000:.0f}ms after stop"
                 )
 
             # Convert to WAV bytes (always 16kHz)
@@ -891,13 +1001,7 @@ class HotkeyClient:
             # The 60s timeout is for the transcription itself; network issues should fail faster
             client = self.get_http_client()
             try:
-                response = client.post(
-                    "/api/transcribe",
-                    files={"file": ("audio.wav", wav_buffer, "audio/wav")},
-                    timeout=60.0,  # Long timeout for actual transcription
-                )
-                response.raise_for_status()
-                result = response.json()
+                result = self._request_transcription(client, wav_buffer)
                 # Transcription succeeded - update health state
                 self._server_healthy = True
             except httpx.TimeoutException:
@@ -938,8 +1042,9 @@ class HotkeyClient:
         finally:
             self.indicator.hide()  # Hide processing indicator
             self.is_processing = False
+            self._finish_streaming_resample()  # No-op unless exited early
             self.audio_data = []  # Clear audio buffer to free memory
-            gc.collect()  # Force cleanup
+            self.memory_policy.after_request()  # GC only past the high-water mark
             log_memory("After transcription")
             print()  # Blank line for readability
 
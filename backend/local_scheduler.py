@@ -0,0 +1,236 @@
+"""Micro-batching scheduler for the local (MLX) engines.
+
+All local inference runs on one worker thread, since MLX/Metal is not
+thread-safe. Requests that queue up while the worker is busy (or arrive
+within the collection window) are grouped: requests with the same language
+and vocabulary limit whose audio fits the padded length go to the engine as
+one batch, and the results are split back out to each caller. Only Whisper
+decodes a batch in one call; mlx-vlm cannot batch audio prompts, so Gemma 4
+runs a batch's requests back to back (no throughput gain, just no idle gap).
+
+Prewarm tasks (model load, prompt prefill) run on the same worker thread,
+ahead of queued requests; a queued prewarm also restarts the idle timer, so
+memory isn't released while the user is still speaking.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class LocalRequest:
+    """One queued local transcription."""
+
+    audio_data: bytes | np.ndarray
+    language: str | None
+    max_vocab_words: int
+    duration: float
+    on_partial: Callable[[str], None] | None = None
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def batch_key(self) -> tuple:
+        """Requests can share a batch only if they decode with the same options."""
+        return (self.language, self.max_vocab_words)
+
+
+# Runs a batch; returns one result dict (or exception) per request, in order
+BatchRunner = Callable[[list[LocalRequest]], list]
+
+
+class LocalBatchScheduler:
+    """Collects local requests into micro-batches run on a single worker thread."""
+
+    def __init__(
+        self,
+        run_batch: BatchRunner,
+        window: float = 0.0,
+        max_batch_size: int = 4,
+        max_padded_seconds: float = 30.0,
+        on_idle: Callable[[], None] | None = None,
+        idle_seconds: float = 0.0,
+    ):
+        """
+        Args:
+            run_batch: Called on the worker thread with each batch
+            window: Seconds to wait for more requests before running a batch
+                (0 = batch only what is already queued)
+            max_batch_size: Max requests per batch
+            max_padded_seconds: Clips longer than this always run alone
+            on_idle: Called on the worker thread once the queue has been
+                empty for idle_seconds (e.g. to release MLX memory safely)
+            idle_seconds: Idle period before on_idle (0 = never)
+        """
+        self._run_batch = run_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.max_padded_seconds = max_padded_seconds
+        self.on_idle = on_idle
+        self.idle_seconds = idle_seconds
+        self._queue: deque[LocalRequest] = deque()
+        self._tasks: deque[Callable[[], None]] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._idle_fired = False
+
+        # Stats
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+        self.prewarms = 0
+
+    def submit(
+        self,
+        audio_data: bytes | np.ndarray,
+        language: str | None,
+        max_vocab_words: int,
+        duration: float,
+        on_partial: Callable[[str], None] | None = None,
+    ) -> dict:
+        """Queue a request and block until its result is ready."""
+        request = LocalRequest(
+            audio_data, language, max_vocab_words, duration, on_partial
+        )
+        with self._cond:
+            self._queue.append(request)
+            self._ensure_worker()
+            self._cond.notify()
+        return request.future.result()
+
+    def prewarm(self, task: Callable[[], None]) -> None:
+        """Run task on the worker thread before the next batch (non-blocking)."""
+        with self._cond:
+            self._tasks.append(task)
+            self._ensure_worker()
+            self._cond.notify()
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use (caller holds the lock)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._worker, name="local-batch", daemon=True
+            )
+            self._thread.start()
+
+    def _fits(self, request: LocalRequest, first: LocalRequest) -> bool:
+        return (
+            request.batch_key == first.batch_key
+            and request.duration <= self.max_padded_seconds
+        )
+
+    def _take_batch(self) -> list[LocalRequest] | None:
+        """Wait for work, then pop the oldest request plus compatible ones.
+
+        Returns None when the idle period elapses first (once per idle spell),
+        or an empty batch when a prewarm task is waiting.
+        """
+        with self._cond:
+            while not self._queue:
+                if self._tasks:
+                    self._idle_fired = False
+                    return []
+                if not self._idle_fired and self.on_idle and self.idle_seconds > 0:
+                    if not self._cond.wait(self.idle_seconds) and not self._queue:
+                        self._idle_fired = True
+                        return None
+                else:
+                    self._cond.wait()
+            self._idle_fired = False
+
+            deadline = time.perf_counter() + self.window
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            first = self._queue.popleft()
+            batch = [first]
+            if first.duration <= self.max_padded_seconds:
+                for request in list(self._queue):
+                    if len(batch) >= self.max_batch_size:
+                        break
+                    if self._fits(request, first):
+                        batch.append(request)
+                        self._queue.remove(request)
+            return batch
+
+    def _run_tasks(self) -> None:
+        while True:
+            with self._cond:
+                if not self._tasks:
+                    return
+                task = self._tasks.popleft()
+            self.prewarms += 1
+            try:
+                task()
+            except Exception as e:
+                print(f"  [Batch] Prewarm failed: {e}")
+
+    def _worker(self) -> None:
+        while True:
+            self._run_tasks()
+            batch = self._take_batch()
+            if batch is None:
+                try:
+                    self.on_idle()
+                except Exception as e:
+                    print(f"  [Batch] Idle callback failed: {e}")
+                continue
+            if not batch:
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            if len(batch) > 1:
+                wait_ms = (time.perf_counter() - batch[0].queued_at) * 1000
+                print(
+                    f"  [Batch] Running {len(batch)} local requests together "
+                    f"(oldest waited {wait_ms:.0f}ms)"
+                )
+
+            try:
+                results = self._run_batch(batch)
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch runner returned {len(results)} results "
+                        f"for {len(batch)} requests"
+                    )
+            except Exception as e:
+                results = [e] * len(batch)
+            self._resolve(batch, results)
+
+    @staticmethod
+    def _resolve(batch: list[LocalRequest], results: list) -> None:
+        """Hand each caller its result; never let the worker thread die."""
+        try:
+            for request, result in zip(batch, results, strict=True):
+                if isinstance(result, BaseException):
+                    request.future.set_exception(result)
+                else:
+                    request.future.set_result(result)
+        except Exception as e:
+            print(f"  [Batch] Failed to deliver results: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def stats(self) -> dict:
+        """Batch counters for logging / the stats endpoint."""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": round(self.requests / self.batches, 2)
+            if self.batches
+            else 0,
+            "largest_batch": self.largest_batch,
+            "queued": len(self._queue),
+            "prewarms": self.prewarms,
+        }
@@ -1,6 +1,7 @@
 """FastAPI server for local speech-to-text."""
 
 import asyncio
+import json
 import logging
 import os
 import threading
@@ -17,7 +18,7 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -25,11 +26,25 @@ import history
 import replacements
 import settings
 import vocabulary
-from stt_engine import get_engine, transcribe_audio_with_provider
+from stt_engine import (
+    breaker_states,
+    get_engine,
+    get_local_scheduler,
+    rate_limit_states,
+    transcribe_audio_async,
+)
 from openai_stt import get_openai_stt, is_openai_available
 from groq_stt import get_groq_stt, is_groq_available
 from gemini_stt import get_gemini_stt, is_gemini_available
-from gemma4_stt import get_gemma4_stt, is_gemma4_available
+from gemma4_stt import get_gemma4_stt, is_gemma4_available, set_gemma4_vocabulary
+from simulated_stt import get_simulated_stt
+from async_http import close_async_http_client
+from auto_router import get_auto_router
+from hedging import get_hedge_stats
+from memory_policy import get_memory_policy
+from prewarm import get_prewarmer
+from provider_stats import get_latency_stats
+from result_cache import get_result_cache
 
 
 # Filter out noisy polling requests from access logs
@@ -119,9 +134,10 @@ async def lifespan(app: FastAPI):
                 get_gemini_stt().set_vocabulary(words)
             except Exception:
                 pass  # Gemini not initialized yet, that's ok
+        get_simulated_stt().set_vocabulary(words)
         if is_gemma4_available():
             try:
-                get_gemma4_stt().set_vocabulary(words)
+                set_gemma4_vocabulary(words)
             except Exception:
                 pass  # Gemma4 not initialized yet, that's ok
 
@@ -162,11 +178,14 @@ async def lifespan(app: FastAPI):
     else:
         print("⚠ Gemini API key not set (GEMINI_API_KEY)", flush=True)
 
+    # Simulated provider (no key or hardware needed; for load testing)
+    get_simulated_stt().set_vocabulary(vocab_manager.words)
+
     # Initialize Gemma 4 as the primary local STT provider
     if is_gemma4_available():
         try:
-            gemma4_stt = get_gemma4_stt()
-            gemma4_stt.set_vocabulary(vocab_manager.words)
+            get_gemma4_stt()
+            set_gemma4_vocabulary(vocab_manager.words)
             print("✓ Local STT: Gemma 4 E4B (MLX)", flush=True)
         except Exception as e:
             print(f"⚠ Gemma 4 not available, falling back to lightning-whisper-mlx: {e}", flush=True)
@@ -203,12 +222,11 @@ async def lifespan(app: FastAPI):
     _memory_monitor_stop.set()
     vocab_manager.stop_watcher()
     replacement_manager.stop_watcher()
+    await close_async_http_client()
 
 
 app = FastAPI(title="Local STT", lifespan=lifespan)
 
-# Lock to serialize transcription requests (MLX/Metal is not thread-safe)
-_transcription_lock = asyncio.Lock()
 # Connected WebSocket clients for broadcasting results
 _ws_clients: set[WebSocket] = set()
 
@@ -229,19 +247,59 @@ async def health_check():
 
     Returns provider availability status for proactive error detection.
     Used by hotkey_client to detect network/API issues before transcription.
+    A cloud provider is available when its key is set and its circuit is not
+    open; "breakers" has the full circuit breaker state per provider.
     """
+    breakers = breaker_states()
     return {
         "status": "ok",
         "providers": {
             "local": True,  # Gemma 4 primary, lightning-whisper-mlx fallback
-            "openai": is_openai_available(),
-            "groq": is_groq_available(),
-            "gemini": is_gemini_available(),
+            "openai": is_openai_available() and breakers["openai"]["state"] != "open",
+            "groq": is_groq_available() and breakers["groq"]["state"] != "open",
+            "gemini": is_gemini_available() and breakers["gemini"]["state"] != "open",
+            "auto": True,  # Always resolves to some available provider
+            "simulated": True,  # Offline stand-in, always available
         },
+        "breakers": breakers,
         "current_provider": settings.get_stt_provider(),
     }
 
 
+@app.get("/api/cache")
+async def cache_stats():
+    """Result cache statistics (hits, misses, coalesced requests, memory use)."""
+    return get_result_cache().stats()
+
+
+@app.delete("/api/cache")
+async def clear_cache():
+    """Drop all cached transcription results."""
+    cache = get_result_cache()
+    cache.clear()
+    return cache.stats()
+
+
+@app.get("/api/providers/estimates")
+async def provider_estimates():
+    """Live per-provider latency/error estimates used by the auto provider."""
+    return get_auto_router().estimates()
+
+
+@app.get("/api/stats")
+async def latency_stats():
+    """Rolling latency statistics per provider / local model tier."""
+    return {
+        **get_latency_stats().summary(),
+        "local_batching": get_local_scheduler().stats(),
+        "memory": get_memory_policy().stats(),
+        "hedging": get_hedge_stats().summary(),
+        "prewarm": get_prewarmer().stats(),
+        "rate_limits": rate_limit_states(),
+        "simulated": get_simulated_stt().stats(),
+    }
+
+
 # =============================================================================
 # Settings API
 # =============================================================================
@@ -311,9 +369,26 @@ class StatusUpdate(BaseModel):
     cancelled: bool = False  # True when recording was too short
 
 
+# Background tasks (kept referenced so they aren't garbage-collected mid-run)
+_background_tasks: set[asyncio.Task] = set()
+
+
 @app.post("/api/status")
 async def update_status(status: StatusUpdate):
-    """Broadcast recording status to connected web UI clients."""
+    """Broadcast recording status to connected web UI clients.
+
+    Recording start is also a hint to warm up the provider (connection,
+    local model, prompt) while the user is still speaking.
+    """
+    if status.recording and settings.get_setting("prewarm_on_record"):
+        task = asyncio.create_task(
+            get_prewarmer().prewarm(
+                settings.get_stt_provider(), settings.get_language()
+            )
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     message = {
         "type": "status",
         "recording": status.recording,
@@ -359,32 +434,54 @@ async def broadcast_log(log: LogMessage):
 # =============================================================================
 
 
-@app.post("/api/transcribe")
-async def transcribe_audio(file: UploadFile = File(...)):
-    """HTTP endpoint for audio transcription (used by global hotkey client).
+async def _broadcast(message: dict) -> None:
+    """Send a message to all connected web UI clients."""
+    for ws in list(_ws_clients):
+        try:
+            await ws.send_json(message)
+        except Exception:
+            _ws_clients.discard(ws)
 
-    Uses the server's language and provider settings.
-    """
-    audio_data = await file.read()
 
-    lang = settings.get_language()
-    response = settings.get_settings_response()
-    lang_display = response["language_display"]
-    provider = settings.get_stt_provider()
-    provider_display = response.get("stt_provider_display", provider)
+async def _run_transcription(audio_data: bytes, lang: str | None, on_partial) -> dict:
+    """Transcribe on the event loop, relaying partial text as it is generated.
 
-    print(
-        f"→ [HTTP] Transcribing with provider={provider_display}, language={lang_display}...",
-        flush=True,
-    )
+    Args:
+        audio_data: WAV bytes from the client
+        lang: Language code or None for auto-detect
+        on_partial: Async callback receiving each partial message dict
 
-    # Serialize access to MLX/Metal (not thread-safe for local, but harmless for OpenAI)
-    async with _transcription_lock:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: transcribe_audio_with_provider(audio_data, language=lang),
+    Returns:
+        Final result dict (post-processing applied)
+    """
+    loop = asyncio.get_event_loop()
+    partials: asyncio.Queue = asyncio.Queue()
+    start = loop.time()
+
+    def queue_partial(text: str) -> None:
+        # Called from the local scheduler's worker thread
+        loop.call_soon_threadsafe(partials.put_nowait, text)
+
+    async def relay_partials() -> None:
+        first = True
+        while (text := await partials.get()) is not None:
+            elapsed = loop.time() - start
+            if first:
+                print(f"  [Stream] First partial after {elapsed:.2f}s", flush=True)
+                first = False
+            await on_partial({"type": "partial", "text": text, "elapsed": elapsed})
+
+    relay = asyncio.create_task(relay_partials())
+    try:
+        # Requests run concurrently: cloud calls are awaited on the loop,
+        # local MLX inference is serialized (and micro-batched) by the local
+        # scheduler's worker thread
+        result = await transcribe_audio_async(
+            audio_data, language=lang, on_partial=queue_partial
         )
+    finally:
+        loop.call_soon_threadsafe(partials.put_nowait, None)
+        await relay
 
     detected = result.get("language", "?").upper()
     proc_time = result.get("processing_time", 0)
@@ -396,22 +493,65 @@ async def transcribe_audio(file: UploadFile = File(...)):
     )
     log_memory(f"After transcription ({result_provider})")
 
-    # Save to history if there's text
+    # Save to history if there's text (cached results are already in history)
     transcribed_text = result.get("text", "").strip()
-    if transcribed_text:
+    if transcribed_text and not result.get("cached"):
         history.add_entry(transcribed_text)
 
-    # Broadcast result to all connected web UI clients
-    if _ws_clients:
-        for ws in list(_ws_clients):
-            try:
-                await ws.send_json(result)
-            except Exception:
-                _ws_clients.discard(ws)
+    # Broadcast final result to all connected web UI clients
+    await _broadcast({**result, "type": "final"})
 
     return result
 
 
+@app.post("/api/transcribe")
+async def transcribe_audio(file: UploadFile = File(...), stream: bool = False):
+    """HTTP endpoint for audio transcription (used by global hotkey client).
+
+    Uses the server's language and provider settings. Partial text from
+    streaming providers (local Gemma 4) is always relayed to /ws observers.
+    With ?stream=true the response is newline-delimited JSON: zero or more
+    {"type": "partial"} lines, then the final result with "type": "final".
+    """
+    audio_data = await file.read()
+
+    lang = settings.get_language()
+    response = settings.get_settings_response()
+    lang_display = response["language_display"]
+    provider = settings.get_stt_provider()
+    provider_display = response.get("stt_provider_display", provider)
+
+    print(
+        f"→ [HTTP] Transcribing with provider={provider_display}, language={lang_display}...",
+        flush=True,
+    )
+
+    if not stream:
+        return await _run_transcription(audio_data, lang, _broadcast)
+
+    async def ndjson_lines():
+        lines: asyncio.Queue = asyncio.Queue()
+
+        async def on_partial(message: dict) -> None:
+            await _broadcast(message)
+            await lines.put(message)
+
+        async def run() -> None:
+            try:
+                result = await _run_transcription(audio_data, lang, on_partial)
+                await lines.put({**result, "type": "final"})
+            except Exception as e:
+                await lines.put({"type": "error", "error": str(e)})
+            await lines.put(None)
+
+        task = asyncio.create_task(run())
+        while (message := await lines.get()) is not None:
+            yield json.dumps(message) + "\n"
+        await task
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for observing transcription results (read-only).
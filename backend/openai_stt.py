@@ -1,21 +1,35 @@
 """OpenAI Whisper API client for speech-to-text."""
 
+import asyncio
+import io
 import os
-import tempfile
 import time
-from pathlib import Path
+from typing import ClassVar
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 import replacements
 import vocabulary
+from async_http import get_async_http_client
 from content_filter import get_filter
+from rate_limit import get_rate_limiter
 from settings import get_setting
 
+# Fail fast instead of waiting out the SDK default (10 minutes, 2 retries)
+# so the router can fail over to the next provider
+REQUEST_TIMEOUT = 30.0  # seconds
+REQUEST_RETRIES = 1
+
 
 class OpenAISTT:
     """OpenAI Whisper API client."""
 
+    # Accepted audio inputs; WAV bytes are uploaded as an in-memory file
+    CAPABILITIES: ClassVar[dict] = {
+        "input_forms": ("wav_bytes",),
+        "backend_input": "in_memory_file",
+    }
+
     def __init__(self):
         """Initialize the OpenAI client."""
         api_key = os.environ.get("OPENAI_API_KEY")
@@ -24,7 +38,13 @@ class OpenAISTT:
                 "OPENAI_API_KEY environment variable not set. "
                 "Please set it in your .env file or shell environment."
             )
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.client = OpenAI(
+            api_key=api_key, timeout=REQUEST_TIMEOUT, max_retries=REQUEST_RETRIES
+        )
+        # Created on first async use, on the shared connection pool
+        self._aclient: AsyncOpenAI | None = None
+        self._aclient_http = None
         self.model = "whisper-1"  # OpenAI's Whisper model
 
         # Custom vocabulary for prompt (loaded from vocabulary.txt)
@@ -45,105 +65,160 @@ class OpenAISTT:
         words = self.vocabulary[:max_words] if max_words > 0 else self.vocabulary
         return f"Vocabulary: {', '.join(words)}."
 
-    def transcribe(
-        self,
-        audio_data: bytes,
-        language: str | None = None,
-        max_vocab_words: int = 0,
-    ) -> dict:
-        """Transcribe audio data using OpenAI Whisper API.
+    def _async_client(self) -> AsyncOpenAI:
+        """Async client on the shared connection pool (rebuilt if the pool is)."""
+        http_client = get_async_http_client()
+        if self._aclient is None or self._aclient_http is not http_client:
+            self._aclient = AsyncOpenAI(
+                api_key=self.api_key,
+                timeout=REQUEST_TIMEOUT,
+                max_retries=REQUEST_RETRIES,
+                http_client=http_client,
+            )
+            self._aclient_http = http_client
+        return self._aclient
 
-        Args:
-            audio_data: Raw audio bytes (WAV format)
-            language: Language code (fr, en, etc.) or None for auto-detect
-            max_vocab_words: Max vocabulary words in prompt (0 = no limit)
+    async def prewarm(self) -> None:
+        """Open (or refresh) a pooled connection to the API host.
 
-        Returns:
-            Dict with 'text', 'language', 'duration', 'processing_time'
+        Any HTTP response will do; the point is the TCP + TLS handshake, so
+        the next request reuses a warm keep-alive connection.
         """
-        total_start = time.time()
+        client = self._async_client()
+        await get_async_http_client().head(str(client.base_url))
 
+    def _api_params(
+        self, audio_data: bytes, language: str | None, max_vocab_words: int
+    ) -> dict:
+        """Request parameters, with the audio wrapped as an in-memory file."""
         lang_mode = language.upper() if language else "AUTO-DETECT"
         print(f"  [OpenAI] transcribe() called with language={lang_mode}")
 
-        # --- Write audio to temp file ---
-        prep_start = time.time()
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio_data)
-            temp_path = f.name
-        prep_time = (time.time() - prep_start) * 1000
+        # --- Wrap audio in an in-memory file (no temp file round trip) ---
+        audio_file = ("audio.wav", io.BytesIO(audio_data), "audio/wav")
 
-        try:
-            # --- API call ---
-            inference_start = time.time()
+        prompt = self._build_prompt(max_words=max_vocab_words)
+        if prompt:
+            print(f"  [OpenAI] Using prompt: {prompt[:50]}...")
+
+        # Build API call parameters
+        api_params = {
+            "model": self.model,
+            "file": audio_file,
+            "response_format": "verbose_json",
+        }
+
+        if language:
+            api_params["language"] = language
+        if prompt:
+            api_params["prompt"] = prompt
+        return api_params
+
+    def _build_result(
+        self,
+        response,
+        audio_data: bytes,
+        language: str | None,
+        total_start: float,
+        inference_time: float,
+    ) -> dict:
+        """Post-process the API response into the result dict."""
+        full_text = response.text.strip() if response.text else ""
 
-            prompt = self._build_prompt(max_words=max_vocab_words)
-            if prompt:
-                print(f"  [OpenAI] Using prompt: {prompt[:50]}...")
+        # Track vocabulary usage (pure match detection, no rewrite)
+        matched = vocabulary.find_matches(full_text, self.vocabulary)
+        if matched:
+            vocabulary.get_manager().record_usage(matched)
 
-            # Open file for API call (use context manager to ensure cleanup)
-            with open(temp_path, "rb") as audio_file:
-                # Build API call parameters
-                api_params = {
-                    "model": self.model,
-                    "file": audio_file,
-                    "response_format": "verbose_json",
-                }
+        # Apply word replacements (if enabled)
+        if get_setting("replacements_enabled"):
+            full_text = replacements.get_manager().apply_replacements(full_text)
 
-                if language:
-                    api_params["language"] = language
-                if prompt:
-                    api_params["prompt"] = prompt
+        # Filter profanity (if enabled)
+        if get_setting("content_filter"):
+            full_text = get_filter().filter(full_text)
 
-                # Make API call
-                response = self.client.audio.transcriptions.create(**api_params)
+        # Get duration from response (verbose_json includes it)
+        duration = getattr(response, "duration", 0) or 0
 
-            inference_time = (time.time() - inference_start) * 1000
+        if duration == 0:
+            # Fallback: estimate from WAV size
+            duration = max(0, (len(audio_data) - 44) / (16000 * 2))
 
-            full_text = response.text.strip() if response.text else ""
+        # Get detected language
+        detected_language = getattr(response, "language", language or "unknown")
 
-            # Track vocabulary usage (pure match detection, no rewrite)
-            matched = vocabulary.find_matches(full_text, self.vocabulary)
-            if matched:
-                vocabulary.get_manager().record_usage(matched)
+        total_time = time.time() - total_start
 
-            # Apply word replacements (if enabled)
-            if get_setting("replacements_enabled"):
-                full_text = replacements.get_manager().apply_replacements(full_text)
+        print(
+            f"  [Timing] API={inference_time:.0f}ms | "
+            f"total={total_time * 1000:.0f}ms | audio={duration:.1f}s"
+        )
 
-            # Filter profanity (if enabled)
-            if get_setting("content_filter"):
-                full_text = get_filter().filter(full_text)
+        return {
+            "text": full_text,
+            "language": detected_language,
+            "language_probability": 1.0,
+            "duration": duration,
+            "processing_time": total_time,
+            "provider": "openai",
+        }
 
-            # Get duration from response (verbose_json includes it)
-            duration = getattr(response, "duration", 0) or 0
+    def transcribe(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Transcribe audio data using OpenAI Whisper API.
 
-            if duration == 0:
-                # Fallback: estimate from WAV size
-                duration = max(0, (len(audio_data) - 44) / (16000 * 2))
+        Args:
+            audio_data: Raw audio bytes (WAV format)
+            language: Language code (fr, en, etc.) or None for auto-detect
+            max_vocab_words: Max vocabulary words in prompt (0 = no limit)
 
-            # Get detected language
-            detected_language = getattr(response, "language", language or "unknown")
+        Returns:
+            Dict with 'text', 'language', 'duration', 'processing_time'
+        """
+        total_start = time.time()
+        api_params = self._api_params(audio_data, language, max_vocab_words)
 
-            total_time = time.time() - total_start
+        inference_start = time.time()
+        # Raw response for the x-ratelimit-* headers
+        raw = self.client.audio.transcriptions.with_raw_response.create(**api_params)
+        get_rate_limiter("openai").observe_headers(raw.headers)
+        response = raw.parse()
+        inference_time = (time.time() - inference_start) * 1000
 
-            print(
-                f"  [Timing] prep={prep_time:.0f}ms | API={inference_time:.0f}ms | "
-                f"total={total_time * 1000:.0f}ms | audio={duration:.1f}s"
-            )
+        return self._build_result(
+            response, audio_data, language, total_start, inference_time
+        )
 
-            return {
-                "text": full_text,
-                "language": detected_language,
-                "language_probability": 1.0,
-                "duration": duration,
-                "processing_time": total_time,
-                "provider": "openai",
-            }
-
-        finally:
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
+    async def transcribe_async(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Async transcribe(): awaited on the event loop via the shared pool."""
+        total_start = time.time()
+        api_params = self._api_params(audio_data, language, max_vocab_words)
+
+        inference_start = time.time()
+        client = self._async_client()
+        raw = await client.audio.transcriptions.with_raw_response.create(**api_params)
+        get_rate_limiter("openai").observe_headers(raw.headers)
+        response = raw.parse()
+        inference_time = (time.time() - inference_start) * 1000
+
+        return await asyncio.to_thread(
+            self._build_result,
+            response,
+            audio_data,
+            language,
+            total_start,
+            inference_time,
+        )
 
 
 # Singleton instance
@@ -0,0 +1,118 @@
+"""Get ready for a transcription while the user is still speaking.
+
+The hotkey client posts /api/status {recording: true} the moment recording
+starts. That gives the server a few seconds of head start before the audio
+arrives, which is used to:
+
+- open or refresh the pooled TLS connection to the cloud provider(s) the
+  request will likely go to (no handshake after key release)
+- queue a local prewarm on the scheduler's worker: load the model if it's
+  cold and build the prompts (and Gemma 4's prefilled prompt prefixes) for
+  both a normal clip and a short one, since the length isn't known yet
+- keep the model resident: the queued prewarm restarts the scheduler's idle
+  timer, so memory isn't released mid-dictation. Nothing is reserved; other
+  requests queued meanwhile still run first
+
+The first dictation after an idle period then pays neither the handshake nor
+prompt building after the key is released.
+"""
+
+import asyncio
+import threading
+import time
+
+# Connections stay pooled for async_http.KEEPALIVE_EXPIRY; re-warming more
+# often than this only adds requests
+MIN_CONNECTION_INTERVAL = 15.0
+
+
+class Prewarmer:
+    """Warms providers on recording start; throttles connection refreshes."""
+
+    def __init__(self, min_interval: float = MIN_CONNECTION_INTERVAL):
+        self.min_interval = min_interval
+        self._last_warmed: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Stats
+        self.starts = 0
+        self.connections = 0
+        self.connection_errors = 0
+        self.skipped_recent = 0
+        self.local = 0
+        self.last_connect_ms: dict[str, float] = {}
+
+    def _due(self, name: str) -> bool:
+        """Claim a connection refresh unless one happened recently."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_warmed.get(name, float("-inf")) < self.min_interval:
+                self.skipped_recent += 1
+                return False
+            self._last_warmed[name] = now
+            return True
+
+    async def _warm_connection(self, name: str, stt) -> None:
+        start = time.perf_counter()
+        try:
+            await stt.prewarm()
+        except Exception as e:
+            self.connection_errors += 1
+            with self._lock:
+                self._last_warmed.pop(name, None)  # Retry on the next recording
+            print(f"  [Prewarm] {name} connection failed: {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        self.connections += 1
+        self.last_connect_ms[name] = round(elapsed, 1)
+        print(f"  [Prewarm] {name} connection ready ({elapsed:.0f}ms)")
+
+    async def prewarm(self, provider: str, language: str | None) -> None:
+        """Warm everything the next request to `provider` will need."""
+        from stt_engine import (
+            CLOUD_PROVIDERS,
+            _auto_candidates,
+            _cloud_stt,
+            get_breaker,
+            prewarm_local,
+        )
+
+        self.starts += 1
+        targets = _auto_candidates() if provider == "auto" else [provider]
+
+        if "local" in targets:
+            self.local += 1
+            prewarm_local(language)
+
+        warmups = []
+        for name in targets:
+            if name not in CLOUD_PROVIDERS:
+                continue
+            stt = _cloud_stt(name)
+            if stt is None or get_breaker(name).state == "open":
+                continue
+            if self._due(name):
+                warmups.append(self._warm_connection(name, stt))
+        await asyncio.gather(*warmups)
+
+    def stats(self) -> dict:
+        return {
+            "starts": self.starts,
+            "connections": self.connections,
+            "connection_errors": self.connection_errors,
+            "skipped_recent": self.skipped_recent,
+            "local": self.local,
+            "last_connect_ms": dict(self.last_connect_ms),
+        }
+
+
+# Singleton instance
+_prewarmer: Prewarmer | None = None
+
+
+def get_prewarmer() -> Prewarmer:
+    """Get or create the prewarmer singleton."""
+    global _prewarmer
+    if _prewarmer is None:
+        _prewarmer = Prewarmer()
+    return _prewarmer
@@ -0,0 +1,95 @@
+"""Rolling latency statistics per provider / model tier.
+
+Each transcription records its wall-clock latency and audio duration under
+a key such as "local:e2b" or "groq". Summaries report percentiles and the
+real-time factor (latency / audio seconds) over the most recent requests.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+# Requests kept per key
+WINDOW_SIZE = 200
+
+
+class LatencyStats:
+    """Thread-safe rolling window of (latency, audio seconds, ok) per key."""
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, key: str, latency: float, audio_seconds: float, ok: bool = True
+    ) -> None:
+        """Record one request (latency in seconds)."""
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append((latency, audio_seconds, ok))
+
+    def percentile(
+        self,
+        key: str,
+        q: float,
+        min_samples: int = 1,
+        per_audio_second: bool = False,
+    ) -> float | None:
+        """q-th percentile latency (seconds) of successful requests.
+
+        With per_audio_second, the percentile of latency / audio seconds
+        instead, so clips of different lengths are comparable.
+
+        Returns None with fewer than `min_samples` successful requests.
+        """
+        with self._lock:
+            samples = [
+                (lat, secs) for lat, secs, ok in self._samples.get(key, ()) if ok
+            ]
+        if per_audio_second:
+            latencies = [lat / secs for lat, secs in samples if secs > 0]
+        else:
+            latencies = [lat for lat, _ in samples]
+        if not latencies or len(latencies) < min_samples:
+            return None
+        return float(np.percentile(latencies, q))
+
+    def summary(self) -> dict[str, dict]:
+        """Per-key count, error count, latency percentiles (ms) and mean RTF."""
+        with self._lock:
+            snapshot = {key: list(samples) for key, samples in self._samples.items()}
+
+        result = {}
+        for key, samples in sorted(snapshot.items()):
+            ok = [(lat, secs) for lat, secs, success in samples if success]
+            entry = {"count": len(samples), "errors": len(samples) - len(ok)}
+            if ok:
+                latencies = np.array([lat for lat, _ in ok]) * 1000
+                rtfs = [lat / secs for lat, secs in ok if secs > 0]
+                entry.update(
+                    {
+                        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+                        "p90_ms": round(float(np.percentile(latencies, 90)), 1),
+                        "mean_rtf": round(float(np.mean(rtfs)), 3) if rtfs else None,
+                    }
+                )
+            result[key] = entry
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+# Singleton instance
+_stats: LatencyStats | None = None
+
+
+def get_latency_stats() -> LatencyStats:
+    """Get or create the latency statistics singleton."""
+    global _stats
+    if _stats is None:
+        _stats = LatencyStats()
+    return _stats
@@ -0,0 +1,274 @@
+"""Per-provider rate limiting against request and audio-duration quotas.
+
+Groq and OpenAI enforce requests-per-minute and (Groq) audio-seconds-per-hour
+quotas. Each provider gets a sliding window per budget; a request reserves
+one request plus its audio seconds before it is sent. If the reservation
+means waiting, the caller either waits (requests are sent as fast as the
+quota allows instead of bursting into 429s) or, when the wait would be too
+long, skips the provider and moves down the fallback chain.
+
+The windows are corrected from what the provider reports:
+- x-ratelimit-remaining-requests / x-ratelimit-reset-requests response
+  headers cap the local estimate of the remaining request budget
+- a 429 (with Retry-After when present) blocks the provider until it resets
+
+Both corrections only apply while quotas are configured; an unconfigured
+(disabled) limiter never delays a request.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+
+# Wait this long after a 429 that carries no Retry-After / reset header
+DEFAULT_BACKOFF = 5.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: str | None) -> float | None:
+    """Seconds from a reset header: "1.5", "7.66s", "6m0s", "2m59.56s", "120ms"."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+class RateLimitedError(RuntimeError):
+    """A provider is over quota for longer than the caller is willing to wait."""
+
+    status_code = 429
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class SlidingWindow:
+    """At most `limit` units in any `window` seconds.
+
+    Entries are reservations at their (possibly future) send time. A sliding
+    window, unlike a token bucket refilling at limit/window, never lets a
+    full burst be followed by more requests inside the same window, which is
+    what the provider's own accounting would reject.
+    """
+
+    def __init__(self, limit: float, window: float):
+        self.limit = limit
+        self.window = window
+        self._entries: deque[tuple[float, float]] = deque()
+
+    def _expire(self, now: float) -> None:
+        while self._entries and self._entries[0][0] <= now - self.window:
+            self._entries.popleft()
+
+    def used(self, now: float) -> float:
+        self._expire(now)
+        return sum(amount for _, amount in self._entries)
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` fits in every window containing the send time."""
+        amount = min(amount, self.limit)
+        used = self.used(now)
+        if used + amount <= self.limit:
+            return 0.0
+        for at, entry in self._entries:
+            used -= entry
+            if used + amount <= self.limit:
+                return max(0.0, at + self.window - now)
+        return 0.0  # Unreachable: amount <= limit
+
+    def take(self, amount: float, at: float) -> None:
+        """Record a send at time `at` (kept in time order)."""
+        amount = min(amount, self.limit)
+        if self._entries and at < self._entries[-1][0]:
+            entries = sorted([*self._entries, (at, amount)])
+            self._entries = deque(entries)
+        else:
+            self._entries.append((at, amount))
+
+    def cap(self, remaining: float, now: float) -> None:
+        """Lower what's left to what the provider says is left."""
+        excess = self.limit - self.used(now) - remaining
+        if excess > 0:
+            self.take(excess, now)
+
+    def left(self, now: float) -> float:
+        return self.limit - self.used(now)
+
+
+class ProviderLimiter:
+    """Request + audio-seconds budgets for one provider."""
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limits = (0.0, 0.0)
+        self._requests: SlidingWindow | None = None
+        self._audio: SlidingWindow | None = None
+        self._blocked_until = 0.0
+
+        # Stats
+        self.reserved = 0
+        self.queued = 0
+        self.queued_seconds = 0.0
+        self.rerouted = 0
+        self.throttled = 0
+
+    def configure(
+        self, requests_per_minute: float, audio_seconds_per_hour: float
+    ) -> None:
+        """Set the quotas (0 = unlimited); usage history resets when they change."""
+        limits = (float(requests_per_minute or 0), float(audio_seconds_per_hour or 0))
+        with self._lock:
+            if limits == self._limits:
+                return
+            self._limits = limits
+            rpm, ash = limits
+            self._requests = SlidingWindow(rpm, 60.0) if rpm > 0 else None
+            self._audio = SlidingWindow(ash, 3600.0) if ash > 0 else None
+            if not self.configured:
+                self._blocked_until = 0.0
+
+    @property
+    def configured(self) -> bool:
+        """Whether any quota is set (an unconfigured limiter never waits)."""
+        return self._limits != (0.0, 0.0)
+
+    def _wait(self, audio_seconds: float, requests: int, now: float) -> float:
+        wait = max(0.0, self._blocked_until - now)
+        if self._requests is not None:
+            wait = max(wait, self._requests.wait_time(requests, now))
+        if self._audio is not None:
+            wait = max(wait, self._audio.wait_time(audio_seconds, now))
+        return wait
+
+    def peek(self, audio_seconds: float, requests: int = 1) -> float:
+        """Seconds a request would have to wait, without reserving."""
+        with self._lock:
+            return self._wait(audio_seconds, requests, self._clock())
+
+    def reserve(
+        self,
+        audio_seconds: float,
+        requests: int = 1,
+        max_wait: float = float("inf"),
+    ) -> float | None:
+        """Reserve budget for a request.
+
+        Returns:
+            Seconds the caller must wait before sending (0 = send now), or
+            None (nothing reserved) if that would exceed max_wait.
+        """
+        with self._lock:
+            now = self._clock()
+            wait = self._wait(audio_seconds, requests, now)
+            if wait > max_wait:
+                self.rerouted += 1
+                return None
+            if self._requests is not None:
+                self._requests.take(requests, now + wait)
+            if self._audio is not None:
+                self._audio.take(audio_seconds, now + wait)
+            self.reserved += 1
+            if wait > 0:
+                self.queued += 1
+                self.queued_seconds += wait
+            return wait
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Correct the request budget from x-ratelimit-* response headers."""
+        remaining = _header_float(headers, "x-ratelimit-remaining-requests")
+        if remaining is None or not self.configured:
+            return
+        reset = parse_reset(headers.get("x-ratelimit-reset-requests"))
+        with self._lock:
+            now = self._clock()
+            if remaining <= 0 and reset:
+                self._blocked_until = max(self._blocked_until, now + reset)
+            elif self._requests is not None:
+                self._requests.cap(remaining, now)
+
+    def on_rate_limited(self, headers: Mapping[str, str] | None = None) -> float:
+        """A 429 came back: block until the provider's reset. Returns the backoff.
+
+        Unconfigured limiters only count it (backoff 0): the 429 is returned
+        to the caller instead of delaying later requests.
+        """
+        if not self.configured:
+            with self._lock:
+                self.throttled += 1
+            return 0.0
+        headers = headers or {}
+        backoff = (
+            parse_reset(headers.get("retry-after"))
+            or parse_reset(headers.get("x-ratelimit-reset-requests"))
+            or DEFAULT_BACKOFF
+        )
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + backoff)
+            self.throttled += 1
+        print(f"  [RateLimit] {self.name} returned 429, backing off {backoff:.1f}s")
+        return backoff
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = self._clock()
+            rpm, ash = self._limits
+            return {
+                "requests_per_minute": rpm or None,
+                "audio_seconds_per_hour": ash or None,
+                "requests_left": round(self._requests.left(now), 1)
+                if self._requests
+                else None,
+                "audio_seconds_left": round(self._audio.left(now), 1)
+                if self._audio
+                else None,
+                "blocked_for_s": round(max(0.0, self._blocked_until - now), 1),
+                "reserved": self.reserved,
+                "queued": self.queued,
+                "queued_seconds": round(self.queued_seconds, 1),
+                "rerouted": self.rerouted,
+                "throttled": self.throttled,
+            }
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an SDK exception is an HTTP 429 (Groq/OpenAI status_code, genai code)."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return status == 429
+
+
+def error_headers(error: BaseException) -> Mapping[str, str]:
+    """Response headers carried by an SDK exception, if any."""
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None) or {}
+
+
+# One limiter per provider (quotas applied by stt_engine from settings)
+_limiters: dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderLimiter:
+    """Get or create the provider's limiter (unlimited until configured)."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = ProviderLimiter(provider)
+        return limiter
@@ -36,6 +36,7 @@ class ReplacementManager:
         self._watcher_thread: threading.Thread | None = None
         self._stop_watcher = threading.Event()
         self._lock = threading.Lock()
+        self._version = 0  # Bumped on every rule change (cache key for results)
 
         # Initial load
         self._load_from_file()
@@ -46,6 +47,11 @@ class ReplacementManager:
         with self._lock:
             return self._replacements.copy()
 
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the rules change."""
+        return self._version
+
     def _load_from_file(self) -> bool:
         """Load replacements from file. Returns True if changed."""
         if not REPLACEMENTS_FILE.exists():
@@ -93,6 +99,7 @@ class ReplacementManager:
                 self._replacements = valid_replacements
 
             if valid_replacements != old_replacements:
+                self._version += 1
                 print(
                     f"[Replacements] Loaded {len(valid_replacements)} rules"
                     + (
@@ -164,6 +171,7 @@ class ReplacementManager:
                 return False, f"Replacement for '{from_text}' already exists"
 
             self._replacements.append({"from": from_text, "to": to_text})
+            self._version += 1
 
         self._save_to_file()
 
@@ -186,6 +194,7 @@ class ReplacementManager:
             for i, rule in enumerate(self._replacements):
                 if rule["from"].lower() == from_text.lower():
                     removed = self._replacements.pop(i)
+                    self._version += 1
                     break
             else:
                 return False
@@ -213,6 +222,7 @@ class ReplacementManager:
 
         with self._lock:
             self._replacements = valid_rules[:MAX_REPLACEMENTS]
+            self._version += 1
 
         self._save_to_file()
 
@@ -0,0 +1,356 @@
+"""Replay a saved debug-audio run and compare it with what was recorded.
+
+With save_debug_audio on, every transcription leaves `<timestamp>_*_raw.wav`
+and `<timestamp>_meta.txt` in debug_audio/ (see debug_audio/TEST_PROTOCOL.md).
+This re-runs each raw clip through the router (stt_engine.transcribe_audio_async)
+with the provider and language that served it, and reports per clip:
+
+- text: identical, or changed (with the word-level difference rate against the
+  recorded transcript; character-level for zh/ja)
+- latency: replayed vs recorded processing time (the provider's own time,
+  as written to the metadata), plus end-to-end wall time for the replay
+
+Everything else comes from the current settings, vocabulary and replacements
+(snapshotted into a temp directory, so the replay never writes history,
+usage counts or new debug audio), plus --set overrides. The result cache is
+off.
+
+Clips run concurrently, at most N per provider at once: 1 for local (one
+model on the GPU), simulated_max_concurrency for simulated, 4 for cloud
+providers (their request/audio quotas are still enforced by the router's
+rate limiter). Change with --concurrency groq=8.
+
+Usage:
+    uv run python replay_debug_audio.py debug_audio/test_run_03
+    uv run python replay_debug_audio.py debug_audio/test_run_03 --provider gemini
+    uv run python replay_debug_audio.py debug_audio/test_run_03 --set audio_normalization=false --output replay.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ensure backend modules are importable
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_load import isolate_state, parse_overrides, percentiles_ms
+from benchmark_providers import score
+
+# Clips replayed at once per provider (simulated uses its own setting)
+DEFAULT_CONCURRENCY = {"local": 1, "groq": 4, "openai": 4, "gemini": 4}
+
+# Settings forced for every replay (before --set)
+REPLAY_SETTINGS = {
+    "save_debug_audio": False,
+    "result_cache_enabled": False,
+    "prewarm_on_record": False,
+}
+
+# Lines written by stt_engine._save_debug_metadata
+META_KEYS = (
+    "Timestamp",
+    "Duration",
+    "Provider",
+    "Language setting",
+    "Language override",
+    "Detected language",
+    "RMS (original)",
+    "RMS (processed)",
+    "Gain",
+    "Normalized",
+    "Padded",
+    "Vocab words in prompt",
+    "Transcription",
+    "Processing time",
+)
+
+
+def parse_meta(path: Path) -> dict:
+    """Recorded request and result from a `<timestamp>_meta.txt` file."""
+    fields: dict[str, str] = {}
+    key = None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        name, sep, value = line.partition(": ")
+        if sep and name in META_KEYS:
+            key = name
+            fields[key] = value
+        elif key == "Transcription":
+            fields[key] += "\n" + line  # Multi-line transcript
+
+    language = fields.get("Language setting", "AUTO")
+    return {
+        "timestamp": fields.get("Timestamp", path.name.removesuffix("_meta.txt")),
+        "duration": float(fields.get("Duration", "0").rstrip("s")),
+        "provider": fields.get("Provider"),
+        # With a short-clip override this is the overridden language, i.e.
+        # the one the provider was actually asked for
+        "language": None if language == "AUTO" else language,
+        "detected_language": fields.get("Detected language"),
+        "vocab_words": int(fields.get("Vocab words in prompt", "0")),
+        "text": fields.get("Transcription", ""),
+        "processing_time": float(fields.get("Processing time", "0").rstrip("s")),
+    }
+
+
+def load_run(run_dir: Path) -> tuple[list[dict], list[str]]:
+    """Clips (metadata + raw audio) of a run, and why any were skipped."""
+    clips, skipped = [], []
+    for meta_path in sorted(run_dir.glob("*_meta.txt")):
+        meta = parse_meta(meta_path)
+        raw = next(iter(sorted(run_dir.glob(f"{meta['timestamp']}_*_raw.wav"))), None)
+        if raw is None:
+            skipped.append(f"{meta['timestamp']}: no raw audio")
+        elif not meta["provider"] or meta["provider"] == "none":
+            skipped.append(f"{meta['timestamp']}: no provider recorded")
+        else:
+            clips.append({**meta, "audio": raw.read_bytes()})
+    return clips, skipped
+
+
+def _snapshot_state(state_dir: Path) -> dict:
+    """Copy the live vocabulary/replacements; return the live settings."""
+    import replacements
+    import settings
+    import vocabulary
+
+    for path in (
+        replacements.REPLACEMENTS_FILE,
+        vocabulary.VOCABULARY_FILE,
+        vocabulary.USAGE_FILE,
+    ):
+        if path.exists():
+            shutil.copy(path, state_dir / path.name)
+    return settings.get_all_settings()
+
+
+def _load_vocabulary(providers: set[str]) -> None:
+    """Give each replayed provider the vocabulary, as the server's startup does."""
+    import stt_engine
+    import vocabulary
+
+    words = vocabulary.get_manager().words
+    for provider in providers:
+        if provider == "local":
+            from gemma4_stt import is_gemma4_available, set_gemma4_vocabulary
+
+            stt_engine.get_engine().set_vocabulary(words)
+            if is_gemma4_available():
+                set_gemma4_vocabulary(words)
+        else:
+            stt = stt_engine._cloud_stt(provider)
+            if stt is not None:
+                stt.set_vocabulary(words)
+
+
+def _concurrency(provider: str, overrides: dict) -> int:
+    from settings import get_setting
+
+    if provider in overrides:
+        return max(1, int(overrides[provider]))
+    if provider == "simulated":
+        return max(1, int(get_setting("simulated_max_concurrency")))
+    return DEFAULT_CONCURRENCY.get(provider, 1)
+
+
+async def replay(
+    clips: list[dict], provider: str | None, concurrency: dict
+) -> list[dict]:
+    """Re-transcribe every clip, at most N at once per provider."""
+    import stt_engine
+
+    slots: dict[str, asyncio.Semaphore] = {}
+
+    async def one(clip: dict) -> dict:
+        target = provider or clip["provider"]
+        slot = slots.setdefault(
+            target, asyncio.Semaphore(_concurrency(target, concurrency))
+        )
+        row = {
+            "timestamp": clip["timestamp"],
+            "duration_s": clip["duration"],
+            "provider": target,
+            "recorded_provider": clip["provider"],
+            "language": clip["language"],
+            "recorded_text": clip["text"],
+            "recorded_processing_s": clip["processing_time"],
+        }
+        async with slot:
+            start = time.perf_counter()
+            try:
+                result = await stt_engine.transcribe_audio_async(
+                    clip["audio"], clip["language"], provider=target
+                )
+            except Exception as e:
+                row["error"] = f"{type(e).__name__}: {e}"
+                return row
+            row["wall_s"] = time.perf_counter() - start
+
+        row["text"] = result.get("text", "")
+        row["processing_s"] = result.get("processing_time", 0.0)
+        row["served_by"] = result.get("provider")
+        if result.get("failover_from"):
+            row["error"] = f"failed over to {result.get('provider')}"
+        language = clip["language"] or clip["detected_language"]
+        diff = score(clip["text"], row["text"], language)
+        row["text_changed"] = row["text"] != clip["text"]
+        row["word_diff"] = diff["rate"] if diff["rate"] is not None else 0.0
+        row["diff_metric"] = diff["metric"]
+        print(
+            f"  {clip['timestamp']} {target:<9} {clip['duration']:>5.1f}s "
+            f"{'CHANGED' if row['text_changed'] else 'same   '} "
+            f"{clip['processing_time'] * 1000:>6.0f}ms -> {row['processing_s'] * 1000:>6.0f}ms",
+            file=sys.__stdout__,
+            flush=True,
+        )
+        return row
+
+    # The router logs every step; keep the output to the replay's
+    with contextlib.redirect_stdout(io.StringIO()):
+        return await asyncio.gather(*(one(clip) for clip in clips))
+
+
+def summarize(rows: list[dict]) -> dict:
+    """Text and latency changes across the run."""
+    ok = [r for r in rows if "error" not in r]
+    recorded = [r["recorded_processing_s"] for r in ok]
+    replayed = [r["processing_s"] for r in ok]
+    ratios = [
+        r["processing_s"] / r["recorded_processing_s"]
+        for r in ok
+        if r["recorded_processing_s"] > 0
+    ]
+    return {
+        "clips": len(rows),
+        "errors": len(rows) - len(ok),
+        "text_changed": sum(r["text_changed"] for r in ok),
+        "words_changed": sum(r["word_diff"] > 0 for r in ok),
+        "mean_word_diff": round(sum(r["word_diff"] for r in ok) / len(ok), 4)
+        if ok
+        else None,
+        "recorded_ms": percentiles_ms(recorded),
+        "replayed_ms": percentiles_ms(replayed),
+        "wall_ms": percentiles_ms([r["wall_s"] for r in ok]),
+        "median_latency_ratio": round(sorted(ratios)[len(ratios) // 2], 3)
+        if ratios
+        else None,
+    }
+
+
+def _cell(text: str) -> str:
+    """Keep a transcript on one markdown table row."""
+    return text.replace("\n", " / ").replace("|", "\\|")
+
+
+def format_results(rows: list[dict], summary: dict) -> str:
+    """Markdown table of changed clips and a summary line."""
+    lines = [
+        "| Clip | Provider | Dur | Recorded | Replayed | Diff | Latency |",
+        "|------|----------|-----|----------|----------|------|---------|",
+    ]
+    for r in rows:
+        if "error" in r and "text" not in r:
+            lines.append(
+                f"| {r['timestamp']} | {r['provider']} | {r['duration_s']:.1f}s | "
+                f"{_cell(r['recorded_text'])} | ERROR: {r['error']} | - | - |"
+            )
+            continue
+        if not r["text_changed"] and "error" not in r:
+            continue
+        replayed = _cell(r["text"]) + (f" ({r['error']})" if "error" in r else "")
+        lines.append(
+            f"| {r['timestamp']} | {r['provider']} | {r['duration_s']:.1f}s | "
+            f"{_cell(r['recorded_text'])} | {replayed} | {r['word_diff']:.0%} {r['diff_metric']} | "
+            f"{r['recorded_processing_s'] * 1000:.0f} -> {r['processing_s'] * 1000:.0f}ms |"
+        )
+    if len(lines) == 2:
+        lines = ["All transcripts identical to the recording."]
+
+    s = summary
+    rec, rep = s["recorded_ms"], s["replayed_ms"]
+    lines.append("")
+    lines.append(
+        f"{s['clips']} clips: {s['text_changed']} text changed "
+        f"({s['words_changed']} with word changes, mean diff {s['mean_word_diff'] or 0:.1%}), "
+        f"{s['errors']} errors"
+    )
+    lines.append(
+        f"Processing time p50/p95: recorded {rec['p50'] or 0:.0f}/{rec['p95'] or 0:.0f}ms, "
+        f"replayed {rep['p50'] or 0:.0f}/{rep['p95'] or 0:.0f}ms "
+        f"(median ratio {s['median_latency_ratio'] or 0:.2f}x)"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a debug-audio run")
+    parser.add_argument("run_dir", help="debug_audio/test_run_XX (or debug_audio)")
+    parser.add_argument(
+        "--provider",
+        help="Replay every clip through this provider instead of the recorded one",
+    )
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        default=[],
+        metavar="PROVIDER=N",
+        help="Clips at once per provider (default: local=1, cloud=4)",
+    )
+    parser.add_argument(
+        "--set",
+        nargs="+",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Setting overrides on top of the current settings",
+    )
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args()
+
+    clips, skipped = load_run(Path(args.run_dir))
+    print("Debug Audio Replay")
+    print("=" * 60)
+    print(f"{len(clips)} clips from {args.run_dir}")
+    for reason in skipped:
+        print(f"  skipped {reason}")
+    if not clips:
+        return
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        live = _snapshot_state(Path(state_dir))
+        settings_values = {**live, **REPLAY_SETTINGS, **parse_overrides(args.set)}
+        isolate_state(Path(state_dir), settings_values)
+        _load_vocabulary(
+            {args.provider} if args.provider else {c["provider"] for c in clips}
+        )
+        rows = asyncio.run(
+            replay(clips, args.provider, parse_overrides(args.concurrency))
+        )
+
+    summary = summarize(rows)
+    print()
+    print(format_results(rows, summary))
+
+    if args.output:
+        payload = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "run_dir": args.run_dir,
+            "provider": args.provider,
+            "settings": settings_values,
+            "summary": summary,
+            "clips": rows,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"\nSaved {len(rows)} clips to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
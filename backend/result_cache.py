@@ -0,0 +1,201 @@
+"""
+Transcription result cache keyed on an audio fingerprint.
+
+When the hotkey client retries after a timeout, or the web UI re-submits, the
+same audio arrives again. Instead of paying for another inference (or another
+cloud call), the result is served from a bounded LRU cache keyed on:
+- a hash of the PCM payload (WAV header excluded)
+- the provider and language
+- the vocabulary and replacement versions (and post-processing toggles)
+
+Concurrent identical requests are coalesced (single-flight): the first one runs
+the inference, the others wait for and share its result.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+
+# Approximate per-entry overhead (dict, key, bookkeeping) added to the text size
+ENTRY_OVERHEAD_BYTES = 512
+
+
+def make_key(pcm: bytes | memoryview, *parts) -> str:
+    """Build a cache key from the PCM payload and the settings that affect output."""
+    digest = hashlib.blake2b(pcm, digest_size=16).hexdigest()
+    return "|".join([digest, *(str(p) for p in parts)])
+
+
+def _entry_size(key: str, result: dict) -> int:
+    """Approximate memory used by a cached result, in bytes."""
+    return len(key) + len(json.dumps(result, default=str)) + ENTRY_OVERHEAD_BYTES
+
+
+class ResultCache:
+    """Bounded LRU cache of transcription results with single-flight coalescing."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], dict]) -> tuple[dict, str]:
+        """Return the cached result for key, or compute it once.
+
+        Args:
+            key: Cache key from make_key()
+            compute: Runs the transcription on a miss
+
+        Returns:
+            (result, status) where status is "hit", "miss" or "coalesced".
+            The result is a copy the caller may modify.
+        """
+        hit, future, leader = self._claim(key)
+        if hit is not None:
+            return hit, "hit"
+
+        if not leader:
+            # Wait for the in-flight inference (re-raises its error)
+            return copy.deepcopy(future.result()), "coalesced"
+
+        try:
+            result = compute()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result, "miss"
+
+    async def get_or_compute_async(
+        self, key: str, compute: Callable[[], Awaitable[dict]]
+    ) -> tuple[dict, str]:
+        """get_or_compute() for coroutines; waiters don't block the event loop.
+
+        Sync and async callers share the same entries and in-flight requests.
+        """
+        hit, future, leader = self._claim(key)
+        if hit is not None:
+            return hit, "hit"
+
+        if not leader:
+            return copy.deepcopy(await asyncio.wrap_future(future)), "coalesced"
+
+        try:
+            result = await compute()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result, "miss"
+
+    def _claim(self, key: str) -> tuple[dict | None, Future | None, bool]:
+        """(cached copy, None, False) on a hit, else (None, in-flight future, leader)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[0]), None, False
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return None, future, False
+
+            future = Future()
+            # Running futures can't be cancelled by a waiter that gives up
+            future.set_running_or_notify_cancel()
+            self._in_flight[key] = future
+            self.misses += 1
+            return None, future, True
+
+    def _settle(
+        self,
+        key: str,
+        future: Future,
+        result: dict | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Finish an in-flight computation; errors are shared but never cached."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if error is None:
+                self._store(key, copy.deepcopy(result))
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _store(self, key: str, result: dict) -> None:
+        """Insert an entry and evict least-recently-used ones over the cap."""
+        size = _entry_size(key, result)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (result, size)
+        self._bytes += size
+        self._trim()
+
+    def _trim(self) -> None:
+        """Evict least-recently-used entries until under the memory cap."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached results (in-flight requests are unaffected)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "in_flight": len(self._in_flight),
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+
+# Singleton instance
+_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get or create the result cache singleton (memory cap follows settings)."""
+    global _cache
+    from settings import get_setting
+
+    max_bytes = int(get_setting("result_cache_max_mb") * 1024 * 1024)
+    if _cache is None:
+        _cache = ResultCache(max_bytes=max_bytes)
+    elif _cache.max_bytes != max_bytes:
+        with _cache._lock:
+            _cache.max_bytes = max_bytes
+            _cache._trim()
+    return _cache
@@ -16,6 +16,9 @@ Example future setting:
 """
 
 import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any
 
@@ -30,9 +33,11 @@ SETTINGS_SCHEMA: dict[str, dict[str, Any]] = {
     "stt_provider": {
         "default": "local",
         "type": "string",
-        "options": ["local", "openai", "groq", "gemini"],
-        "description": "STT provider: local (Gemma 4 MLX), OpenAI API, Groq API, or Gemini API",
+        "options": ["local", "openai", "groq", "gemini", "auto", "simulated"],
+        "description": "STT provider: local (Gemma 4 MLX), OpenAI API, Groq API, Gemini API, auto (fastest expected for each clip), or simulated (offline load testing)",
         "display": lambda v: {
+            "auto": "Auto (Fastest)",
+            "simulated": "Simulated (Testing)",
             "local": "Local (Gemma 4)",
             "openai": "OpenAI API",
             "groq": "Groq API (Fast)",
@@ -155,6 +160,242 @@ SETTINGS_SCHEMA: dict[str, dict[str, Any]] = {
         "description": "Add silence padding (100ms pre + 200ms post) to short recordings (<5s)",
         "display": lambda v: "On" if v else "Off",
     },
+    "chunked_transcription": {
+        "default": False,
+        "type": "boolean",
+        "description": "Split long recordings at pauses and send chunks to cloud providers in parallel",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "chunk_target_duration": {
+        "default": 30,
+        "type": "number",
+        "min": 10,
+        "max": 120,
+        "description": "Preferred chunk length in seconds for chunked transcription",
+        "display": lambda v: f"{int(v)}s",
+    },
+    "chunk_max_concurrency": {
+        "default": 4,
+        "type": "number",
+        "min": 1,
+        "max": 16,
+        "description": "Max chunks sent to the cloud provider at the same time",
+        "display": lambda v: str(int(v)),
+    },
+    "gemma4_prompt_cache": {
+        "default": True,
+        "type": "boolean",
+        "description": "Reuse the prefilled Gemma 4 instruction + vocabulary prompt between transcriptions",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "local_fast_path": {
+        "default": False,
+        "type": "boolean",
+        "description": "Transcribe short clips locally with the smaller Gemma 4 E2B model (loads a second model)",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "local_fast_path_max_duration": {
+        "default": 5,
+        "type": "number",
+        "min": 1,
+        "max": 30,
+        "description": "Clips shorter than this (seconds) use the E2B fast path",
+        "display": lambda v: f"{v:g}s",
+    },
+    "local_fast_path_escalate": {
+        "default": True,
+        "type": "boolean",
+        "description": "Re-run on Gemma 4 E4B when E2B output looks degenerate (looping, empty, too long)",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "local_batch_window_ms": {
+        "default": 0,
+        "type": "number",
+        "min": 0,
+        "max": 500,
+        "description": "Wait this long to collect concurrent local requests into one batch (0 = batch only requests already queued)",
+        "display": lambda v: f"{int(v)}ms" if v > 0 else "Off",
+    },
+    "local_batch_max_size": {
+        "default": 4,
+        "type": "number",
+        "min": 1,
+        "max": 16,
+        "description": "Max local requests decoded together in one batch",
+        "display": lambda v: str(int(v)),
+    },
+    "memory_release_rss_mb": {
+        "default": 12000,
+        "type": "number",
+        "min": 500,
+        "max": 65536,
+        "description": "Release MLX cache + run GC after a request once process memory exceeds this",
+        "display": lambda v: f"{int(v)} MB",
+    },
+    "memory_release_cache_mb": {
+        "default": 2048,
+        "type": "number",
+        "min": 64,
+        "max": 16384,
+        "description": "Release once MLX's reusable buffer cache exceeds this",
+        "display": lambda v: f"{int(v)} MB",
+    },
+    "memory_release_idle_s": {
+        "default": 60,
+        "type": "number",
+        "min": 0,
+        "max": 3600,
+        "description": "Release memory after this many seconds without local transcriptions (0 = never)",
+        "display": lambda v: f"{int(v)}s" if v > 0 else "Off",
+    },
+    "hedged_requests": {
+        "default": False,
+        "type": "boolean",
+        "description": "If the cloud provider is slower than its usual p90 latency for the clip length, also send the audio to a second provider and use the first answer",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "hedge_max_cost_cents": {
+        "default": 0.5,
+        "type": "number",
+        "min": 0,
+        "max": 10,
+        "description": "Only hedge when the second provider's estimated cost for the clip is at most this (US cents)",
+        "display": lambda v: f"{v:g}¢",
+    },
+    "prewarm_on_record": {
+        "default": True,
+        "type": "boolean",
+        "description": "When recording starts, open the provider connection and load / prepare the local model while you speak",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "fallback_order": {
+        "default": "",
+        "type": "string",
+        "description": "Providers to try, in order, when the selected one fails or has its circuit open (comma-separated: groq, gemini, openai, local). Empty: errors are returned as-is; a missing API key still falls back to local",
+        "display": lambda v: v or "None",
+    },
+    "breaker_failure_threshold": {
+        "default": 3,
+        "type": "number",
+        "min": 1,
+        "max": 20,
+        "description": "Consecutive failures before a cloud provider's circuit opens and it is skipped",
+        "display": lambda v: str(int(v)),
+    },
+    "breaker_reset_s": {
+        "default": 30,
+        "type": "number",
+        "min": 5,
+        "max": 600,
+        "description": "Seconds an open circuit waits before probing the provider with a tiny test clip",
+        "display": lambda v: f"{int(v)}s",
+    },
+    "rate_limit_enabled": {
+        "default": False,
+        "type": "boolean",
+        "description": "Pace cloud requests to each provider's quota instead of running into 429 errors. The quotas below default to the free tiers; set them to your account's limits before turning this on",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "rate_limit_max_wait_s": {
+        "default": 3.0,
+        "type": "number",
+        "min": 0,
+        "max": 60,
+        "description": "Longest a request queues for a rate-limited provider before moving down the fallback order (or failing with a rate limit error if it is the last one)",
+        "display": lambda v: f"{v:.1f}s",
+    },
+    "groq_requests_per_minute": {
+        "default": 20,
+        "type": "number",
+        "min": 0,
+        "max": 10000,
+        "description": "Groq request quota per minute (0 = unlimited; default is the free tier)",
+        "display": lambda v: str(int(v)) if v else "Unlimited",
+    },
+    "groq_audio_seconds_per_hour": {
+        "default": 7200,
+        "type": "number",
+        "min": 0,
+        "max": 1000000,
+        "description": "Groq audio quota in seconds per hour (0 = unlimited; default is the free tier)",
+        "display": lambda v: f"{int(v)}s" if v else "Unlimited",
+    },
+    "openai_requests_per_minute": {
+        "default": 500,
+        "type": "number",
+        "min": 0,
+        "max": 100000,
+        "description": "OpenAI transcription request quota per minute (0 = unlimited)",
+        "display": lambda v: str(int(v)) if v else "Unlimited",
+    },
+    "gemini_requests_per_minute": {
+        "default": 15,
+        "type": "number",
+        "min": 0,
+        "max": 10000,
+        "description": "Gemini request quota per minute (0 = unlimited; default is the free tier)",
+        "display": lambda v: str(int(v)) if v else "Unlimited",
+    },
+    "simulated_latency_ms": {
+        "default": 300,
+        "type": "number",
+        "min": 0,
+        "max": 30000,
+        "description": "Simulated provider: fixed latency per request",
+        "display": lambda v: f"{int(v)}ms",
+    },
+    "simulated_latency_per_audio_s_ms": {
+        "default": 30,
+        "type": "number",
+        "min": 0,
+        "max": 5000,
+        "description": "Simulated provider: extra latency per second of audio",
+        "display": lambda v: f"{int(v)}ms/s",
+    },
+    "simulated_jitter_ms": {
+        "default": 50,
+        "type": "number",
+        "min": 0,
+        "max": 10000,
+        "description": "Simulated provider: mean of the random (exponential) extra latency",
+        "display": lambda v: f"{int(v)}ms" if v > 0 else "Off",
+    },
+    "simulated_error_rate": {
+        "default": 0.0,
+        "type": "number",
+        "min": 0,
+        "max": 1,
+        "description": "Simulated provider: fraction of requests that fail",
+        "display": lambda v: f"{v:.0%}",
+    },
+    "simulated_max_concurrency": {
+        "default": 8,
+        "type": "number",
+        "min": 1,
+        "max": 1024,
+        "description": "Simulated provider: requests served at once (the rest queue)",
+        "display": lambda v: str(int(v)),
+    },
+    "auto_include_local": {
+        "default": False,
+        "type": "boolean",
+        "description": "Let the auto provider pick local Gemma 4 too (otherwise only when no API key is set)",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "result_cache_enabled": {
+        "default": True,
+        "type": "boolean",
+        "description": "Reuse the previous result when identical audio is transcribed again (retries, re-submits)",
+        "display": lambda v: "On" if v else "Off",
+    },
+    "result_cache_max_mb": {
+        "default": 16,
+        "type": "number",
+        "min": 1,
+        "max": 256,
+        "description": "Memory cap for cached transcription results",
+        "display": lambda v: f"{int(v)} MB",
+    },
 }
 
 
@@ -239,9 +480,30 @@ def _get_display_value(key: str, value: Any) -> str:
 # =============================================================================
 
 
+# Settings read once for the request in progress (see settings_snapshot())
+_snapshot: ContextVar[dict[str, Any] | None] = ContextVar(
+    "settings_snapshot", default=None
+)
+
+
+@contextmanager
+def settings_snapshot() -> Iterator[None]:
+    """Read settings.json once for everything inside the block.
+
+    get_setting() calls in the block (including threads started with
+    asyncio.to_thread, which copy the context) use that one read instead
+    of re-reading the file every time.
+    """
+    token = _snapshot.set(_load_settings())
+    try:
+        yield
+    finally:
+        _snapshot.reset(token)
+
+
 def get_setting(key: str) -> Any:
     """Get a single setting value."""
-    settings = _load_settings()
+    settings = _snapshot.get() or _load_settings()
     return settings.get(key, SETTINGS_SCHEMA.get(key, {}).get("default"))
 
 
@@ -332,5 +594,5 @@ def get_min_volume_rms() -> int:
 
 
 def get_stt_provider() -> str:
-    """Get STT provider setting ('local' or 'openai')."""
+    """Get STT provider setting ('local', 'openai', 'groq', 'gemini', 'auto' or 'simulated')."""
     return get_setting("stt_provider")
@@ -0,0 +1,250 @@
+"""Simulated STT provider for offline load and latency testing.
+
+Needs neither Apple Silicon nor API keys: every request sleeps for a
+configurable latency, may fail at a configurable rate, and returns canned
+text chosen deterministically from the audio. It goes through the same
+router, post-processing, history and broadcast path as the real providers,
+so the rest of the stack can be profiled on any machine. It has no
+circuit breaker and never fails over, so injected errors reach the caller.
+
+Latency per request (settings):
+    simulated_latency_ms                 fixed part
+  + simulated_latency_per_audio_s_ms     x audio seconds
+  + exponential jitter with mean simulated_jitter_ms (a long tail, like a
+    real network + inference time)
+
+At most simulated_max_concurrency requests are served at once; the rest
+queue, like a provider-side concurrency cap. Sync and async callers are
+capped separately (the server only uses the async path).
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import ClassVar
+
+import replacements
+import vocabulary
+from content_filter import get_filter
+from settings import get_setting
+
+# Canned transcript; each clip gets a deterministic slice of it
+CANNED_SENTENCES = (
+    "The quick brown fox jumps over the lazy dog.",
+    "The meeting notes are saved to the shared folder.",
+    "The next release ships on Friday after the review.",
+    "Please send the final numbers before lunch.",
+)
+_WORDS = " ".join(CANNED_SENTENCES).lower().replace(".", "").split()
+
+# Typical dictation pace, used to size the canned text to the clip
+WORDS_PER_SECOND = 2.5
+
+
+class SimulatedProviderError(RuntimeError):
+    """Injected failure (looks like a 503 to the router)."""
+
+    status_code = 503
+
+
+class SimulatedSTT:
+    """Stand-in provider with configurable latency, errors and concurrency."""
+
+    # Audio is only hashed and measured, never decoded
+    CAPABILITIES: ClassVar[dict] = {
+        "input_forms": ("wav_bytes",),
+        "backend_input": "none",
+    }
+
+    def __init__(self, seed: int | None = None):
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._limit = 0
+        self._slots: threading.Semaphore | None = None
+        self._async_slots: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+        # Custom vocabulary (only used for usage tracking)
+        self.vocabulary: list[str] = []
+
+        # Stats
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def set_vocabulary(self, words: list[str]) -> None:
+        """Set custom vocabulary (tracked in results like the real providers)."""
+        self.vocabulary = words
+
+    def _apply_limit(self) -> int:
+        """Rebuild the concurrency slots if the setting changed."""
+        limit = max(1, int(get_setting("simulated_max_concurrency")))
+        with self._lock:
+            if limit != self._limit:
+                self._limit = limit
+                self._slots = threading.Semaphore(limit)
+                self._async_slots = {}
+        return limit
+
+    def _async_slot(self) -> asyncio.Semaphore:
+        """Concurrency slots for the running event loop."""
+        limit = self._apply_limit()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.get(loop)
+            if slots is None:
+                slots = self._async_slots[loop] = asyncio.Semaphore(limit)
+            return slots
+
+    def _plan(self, duration: float) -> tuple[float, bool]:
+        """Draw this request's latency (seconds) and whether it fails."""
+        jitter_ms = get_setting("simulated_jitter_ms")
+        with self._lock:
+            jitter = self._random.expovariate(1 / jitter_ms) if jitter_ms > 0 else 0
+            fail = self._random.random() < get_setting("simulated_error_rate")
+        latency_ms = (
+            get_setting("simulated_latency_ms")
+            + get_setting("simulated_latency_per_audio_s_ms") * duration
+            + jitter
+        )
+        return latency_ms / 1000, fail
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _exit(self, failed: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.errors += 1
+
+    @staticmethod
+    def canned_text(audio_data: bytes, duration: float) -> str:
+        """Deterministic text for a clip: same audio, same transcript."""
+        digest = hashlib.sha256(audio_data).digest()
+        start = int.from_bytes(digest[:4], "big") % len(_WORDS)
+        count = max(1, round(duration * WORDS_PER_SECOND))
+        words = [_WORDS[(start + i) % len(_WORDS)] for i in range(count)]
+        return " ".join(words).capitalize() + "."
+
+    def _build_result(
+        self,
+        audio_data: bytes,
+        language: str | None,
+        duration: float,
+        total_start: float,
+    ) -> dict:
+        """Post-process the canned text like a cloud response."""
+        full_text = self.canned_text(audio_data, duration)
+
+        # Track vocabulary usage (pure match detection, no rewrite)
+        matched = vocabulary.find_matches(full_text, self.vocabulary)
+        if matched:
+            vocabulary.get_manager().record_usage(matched)
+
+        # Apply word replacements (if enabled)
+        if get_setting("replacements_enabled"):
+            full_text = replacements.get_manager().apply_replacements(full_text)
+
+        # Filter profanity (if enabled)
+        if get_setting("content_filter"):
+            full_text = get_filter().filter(full_text)
+
+        total_time = time.time() - total_start
+        print(f"  [Timing] simulated={total_time * 1000:.0f}ms | audio={duration:.1f}s")
+
+        return {
+            "text": full_text,
+            "language": language or "en",
+            "language_probability": 1.0,
+            "duration": duration,
+            "processing_time": total_time,
+            "provider": "simulated",
+        }
+
+    def transcribe(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Simulate a transcription (blocks for the drawn latency).
+
+        Args:
+            audio_data: Raw audio bytes (WAV format)
+            language: Language code (fr, en, etc.) or None for auto-detect
+            max_vocab_words: Accepted for interface parity, unused
+
+        Returns:
+            Dict with 'text', 'language', 'duration', 'processing_time'
+        """
+        duration = max(0, (len(audio_data) - 44) / (16000 * 2))
+        self._apply_limit()
+        with self._slots:
+            total_start = time.time()  # Queueing for a slot isn't service time
+            delay, fail = self._plan(duration)
+            self._enter()
+            try:
+                time.sleep(delay)
+            finally:
+                self._exit(fail)
+        if fail:
+            raise SimulatedProviderError("Simulated provider error (injected)")
+        return self._build_result(audio_data, language, duration, total_start)
+
+    async def transcribe_async(
+        self,
+        audio_data: bytes,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> dict:
+        """Async transcribe(): sleeps on the event loop."""
+        duration = max(0, (len(audio_data) - 44) / (16000 * 2))
+        async with self._async_slot():
+            total_start = time.time()  # Queueing for a slot isn't service time
+            delay, fail = self._plan(duration)
+            self._enter()
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._exit(fail)
+        if fail:
+            raise SimulatedProviderError("Simulated provider error (injected)")
+        return await asyncio.to_thread(
+            self._build_result, audio_data, language, duration, total_start
+        )
+
+    async def prewarm(self) -> None:
+        """Nothing to warm up."""
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "max_concurrency": self._limit or None,
+            }
+
+
+# Singleton instance
+_simulated_stt: SimulatedSTT | None = None
+
+
+def get_simulated_stt() -> SimulatedSTT:
+    """Get or create the simulated STT singleton."""
+    global _simulated_stt
+    if _simulated_stt is None:
+        _simulated_stt = SimulatedSTT()
+    return _simulated_stt
+
+
+def is_simulated_available() -> bool:
+    """The simulated provider needs no key or hardware."""
+    return True
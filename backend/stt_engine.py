@@ -1,11 +1,13 @@
 """Speech-to-text engine using lightning-whisper-mlx for Apple Silicon."""
 
-import gc
-import tempfile
+import asyncio
+import math
 import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar, Optional
 
 # Lazy imports for MLX - only loaded when local transcription is used
 # This saves ~2GB memory when using cloud providers (Groq/OpenAI)
@@ -14,13 +16,29 @@ if TYPE_CHECKING:
 
 import replacements
 import vocabulary
+from auto_router import get_auto_router
+from circuit_breaker import PROBE_SECONDS, CircuitBreaker, probe_clip
 from content_filter import get_filter
-from settings import get_setting, get_stt_provider
+from local_scheduler import LocalBatchScheduler, LocalRequest
+from rate_limit import (
+    ProviderLimiter,
+    RateLimitedError,
+    error_headers,
+    get_rate_limiter,
+    is_rate_limit_error,
+)
+from settings import get_setting, get_stt_provider, settings_snapshot
 
 
 class STTEngine:
     """Wrapper for lightning-whisper-mlx model."""
 
+    # Accepted audio inputs; Whisper is handed a float32 array (no temp file/ffmpeg)
+    CAPABILITIES: ClassVar[dict] = {
+        "input_forms": ("wav_bytes", "int16_array", "float32_array"),
+        "backend_input": "float32_array",
+    }
+
     def __init__(
         self,
         model_size: str = "large-v3",
@@ -75,23 +93,20 @@ class STTEngine:
 
     def _warmup_inference(self) -> None:
         """Run a dummy inference to warm up GPU kernels and caches."""
-        import wave
+        import numpy as np
+        from lightning_whisper_mlx.transcribe import transcribe_audio
 
-        # Create a minimal valid WAV file (0.1s of silence)
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            with wave.open(f.name, "wb") as wav:
-                wav.setnchannels(1)
-                wav.setsampwidth(2)
-                wav.setframerate(16000)
-                wav.writeframes(b"\x00" * 3200)  # 0.1s of silence
-            temp_path = f.name
+        # 0.1s of silence, passed as an array (no WAV file or ffmpeg decode)
+        silence = np.zeros(1600, dtype=np.float32)
 
         try:
-            self.model.transcribe(audio_path=temp_path)
+            transcribe_audio(
+                audio=silence,
+                path_or_hf_repo=self._model_path,
+                batch_size=self.batch_size,
+            )
         except Exception:
             pass  # Ignore errors on warmup
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
 
     def set_vocabulary(self, words: list[str]) -> None:
         """Set custom vocabulary for biasing transcription."""
@@ -111,6 +126,21 @@ class STTEngine:
         words = self.vocabulary[:max_words] if max_words > 0 else self.vocabulary
         return f"Vocabulary: {', '.join(words)}. "
 
+    def _postprocess(self, text: str) -> str:
+        """Record vocabulary usage, then apply replacements and the content filter."""
+        full_text = text.strip()
+        # Track vocabulary usage (pure match detection, no rewrite)
+        matched = vocabulary.find_matches(full_text, self.vocabulary)
+        if matched:
+            vocabulary.get_manager().record_usage(matched)
+        # Apply word replacements (if enabled)
+        if get_setting("replacements_enabled"):
+            full_text = replacements.get_manager().apply_replacements(full_text)
+        # Filter likely misrecognized profanity (if enabled)
+        if get_setting("content_filter"):
+            full_text = get_filter().filter(full_text)
+        return full_text
+
     def transcribe(
         self,
         audio_data: bytes,
@@ -120,7 +150,8 @@ class STTEngine:
         """Transcribe audio data to text.
 
         Args:
-            audio_data: Raw audio bytes (WAV format)
+            audio_data: Raw audio bytes (WAV format), or a 16kHz int16/float32
+                sample array
             language: Language code (fr, en, etc.) or None for auto-detect
             max_vocab_words: Max vocabulary words in prompt (0 = no limit)
 
@@ -130,6 +161,8 @@ class STTEngine:
         # Lazy import MLX transcribe function
         from lightning_whisper_mlx.transcribe import transcribe_audio
 
+        from audio_utils import SAMPLE_RATE, as_float32_samples
+
         # Lazy load model on first use
         if self.model is None or self._model_path is None:
             print("  [STTEngine] Lazy loading model (first local transcription)...")
@@ -141,91 +174,144 @@ class STTEngine:
         lang_mode = language.upper() if language else "AUTO-DETECT"
         print(f"  [STTEngine] transcribe() called with language={lang_mode}")
 
-        # --- Timing: Write audio to temp file ---
+        # --- Timing: Decode to float32 array (Whisper's input format) ---
         prep_start = time.time()
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio_data)
-            temp_path = f.name
+        audio_array = as_float32_samples(audio_data)
         prep_time = (time.time() - prep_start) * 1000  # ms
 
-        try:
-            # --- Timing: Model inference ---
-            inference_start = time.time()
+        # --- Timing: Model inference ---
+        inference_start = time.time()
 
-            # Build initial_prompt from vocabulary for better recognition
-            initial_prompt = self._build_initial_prompt(
-                language, max_words=max_vocab_words
-            )
-            if initial_prompt:
-                print(f"  [STTEngine] Using initial_prompt: {initial_prompt[:50]}...")
+        # Build initial_prompt from vocabulary for better recognition
+        initial_prompt = self._build_initial_prompt(language, max_words=max_vocab_words)
+        if initial_prompt:
+            print(f"  [STTEngine] Using initial_prompt: {initial_prompt[:50]}...")
 
-            # Use transcribe_audio directly to support initial_prompt
-            result = transcribe_audio(
-                audio=temp_path,
-                path_or_hf_repo=self._model_path,
-                language=language,
-                batch_size=self.batch_size,
-                initial_prompt=initial_prompt if initial_prompt else None,
-            )
-            inference_time = (time.time() - inference_start) * 1000  # ms
-
-            full_text = result.get("text", "").strip()
-            # Track vocabulary usage (pure match detection, no rewrite)
-            matched = vocabulary.find_matches(full_text, self.vocabulary)
-            if matched:
-                vocabulary.get_manager().record_usage(matched)
-            # Apply word replacements (if enabled)
-            if get_setting("replacements_enabled"):
-                full_text = replacements.get_manager().apply_replacements(full_text)
-            # Filter likely misrecognized profanity (if enabled)
-            if get_setting("content_filter"):
-                full_text = get_filter().filter(full_text)
-            detected_language = result.get("language", language or "unknown")
-
-            # Calculate audio duration from segments
-            segments = result.get("segments", [])
-            # Debug: print actual segment structure
-            if segments:
-                print(f"  [Debug] Last segment: {segments[-1]}")
-            duration = 0
-            if segments:
-                last_segment = segments[-1]
-                if isinstance(last_segment, dict):
-                    duration = last_segment.get("end", 0)
-                elif isinstance(last_segment, (list, tuple)):
-                    # Format is [start, end, text] - end is at index 1
-                    duration = float(last_segment[1]) if len(last_segment) > 1 else 0
-
-            if duration == 0:
-                # Fallback: estimate from WAV size (16-bit mono 16kHz)
-                duration = max(0, (len(audio_data) - 44) / (16000 * 2))
-
-            total_time = time.time() - total_start
-
-            # Detailed timing log
-            print(
-                f"  [Timing] prep={prep_time:.0f}ms | inference={inference_time:.0f}ms | "
-                f"total={total_time * 1000:.0f}ms | audio={duration:.1f}s"
-            )
+        # Use transcribe_audio directly to support initial_prompt
+        result = transcribe_audio(
+            audio=audio_array,
+            path_or_hf_repo=self._model_path,
+            language=language,
+            batch_size=self.batch_size,
+            initial_prompt=initial_prompt if initial_prompt else None,
+        )
+        inference_time = (time.time() - inference_start) * 1000  # ms
+
+        full_text = self._postprocess(result.get("text", ""))
+        detected_language = result.get("language", language or "unknown")
+
+        # Calculate audio duration from segments
+        segments = result.get("segments", [])
+        # Debug: print actual segment structure
+        if segments:
+            print(f"  [Debug] Last segment: {segments[-1]}")
+        duration = 0
+        if segments:
+            last_segment = segments[-1]
+            if isinstance(last_segment, dict):
+                duration = last_segment.get("end", 0)
+            elif isinstance(last_segment, (list, tuple)):
+                # Format is [start, end, text] - end is at index 1
+                duration = float(last_segment[1]) if len(last_segment) > 1 else 0
+
+        if duration == 0:
+            # Fallback: length of the 16kHz input
+            duration = len(audio_array) / SAMPLE_RATE
+
+        total_time = time.time() - total_start
+
+        # Detailed timing log
+        print(
+            f"  [Timing] prep={prep_time:.0f}ms | inference={inference_time:.0f}ms | "
+            f"total={total_time * 1000:.0f}ms | audio={duration:.1f}s"
+        )
 
-            return {
-                "text": full_text,
-                "language": detected_language,
-                "language_probability": 1.0,  # MLX doesn't provide this
-                "duration": duration,
-                "processing_time": total_time,
-            }
+        return {
+            "text": full_text,
+            "language": detected_language,
+            "language_probability": 1.0,  # MLX doesn't provide this
+            "duration": duration,
+            "processing_time": total_time,
+        }
 
-        finally:
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
+    def transcribe_batch(
+        self,
+        audios: list,
+        language: str | None = None,
+        max_vocab_words: int = 0,
+    ) -> list[dict]:
+        """Transcribe several clips (each at most 30s) in one batched decode.
+
+        Every clip becomes one padded 30s mel window; the windows are stacked
+        and decoded together with a shared vocabulary prompt. Clips whose
+        decode looks unreliable are re-run through transcribe(), which has
+        the temperature fallback.
+
+        Args:
+            audios: WAV bytes or 16kHz sample arrays, one per request
+            language: Language code shared by the batch, or None (detected
+                per clip)
+            max_vocab_words: Max vocabulary words in prompt (0 = no limit)
+
+        Returns:
+            One transcribe()-style dict per clip, in order
+        """
+        import mlx.core as mx
+        from lightning_whisper_mlx.audio import (
+            N_FRAMES,
+            N_SAMPLES,
+            log_mel_spectrogram,
+            pad_or_trim,
+        )
+        from lightning_whisper_mlx.decoding import DecodingOptions
+        from lightning_whisper_mlx.transcribe import ModelHolder
+
+        from audio_utils import SAMPLE_RATE, as_float32_samples
 
-            # Release MLX/Metal memory to prevent accumulation over long sessions
-            # Without this, memory grows ~10-15GB over a day of use
-            import mlx.core as mx
+        if self.model is None or self._model_path is None:
+            print("  [STTEngine] Lazy loading model (first local transcription)...")
+            self.load_model()
 
-            mx.clear_cache()
-            gc.collect()
+        total_start = time.time()
+        model = ModelHolder.get_model(self._model_path, mx.float16)
+        arrays = [as_float32_samples(audio) for audio in audios]
+        mels = [
+            pad_or_trim(
+                log_mel_spectrogram(array, n_mels=model.dims.n_mels, padding=N_SAMPLES),
+                N_FRAMES,
+                axis=-2,
+            ).astype(mx.float16)
+            for array in arrays
+        ]
+        initial_prompt = self._build_initial_prompt(language, max_words=max_vocab_words)
+        options = DecodingOptions(
+            language=language,
+            prompt=initial_prompt or None,
+            without_timestamps=True,
+        )
+        decoded = model.decode(mx.stack(mels), options)
+        batch_time = time.time() - total_start
+        print(f"  [Timing] batch of {len(arrays)}: inference={batch_time * 1000:.0f}ms")
+
+        results = []
+        for array, audio, res in zip(arrays, audios, decoded, strict=True):
+            # Same thresholds as transcribe_audio's fallback
+            if (
+                res.compression_ratio > 2.4 or res.avg_logprob < -1.0
+            ) and res.no_speech_prob <= 0.6:
+                results.append(self.transcribe(audio, language, max_vocab_words))
+                continue
+            results.append(
+                {
+                    "text": self._postprocess(res.text),
+                    "language": res.language or language or "unknown",
+                    "language_probability": 1.0,
+                    "duration": len(array) / SAMPLE_RATE,
+                    "processing_time": time.time() - total_start,
+                    "batch_size": len(arrays),
+                }
+            )
+        return results
 
 
 # Singleton instance
@@ -240,6 +326,132 @@ def get_engine() -> STTEngine:
     return _engine
 
 
+def _run_local_batch(requests: list[LocalRequest]) -> list:
+    """Run a scheduler batch on the local engine (on the worker thread).
+
+    Whisper decodes the batch in one call. mlx-vlm cannot batch audio
+    prompts, so Gemma 4 requests run back to back. MLX memory is released
+    by the memory policy (high-water mark or idle), not after every batch.
+    Gemma batches don't count as skipped releases: mlx-vlm clears the MLX
+    cache after every generation regardless.
+    """
+    from gemma4_stt import is_gemma4_available
+    from memory_policy import get_memory_policy
+
+    try:
+        return _run_local_engine(requests)
+    finally:
+        get_memory_policy().after_request(count_skip=not is_gemma4_available())
+
+
+def _run_local_engine(requests: list[LocalRequest]) -> list:
+    from gemma4_stt import is_gemma4_available
+
+    if is_gemma4_available():
+        results = []
+        for r in requests:
+            try:
+                results.append(
+                    _transcribe_local_tiered(
+                        r.audio_data,
+                        r.language,
+                        r.max_vocab_words,
+                        r.duration,
+                        r.on_partial,
+                    )
+                )
+            except Exception as e:
+                results.append(e)
+        return results
+
+    engine = get_engine()
+    if len(requests) == 1:
+        r = requests[0]
+        return [
+            engine.transcribe(
+                r.audio_data, r.language, max_vocab_words=r.max_vocab_words
+            )
+        ]
+    first = requests[0]
+    return engine.transcribe_batch(
+        [r.audio_data for r in requests], first.language, first.max_vocab_words
+    )
+
+
+# Singleton instance
+_local_scheduler: LocalBatchScheduler | None = None
+
+
+def get_local_scheduler() -> LocalBatchScheduler:
+    """Get or create the local batch scheduler (window/size follow settings)."""
+    global _local_scheduler
+    from memory_policy import get_memory_policy
+
+    if _local_scheduler is None:
+        _local_scheduler = LocalBatchScheduler(
+            _run_local_batch, on_idle=lambda: get_memory_policy().on_idle()
+        )
+    _local_scheduler.idle_seconds = get_setting("memory_release_idle_s")
+    _local_scheduler.window = get_setting("local_batch_window_ms") / 1000
+    _local_scheduler.max_batch_size = int(get_setting("local_batch_max_size"))
+    return _local_scheduler
+
+
+# Clips shorter than this get the short-clip language override / vocab limit
+SHORT_CLIP_SECONDS = 3.0
+
+
+def _short_clip_limits(language: str | None) -> tuple[str | None, str | None, int]:
+    """(language, language_override, max_vocab_words) for a short clip."""
+    override = get_setting("short_clip_language_override") if language is None else None
+    limit = get_setting("short_clip_vocab_limit")
+    max_vocab_words = int(limit) if limit and limit > 0 else 0
+    return override or language, override or None, max_vocab_words
+
+
+def prewarm_local(language: str | None) -> None:
+    """Queue a local model load + prompt build on the worker (non-blocking)."""
+
+    def task() -> None:
+        from gemma4_stt import get_gemma4_stt, is_gemma4_available
+
+        if not is_gemma4_available():
+            engine = get_engine()
+            if engine.model is None:
+                engine.load_model()
+            return
+        # Clip length is unknown until release: warm the prompt a normal clip
+        # uses and the one a short clip uses (language override / vocab
+        # limit), on the fast tier too if enabled
+        tiers = ["e2b", "e4b"] if get_setting("local_fast_path") else ["e4b"]
+        short_language, _, short_max_words = _short_clip_limits(language)
+        prompts = dict.fromkeys([(language, 0), (short_language, short_max_words)])
+        for tier in tiers:
+            for prompt_language, max_words in prompts:
+                get_gemma4_stt(tier).prepare(prompt_language, max_words)
+
+    get_local_scheduler().prewarm(task)
+
+
+def get_provider_capabilities() -> dict[str, dict]:
+    """Capability metadata per provider (e.g. which audio input forms it accepts)."""
+    from gemini_stt import GeminiSTT
+    from gemma4_stt import Gemma4STT, is_gemma4_available
+    from groq_stt import GroqSTT
+    from openai_stt import OpenAISTT
+    from simulated_stt import SimulatedSTT
+
+    return {
+        "local": (
+            Gemma4STT.CAPABILITIES if is_gemma4_available() else STTEngine.CAPABILITIES
+        ),
+        "openai": OpenAISTT.CAPABILITIES,
+        "groq": GroqSTT.CAPABILITIES,
+        "gemini": GeminiSTT.CAPABILITIES,
+        "simulated": SimulatedSTT.CAPABILITIES,
+    }
+
+
 def _save_debug_audio(
     audio_data: bytes,
     suffix: str,
@@ -298,22 +510,631 @@ def _save_debug_metadata(
         print(f"  [Debug] Failed to save metadata: {e}")
 
 
+# Cloud providers considered as hedge targets (ties broken in this order)
+CLOUD_PROVIDERS = ("groq", "gemini", "openai")
+CLOUD_LABELS = {
+    "groq": "Groq Whisper API",
+    "openai": "OpenAI Whisper API",
+    "gemini": "Gemini API",
+    "simulated": "Simulated provider",
+}
+
+
+def _cloud_stt(provider: str):
+    """The provider's client singleton, or None if its API key is missing."""
+    if provider == "groq":
+        from groq_stt import get_groq_stt, is_groq_available
+
+        return get_groq_stt() if is_groq_available() else None
+    if provider == "openai":
+        from openai_stt import get_openai_stt, is_openai_available
+
+        return get_openai_stt() if is_openai_available() else None
+    if provider == "gemini":
+        from gemini_stt import get_gemini_stt, is_gemini_available
+
+        return get_gemini_stt() if is_gemini_available() else None
+    if provider == "simulated":
+        from simulated_stt import get_simulated_stt
+
+        return get_simulated_stt()
+    return None
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """The provider's circuit breaker, with thresholds from current settings."""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = _breakers.setdefault(
+            provider,
+            CircuitBreaker(provider, probe=lambda: _probe_provider(provider)),
+        )
+    breaker.failure_threshold = int(get_setting("breaker_failure_threshold"))
+    breaker.reset_timeout = float(get_setting("breaker_reset_s"))
+    return breaker
+
+
+def _probe_provider(provider: str) -> None:
+    """Half-open probe: transcribe a tiny synthetic clip (raises on failure).
+
+    The probe is a real request, so it reserves rate limit budget like one.
+    """
+    stt = _cloud_stt(provider)
+    if stt is None:
+        raise RuntimeError(f"{provider} API key not available")
+    wait = _rate_limiter(provider).reserve(
+        PROBE_SECONDS, max_wait=get_setting("rate_limit_max_wait_s")
+    )
+    if wait is None:
+        raise RateLimitedError(f"{provider} rate limited, probe not sent")
+    time.sleep(wait)
+    stt.transcribe(probe_clip(), "en")
+
+
+def breaker_states() -> dict[str, dict]:
+    """Circuit breaker state of every cloud provider."""
+    return {name: get_breaker(name).snapshot() for name in CLOUD_PROVIDERS}
+
+
+# Settings holding each provider's quotas: (requests/minute, audio seconds/hour);
+# providers without an entry are never limited
+RATE_LIMIT_SETTINGS = {
+    "groq": ("groq_requests_per_minute", "groq_audio_seconds_per_hour"),
+    "openai": ("openai_requests_per_minute", None),
+    "gemini": ("gemini_requests_per_minute", None),
+}
+
+
+def _rate_limiter(provider: str) -> ProviderLimiter:
+    """The provider's rate limiter, with quotas from current settings."""
+    limiter = get_rate_limiter(provider)
+    rpm_key, ash_key = RATE_LIMIT_SETTINGS.get(provider, (None, None))
+    if rpm_key and get_setting("rate_limit_enabled"):
+        limiter.configure(get_setting(rpm_key), get_setting(ash_key) if ash_key else 0)
+    else:
+        limiter.configure(0, 0)
+    return limiter
+
+
+def rate_limit_states() -> dict[str, dict]:
+    """Rate limiter state of every cloud provider."""
+    return {name: _rate_limiter(name).stats() for name in CLOUD_PROVIDERS}
+
+
+def _request_count(audio_duration: float) -> int:
+    """Provider requests one transcription costs (one per chunk when chunked)."""
+    chunk_target = get_setting("chunk_target_duration")
+    if get_setting("chunked_transcription") and audio_duration > chunk_target:
+        return math.ceil(audio_duration / chunk_target)
+    return 1
+
+
+def _provider_chain(provider: str) -> list[str]:
+    """The selected provider followed by the configured fallback order.
+
+    A cloud provider without an API key always ends in local, as if the
+    user had selected local; transient errors only fail over when
+    fallback_order opts in. The simulated provider never fails over, so its
+    injected errors reach the caller.
+    """
+    chain = [provider]
+    if provider == "simulated":
+        return chain
+    for name in get_setting("fallback_order").split(","):
+        name = name.strip().lower()
+        if name in (*CLOUD_PROVIDERS, "local") and name not in chain:
+            chain.append(name)
+    if (
+        provider in CLOUD_PROVIDERS
+        and "local" not in chain
+        and _cloud_stt(provider) is None
+    ):
+        chain.append("local")
+    return chain
+
+
+def _record_cloud(
+    provider: str,
+    audio_duration: float,
+    language: str | None,
+    latency: float,
+    error: Exception | None = None,
+) -> None:
+    """Feed one cloud request into latency stats, auto routing and its breaker.
+
+    A 429 backs the provider's rate limiter off instead of counting as a
+    breaker failure: the provider is healthy, just over quota.
+    """
+    from provider_stats import get_latency_stats
+
+    ok = error is None
+    get_latency_stats().record(provider, latency, audio_duration, ok)
+    get_auto_router().observe(provider, audio_duration, language, latency, ok)
+    if provider == "simulated":
+        return  # Injected errors must not open a breaker
+    if ok:
+        get_breaker(provider).record_success()
+    elif is_rate_limit_error(error):
+        _rate_limiter(provider).on_rate_limited(error_headers(error))
+    else:
+        get_breaker(provider).record_failure(error)
+
+
+def _call_cloud(
+    provider: str,
+    stt,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+) -> dict:
+    """Send audio to one cloud provider (chunked for long recordings).
+
+    Latency is recorded per provider; it drives the hedge delay. Success
+    and failure also feed the provider's circuit breaker.
+    """
+    start = time.perf_counter()
+    try:
+        chunk_target = get_setting("chunk_target_duration")
+        if get_setting("chunked_transcription") and audio_duration > chunk_target:
+            from chunking import transcribe_chunked
+
+            result = transcribe_chunked(
+                stt,
+                audio_data,
+                language,
+                max_vocab_words=max_vocab_words,
+                target_duration=chunk_target,
+                max_concurrency=int(get_setting("chunk_max_concurrency")),
+            )
+        else:
+            result = stt.transcribe(
+                audio_data, language, max_vocab_words=max_vocab_words
+            )
+    except Exception as e:
+        _record_cloud(
+            provider, audio_duration, language, time.perf_counter() - start, e
+        )
+        raise
+    _record_cloud(provider, audio_duration, language, time.perf_counter() - start)
+    return result
+
+
+def _auto_candidates() -> list[str]:
+    """Providers `auto` may pick: reachable cloud providers, local if allowed."""
+    candidates = [
+        name
+        for name in CLOUD_PROVIDERS
+        if _cloud_stt(name) is not None and get_breaker(name).allow()
+    ]
+    if get_setting("auto_include_local") or not candidates:
+        candidates.append("local")
+    return candidates
+
+
+def _choose_auto_provider(audio_duration: float, language: str | None) -> str:
+    """Resolve the `auto` provider to the one expected to finish first."""
+    provider, reason = get_auto_router().choose(
+        _auto_candidates(), audio_duration, language
+    )
+    print(f"  [Router] auto -> {provider} ({reason})")
+    return provider
+
+
+def _hedge_target(provider: str, audio_duration: float) -> str | None:
+    """Fastest other available provider whose estimated cost fits the cap."""
+    from hedging import estimated_cost_cents, get_hedge_stats
+    from provider_stats import get_latency_stats
+
+    stats = get_latency_stats()
+    cap = get_setting("hedge_max_cost_cents")
+    candidates = [
+        name
+        for name in CLOUD_PROVIDERS
+        if name != provider
+        and _cloud_stt(name) is not None
+        and get_breaker(name).allow()
+        and _rate_limiter(name).peek(audio_duration) == 0
+    ]
+    affordable = [
+        name for name in candidates if estimated_cost_cents(name, audio_duration) <= cap
+    ]
+    if candidates and not affordable:
+        get_hedge_stats().count("skipped_cost")
+        return None
+    if not affordable:
+        return None
+    return min(
+        affordable,
+        key=lambda name: (
+            stats.percentile(name, 50, per_audio_second=True) or float("inf")
+        ),
+    )
+
+
+def _hedge_delay(provider: str, audio_duration: float) -> float:
+    """Seconds to wait for the primary: its p90 latency for a clip this long."""
+    from hedging import DEFAULT_HEDGE_DELAY, MIN_HEDGE_DELAY, MIN_SAMPLES_FOR_P90
+    from provider_stats import get_latency_stats
+
+    p90_per_second = get_latency_stats().percentile(
+        provider, 90, min_samples=MIN_SAMPLES_FOR_P90, per_audio_second=True
+    )
+    if p90_per_second is None:
+        return DEFAULT_HEDGE_DELAY
+    return max(MIN_HEDGE_DELAY, p90_per_second * audio_duration)
+
+
+def _call_hedge(
+    provider: str,
+    stt,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+) -> dict:
+    """_call_cloud() for a hedge: reserves rate limit budget, never queues."""
+    _reserve_hedge(provider, audio_duration)
+    return _call_cloud(
+        provider, stt, audio_data, language, max_vocab_words, audio_duration
+    )
+
+
+async def _call_hedge_async(
+    provider: str,
+    stt,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+) -> dict:
+    """Async _call_hedge()."""
+    _reserve_hedge(provider, audio_duration)
+    return await _call_cloud_async(
+        provider, stt, audio_data, language, max_vocab_words, audio_duration
+    )
+
+
+def _reserve_hedge(provider: str, audio_duration: float) -> None:
+    """Take rate limit budget for a hedge, or raise if none is free now."""
+    wait = _rate_limiter(provider).reserve(
+        audio_duration, _request_count(audio_duration), max_wait=0
+    )
+    if wait is None:
+        raise RateLimitedError(f"{provider} rate limited, hedge not sent")
+
+
+def _transcribe_cloud(
+    provider: str,
+    stt,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+) -> dict:
+    """Send audio to a cloud provider, hedging to a second one if enabled."""
+    args = (audio_data, language, max_vocab_words, audio_duration)
+    if get_setting("hedged_requests"):
+        secondary = _hedge_target(provider, audio_duration)
+        if secondary:
+            from hedging import get_hedge_stats, transcribe_hedged
+
+            secondary_stt = _cloud_stt(secondary)
+            return transcribe_hedged(
+                (provider, lambda: _call_cloud(provider, stt, *args)),
+                (secondary, lambda: _call_hedge(secondary, secondary_stt, *args)),
+                delay=_hedge_delay(provider, audio_duration),
+                stats=get_hedge_stats(),
+            )
+    return _call_cloud(provider, stt, *args)
+
+
+async def _transcribe_cloud_async(
+    provider: str,
+    stt,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+) -> dict:
+    """Async _transcribe_cloud(): awaits the providers' async clients.
+
+    Chunked requests fan out on threads, so they keep using the synchronous
+    path (in a worker thread).
+    """
+    args = (audio_data, language, max_vocab_words, audio_duration)
+    chunked = get_setting("chunked_transcription") and audio_duration > get_setting(
+        "chunk_target_duration"
+    )
+    if chunked:
+        return await asyncio.to_thread(_transcribe_cloud, provider, stt, *args)
+    if get_setting("hedged_requests"):
+        secondary = _hedge_target(provider, audio_duration)
+        if secondary:
+            from hedging import get_hedge_stats, transcribe_hedged_async
+
+            secondary_stt = _cloud_stt(secondary)
+            return await transcribe_hedged_async(
+                (provider, lambda: _call_cloud_async(provider, stt, *args)),
+                (
+                    secondary,
+                    lambda: _call_hedge_async(secondary, secondary_stt, *args),
+                ),
+                delay=_hedge_delay(provider, audio_duration),
+                stats=get_hedge_stats(),
+            )
+    return await _call_cloud_async(provider, stt, *args)
+
+
+async def _call_cloud_async(
+    provider: str,
+    stt,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+) -> dict:
+    """Async _call_cloud() for an unchunked request.
+
+    A cancelled request (a hedge loser) records nothing.
+    """
+    start = time.perf_counter()
+    try:
+        result = await stt.transcribe_async(
+            audio_data, language, max_vocab_words=max_vocab_words
+        )
+    except Exception as e:
+        _record_cloud(
+            provider, audio_duration, language, time.perf_counter() - start, e
+        )
+        raise
+    _record_cloud(provider, audio_duration, language, time.perf_counter() - start)
+    return result
+
+
+# E2B output longer than this (characters per audio second) is treated as
+# hallucinated; fast speech is ~15-20 chars/s in English
+MAX_CHARS_PER_SECOND = 40
+
+
+def _local_tier(audio_duration: float) -> str:
+    """Pick the Gemma 4 tier: E2B for short clips when the fast path is on."""
+    if get_setting("local_fast_path") and 0 < audio_duration < get_setting(
+        "local_fast_path_max_duration"
+    ):
+        return "e2b"
+    return "e4b"
+
+
+def _degenerate_reason(result: dict, audio_duration: float) -> str | None:
+    """Why a fast-path result looks unreliable, or None if it looks fine."""
+    stop_reason = result.get("stop_reason")
+    if stop_reason in ("repetition", "max_tokens"):
+        return stop_reason
+    text = result.get("text", "")
+    if not text and audio_duration >= 1.0:
+        return "empty output"
+    if audio_duration > 0 and len(text) / audio_duration > MAX_CHARS_PER_SECOND:
+        return f"{len(text) / audio_duration:.0f} chars/s"
+    return None
+
+
+def _run_local_tier(
+    tier: str,
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+    on_partial: Callable[[str], None] | None,
+) -> dict:
+    """Transcribe on one Gemma 4 tier and record its latency."""
+    from gemma4_stt import get_gemma4_stt
+    from provider_stats import get_latency_stats
+
+    stats = get_latency_stats()
+    start = time.perf_counter()
+    try:
+        result = get_gemma4_stt(tier).transcribe(
+            audio_data,
+            language,
+            max_vocab_words=max_vocab_words,
+            on_partial=on_partial,
+        )
+    except Exception:
+        stats.record(
+            f"local:{tier}", time.perf_counter() - start, audio_duration, False
+        )
+        raise
+    stats.record(f"local:{tier}", time.perf_counter() - start, audio_duration)
+    return result
+
+
+def _transcribe_local_tiered(
+    audio_data: bytes,
+    language: str | None,
+    max_vocab_words: int,
+    audio_duration: float,
+    on_partial: Callable[[str], None] | None = None,
+) -> dict:
+    """Route to Gemma 4 E2B (short clips) or E4B, escalating bad E2B output."""
+    tier = _local_tier(audio_duration)
+    print(f"  [Router] Using local Gemma 4 {tier.upper()} (MLX)")
+    result = _run_local_tier(
+        tier, audio_data, language, max_vocab_words, audio_duration, on_partial
+    )
+    result["model_tier"] = tier
+
+    if tier == "e2b" and get_setting("local_fast_path_escalate"):
+        reason = _degenerate_reason(result, audio_duration)
+        if reason:
+            print(
+                f"  [Router] E2B output looks degenerate ({reason}), escalating to E4B"
+            )
+            result = _run_local_tier(
+                "e4b", audio_data, language, max_vocab_words, audio_duration, on_partial
+            )
+            result["model_tier"] = "e4b"
+            result["escalated_from"] = "e2b"
+
+    return result
+
+
+def _result_cache_key(
+    audio_data: bytes, language: str | None, provider: str | None = None
+) -> str:
+    """Cache key: PCM hash plus every setting that changes the transcription."""
+    from audio_utils import _find_wav_data_offset
+    from result_cache import make_key
+
+    pcm = memoryview(audio_data)[_find_wav_data_offset(audio_data) :]
+    return make_key(
+        pcm,
+        provider or get_stt_provider(),
+        language or "auto",
+        vocabulary.get_manager().version,
+        replacements.get_manager().version,
+        get_setting("replacements_enabled"),
+        get_setting("content_filter"),
+        get_setting("short_clip_language_override"),
+        get_setting("short_clip_vocab_limit"),
+        get_setting("local_fast_path"),
+        get_setting("local_fast_path_max_duration"),
+    )
+
+
+def _mark_cached(result: dict, status: str, start_time: float) -> dict:
+    """Flag a cache hit / coalesced result and log the cache counters."""
+    from result_cache import get_result_cache
+
+    result["cached"] = True
+    result["processing_time"] = time.time() - start_time
+    stats = get_result_cache().stats()
+    print(
+        f"  [Cache] {status.capitalize()} ({stats['hits']} hits, "
+        f"{stats['misses']} misses, {stats['entries']} entries)"
+    )
+    return result
+
+
 def transcribe_audio_with_provider(
     audio_data: bytes,
     language: str | None = None,
+    on_partial: Callable[[str], None] | None = None,
+    provider: str | None = None,
 ) -> dict:
-    """Transcribe audio using the configured provider (local, OpenAI, or Groq).
+    """Transcribe audio, reusing the cached result for identical requests.
 
-    This is the main entry point for transcription that:
-    1. Preprocesses audio (normalize volume, check threshold)
-    2. Routes to the appropriate backend based on settings
+    Retries and re-submits of the same audio (same provider, language,
+    vocabulary and replacements) are served from the result cache; concurrent
+    identical requests share a single inference.
 
     Args:
         audio_data: Raw audio bytes (WAV format)
         language: Language code (fr, en, etc.) or None for auto-detect
+        on_partial: Called with the text so far while a streaming provider
+            (local Gemma 4) generates; never called for cache hits
+        provider: Provider to use instead of the stt_provider setting (the
+            fallback order still applies)
 
     Returns:
         Dict with 'text', 'language', 'duration', 'processing_time', 'provider'
+        ('cached': True when served from the cache)
+    """
+    with settings_snapshot():
+        if not get_setting("result_cache_enabled"):
+            return _transcribe_uncached(audio_data, language, on_partial, provider)
+
+        from result_cache import get_result_cache
+
+        start_time = time.time()
+        key = _result_cache_key(audio_data, language, provider)
+        result, status = get_result_cache().get_or_compute(
+            key,
+            lambda: _transcribe_uncached(audio_data, language, on_partial, provider),
+        )
+        if status != "miss":
+            _mark_cached(result, status, start_time)
+        return result
+
+
+async def transcribe_audio_async(
+    audio_data: bytes,
+    language: str | None = None,
+    on_partial: Callable[[str], None] | None = None,
+    provider: str | None = None,
+) -> dict:
+    """Async transcribe_audio_with_provider() for the server's event loop.
+
+    Cloud requests are awaited on the loop through the providers' async
+    clients (one shared connection pool) instead of holding an executor
+    thread for the whole network round trip. Preprocessing, the cache key
+    hash, post-processing, local inference, and hedged or chunked cloud
+    requests still run on threads, so one slow request doesn't stall the
+    loop. Settings are read once for the whole request.
+    """
+    with settings_snapshot():
+        if not get_setting("result_cache_enabled"):
+            return await _transcribe_uncached_async(
+                audio_data, language, on_partial, provider
+            )
+
+        from result_cache import get_result_cache
+
+        start_time = time.time()
+        key = await asyncio.to_thread(_result_cache_key, audio_data, language, provider)
+        result, status = await get_result_cache().get_or_compute_async(
+            key,
+            lambda: _transcribe_uncached_async(
+                audio_data, language, on_partial, provider
+            ),
+        )
+        if status != "miss":
+            _mark_cached(result, status, start_time)
+        return result
+
+
+@dataclass
+class _Job:
+    """A preprocessed request on its way through the provider chain."""
+
+    audio_data: bytes
+    language: str | None
+    language_override: str | None
+    max_vocab_words: int
+    audio_duration: float
+    provider: str  # Requested provider (`auto` already resolved)
+    chain: list[str]
+    preprocess_info: dict
+    audio_info: dict
+    timestamp: str
+    save_debug: bool
+    last_error: Exception | None = None
+
+    @property
+    def cloud_args(self) -> tuple:
+        return (
+            self.audio_data,
+            self.language,
+            self.max_vocab_words,
+            self.audio_duration,
+        )
+
+
+def _prepare(
+    audio_data: bytes, language: str | None, provider: str | None = None
+) -> tuple[_Job | None, dict | None]:
+    """Preprocess audio and resolve the provider chain.
+
+    This is the first half of transcription that:
+    1. Preprocesses audio (normalize volume, check threshold)
+    2. Applies short-clip language / vocabulary limits
+    3. Resolves the provider (and `auto`) into the fallback chain
+
+    Returns:
+        (job, None), or (None, result) when the audio is too quiet to transcribe
     """
     from audio_utils import preprocess_audio
 
@@ -332,7 +1153,7 @@ def transcribe_audio_with_provider(
     # padding degrade its transcription quality, unlike Whisper-based models).
     # Skip transforms whenever mlx-vlm is installed, since Gemma 4 could run
     # as primary local provider or as fallback when a cloud provider is unavailable.
-    provider = get_stt_provider()
+    provider = provider or get_stt_provider()
 
     from gemma4_stt import is_gemma4_available
 
@@ -367,7 +1188,7 @@ def transcribe_audio_with_provider(
     # Early return if audio too quiet
     if preprocess_info.get("skipped"):
         print("  [Audio] Audio too quiet, skipping transcription")
-        return {
+        return None, {
             "text": "",
             "language": language or "unknown",
             "language_probability": 0.0,
@@ -377,26 +1198,22 @@ def transcribe_audio_with_provider(
             "provider": "none",
         }
 
-    # Short clip language override: force a specific language for clips < 3s
+    # Short clip language override / vocab limit
     language_override = None
-    if language is None and audio_duration > 0 and audio_duration < 3.0:
-        override = get_setting("short_clip_language_override")
-        if override:
-            language_override = override
-            language = override
+    max_vocab_words = 0
+    if audio_duration > 0 and audio_duration < SHORT_CLIP_SECONDS:
+        language, language_override, max_vocab_words = _short_clip_limits(language)
+        if language_override:
             print(
-                f"  [Language] Short clip override: AUTO -> {override.upper()} "
-                f"({audio_duration:.1f}s < 3.0s)"
+                f"  [Language] Short clip override: AUTO -> "
+                f"{language_override.upper()} ({audio_duration:.1f}s < {SHORT_CLIP_SECONDS}s)"
             )
-
-    # Short clip vocab limit
-    max_vocab_words = 0
-    if audio_duration > 0 and audio_duration < 3.0:
-        limit = get_setting("short_clip_vocab_limit")
-        if limit and limit > 0:
-            max_vocab_words = int(limit)
+        if max_vocab_words:
             print(f"  [Vocab] Short clip limit: {max_vocab_words} words")
 
+    if provider == "auto":
+        provider = _choose_auto_provider(audio_duration, language)
+
     # Save final preprocessed audio (exact bytes sent to STT)
     if save_debug:
         lang_tag = language or "auto"
@@ -412,85 +1229,198 @@ def transcribe_audio_with_provider(
         "normalized": preprocess_info.get("normalized", False),
     }
 
-    result = None
+    job = _Job(
+        audio_data=audio_data,
+        language=language,
+        language_override=language_override,
+        max_vocab_words=max_vocab_words,
+        audio_duration=audio_duration,
+        provider=provider,
+        chain=_provider_chain(provider),
+        preprocess_info=preprocess_info,
+        audio_info=audio_info,
+        timestamp=timestamp,
+        save_debug=save_debug,
+    )
+    return job, None
 
-    if provider == "groq":
-        from groq_stt import get_groq_stt, is_groq_available
 
-        if not is_groq_available():
-            print("  [Warning] Groq API key not available, falling back to local")
-            provider = "local"
-        else:
-            print("  [Router] Using Groq Whisper API")
-            groq_stt = get_groq_stt()
-            result = groq_stt.transcribe(
-                audio_data, language, max_vocab_words=max_vocab_words
+def _cloud_attempts(job: _Job):
+    """Yield (name, client, wait) for each cloud provider worth trying, in order.
+
+    Providers without a key or with an open circuit are skipped. Each attempt
+    reserves rate limit budget first; the caller sleeps `wait` seconds before
+    sending. A provider that would need to wait longer than
+    rate_limit_max_wait_s is skipped (a RateLimitedError if nothing after it
+    answers). Stops when the chain reaches local; raises if it runs out
+    without reaching local.
+    """
+    for name in job.chain:
+        if name == "local":
+            return
+        stt = _cloud_stt(name)
+        if stt is None:
+            print(f"  [Warning] {CLOUD_LABELS[name]} key not available, skipping")
+            continue
+        if name != "simulated" and not get_breaker(name).allow():
+            print(f"  [Router] {name} circuit open, skipping")
+            continue
+        limiter = _rate_limiter(name)
+        wait = limiter.reserve(
+            job.audio_duration,
+            _request_count(job.audio_duration),
+            max_wait=get_setting("rate_limit_max_wait_s"),
+        )
+        if wait is None:
+            blocked = limiter.peek(job.audio_duration)
+            print(f"  [Router] {name} rate limited for {blocked:.0f}s, skipping")
+            job.last_error = RateLimitedError(
+                f"{CLOUD_LABELS[name]} rate limited (retry in {blocked:.0f}s)"
             )
-            result["audio_info"] = audio_info
+            continue
+        if wait > 0:
+            print(f"  [Router] {name} rate limited, queued {wait:.1f}s")
+        print(f"  [Router] Using {CLOUD_LABELS[name]}")
+        yield name, stt, wait
 
-    if result is None and provider == "openai":
-        from openai_stt import get_openai_stt, is_openai_available
+    # Chain ran out without reaching local
+    if job.last_error is not None:
+        raise job.last_error
+    raise RuntimeError(f"No STT provider available (tried: {', '.join(job.chain)})")
 
-        if not is_openai_available():
-            print("  [Warning] OpenAI API key not available, falling back to local")
-            provider = "local"
-        else:
-            print("  [Router] Using OpenAI Whisper API")
-            openai_stt = get_openai_stt()
-            result = openai_stt.transcribe(
-                audio_data, language, max_vocab_words=max_vocab_words
-            )
-            result["audio_info"] = audio_info
 
-    if result is None and provider == "gemini":
-        from gemini_stt import get_gemini_stt, is_gemini_available
+def _transcribe_local(
+    job: _Job, on_partial: Callable[[str], None] | None = None
+) -> dict:
+    """Local model — Gemma 4 (primary), lightning-whisper-mlx (fallback).
 
-        if not is_gemini_available():
-            print("  [Warning] Gemini API key not available, falling back to local")
-            provider = "local"
-        else:
-            print("  [Router] Using Gemini API")
-            gemini_stt = get_gemini_stt()
-            result = gemini_stt.transcribe(
-                audio_data, language, max_vocab_words=max_vocab_words
-            )
-            result["audio_info"] = audio_info
+    Runs on the scheduler's worker thread, batched with queued requests.
+    """
+    from gemma4_stt import is_gemma4_available
 
-    if result is None:
-        # Default: local model — Gemma 4 (primary), lightning-whisper-mlx (fallback)
-        from gemma4_stt import get_gemma4_stt, is_gemma4_available
+    local_audio = job.audio_data
+    if not is_gemma4_available():
+        print("  [Router] Using local lightning-whisper-mlx (fallback)")
+        # Whisper consumes float32 16kHz directly; decode the preprocessed
+        # WAV once here so the engine never touches a file or decoder
+        from audio_utils import as_float32_samples
 
-        if is_gemma4_available():
-            print("  [Router] Using local Gemma 4 E4B (MLX)")
-            gemma4_stt = get_gemma4_stt()
-            result = gemma4_stt.transcribe(
-                audio_data, language, max_vocab_words=max_vocab_words
-            )
-            result["audio_info"] = audio_info
-        else:
-            print("  [Router] Using local lightning-whisper-mlx (fallback)")
-            engine = get_engine()
-            result = engine.transcribe(
-                audio_data, language, max_vocab_words=max_vocab_words
-            )
-            result["provider"] = "local"
-            result["audio_info"] = audio_info
+        local_audio = as_float32_samples(job.audio_data)
+    local_start = time.perf_counter()
+    try:
+        result = get_local_scheduler().submit(
+            local_audio,
+            job.language,
+            job.max_vocab_words,
+            job.audio_duration,
+            on_partial,
+        )
+    except Exception:
+        get_auto_router().observe(
+            "local",
+            job.audio_duration,
+            job.language,
+            time.perf_counter() - local_start,
+            False,
+        )
+        raise
+    get_auto_router().observe(
+        "local", job.audio_duration, job.language, time.perf_counter() - local_start
+    )
+    result.setdefault("provider", "local")
+    return result
+
+
+def _finish(job: _Job, provider: str, result: dict) -> dict:
+    """Attach request info to the result and save debug metadata."""
+    result["audio_info"] = job.audio_info
+    if provider != job.provider:
+        print(f"  [Router] Failed over: {job.provider} -> {provider}")
+        result["failover_from"] = job.provider
 
     # Save debug metadata after transcription
-    if save_debug:
+    if job.save_debug:
         vocab_mgr = vocabulary.get_manager()
         total_vocab = len(vocab_mgr.words) if vocab_mgr else 0
         vocab_used = (
-            min(max_vocab_words, total_vocab) if max_vocab_words > 0 else total_vocab
+            min(job.max_vocab_words, total_vocab)
+            if job.max_vocab_words > 0
+            else total_vocab
         )
         _save_debug_metadata(
-            timestamp,
-            preprocess_info,
+            job.timestamp,
+            job.preprocess_info,
             provider,
-            language,
-            language_override,
+            job.language,
+            job.language_override,
             vocab_used,
             result,
         )
 
     return result
+
+
+def _transcribe_uncached(
+    audio_data: bytes,
+    language: str | None = None,
+    on_partial: Callable[[str], None] | None = None,
+    provider: str | None = None,
+) -> dict:
+    """Transcribe audio using the configured provider (local, OpenAI, or Groq).
+
+    This is the main entry point for transcription that:
+    1. Preprocesses audio (normalize volume, check threshold)
+    2. Routes to the appropriate backend based on settings, walking the
+       fallback chain when a cloud provider is unavailable or fails
+
+    Args:
+        audio_data: Raw audio bytes (WAV format)
+        language: Language code (fr, en, etc.) or None for auto-detect
+        on_partial: Partial-text callback (local Gemma 4 only)
+        provider: Provider override (default: the stt_provider setting)
+
+    Returns:
+        Dict with 'text', 'language', 'duration', 'processing_time', 'provider'
+    """
+    job, skipped = _prepare(audio_data, language, provider)
+    if job is None:
+        return skipped
+
+    for name, stt, wait in _cloud_attempts(job):
+        if wait:
+            time.sleep(wait)
+        try:
+            result = _transcribe_cloud(name, stt, *job.cloud_args)
+        except Exception as e:
+            job.last_error = e
+            print(f"  [Router] {name} failed: {e}")
+            continue
+        return _finish(job, name, result)
+
+    return _finish(job, "local", _transcribe_local(job, on_partial))
+
+
+async def _transcribe_uncached_async(
+    audio_data: bytes,
+    language: str | None = None,
+    on_partial: Callable[[str], None] | None = None,
+    provider: str | None = None,
+) -> dict:
+    """Async _transcribe_uncached(): cloud requests are awaited on the loop."""
+    job, skipped = await asyncio.to_thread(_prepare, audio_data, language, provider)
+    if job is None:
+        return skipped
+
+    for name, stt, wait in _cloud_attempts(job):
+        if wait:
+            await asyncio.sleep(wait)
+        try:
+            result = await _transcribe_cloud_async(name, stt, *job.cloud_args)
+        except Exception as e:
+            job.last_error = e
+            print(f"  [Router] {name} failed: {e}")
+            continue
+        return await asyncio.to_thread(_finish, job, name, result)
+
+    result = await asyncio.to_thread(_transcribe_local, job, on_partial)
+    return await asyncio.to_thread(_finish, job, "local", result)
@@ -0,0 +1,246 @@
+"""Tests for the async cloud provider clients and the async router path."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import pytest
+
+WAV = b"RIFF" + b"\0" * 40 + b"\0" * 32000  # 1s of silence
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Route every provider's async client through an httpx MockTransport."""
+    import gemini_stt
+    import groq_stt
+    import openai_stt
+    import replacements
+
+    # Gemini embeds replacement rules in its prompt; don't touch the real file
+    monkeypatch.setattr(
+        replacements, "get_manager", lambda: SimpleNamespace(replacements=[])
+    )
+    for name in ("GROQ_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY"):
+        monkeypatch.setenv(name, "test-key")
+    settings = {"replacements_enabled": False, "content_filter": False}
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if "generateContent" in request.url.path:
+            return httpx.Response(
+                200,
+                json={"candidates": [{"content": {"parts": [{"text": "bonjour"}]}}]},
+            )
+        return httpx.Response(
+            200, json={"text": " hello ", "language": "english", "duration": 1.0}
+        )
+
+    clients = []
+
+    def get_client():
+        # One pool per event loop, like async_http.get_async_http_client()
+        if not clients:
+            clients.append(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        return clients[0]
+
+    for module in (groq_stt, openai_stt, gemini_stt):
+        monkeypatch.setattr(module, "get_async_http_client", get_client)
+        monkeypatch.setattr(module, "get_setting", settings.get)
+    return requests
+
+
+class TestAsyncClients:
+    """Each provider's transcribe_async() goes through the shared pool."""
+
+    @pytest.mark.parametrize(
+        ("module_name", "cls_name", "host", "text"),
+        [
+            ("groq_stt", "GroqSTT", "api.groq.com", "hello"),
+            ("openai_stt", "OpenAISTT", "api.openai.com", "hello"),
+            ("gemini_stt", "GeminiSTT", "generativelanguage.googleapis.com", "bonjour"),
+        ],
+    )
+    def test_transcribe_async(self, mock_http, module_name, cls_name, host, text):
+        import importlib
+
+        stt = getattr(importlib.import_module(module_name), cls_name)()
+        result = asyncio.run(stt.transcribe_async(WAV, "en"))
+
+        assert result["text"] == text
+        assert result["provider"] == module_name.removesuffix("_stt")
+        assert mock_http[0].url.host == host
+
+    def test_async_client_reused_across_requests(self, mock_http):
+        from groq_stt import GroqSTT
+
+        stt = GroqSTT()
+
+        async def main():
+            await stt.transcribe_async(WAV)
+            first = stt._async_client()
+            await stt.transcribe_async(WAV)
+            return first is stt._async_client()
+
+        assert asyncio.run(main())
+
+
+class _SlowAsyncCloud:
+    """Cloud stand-in whose requests take `delay` seconds on the event loop."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def transcribe_async(self, audio_data, language, max_vocab_words=0):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return {"text": "ok", "language": "en", "provider": "groq"}
+
+
+@pytest.fixture
+def async_router(monkeypatch):
+    import audio_utils
+    import rate_limit
+    import stt_engine
+    from settings import _get_defaults
+
+    settings = {
+        **_get_defaults(),
+        "save_debug_audio": False,
+        "result_cache_enabled": False,
+        # 64 concurrent requests are far over Groq's default quota
+        "rate_limit_enabled": False,
+    }
+    monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+    monkeypatch.setattr(audio_utils, "get_setting", settings.get)
+    monkeypatch.setattr(audio_utils, "get_min_volume_rms", lambda: 0)
+    monkeypatch.setattr(stt_engine, "get_stt_provider", lambda: "groq")
+    monkeypatch.setattr(stt_engine, "_breakers", {})
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    cloud = _SlowAsyncCloud(delay=0.2)
+    monkeypatch.setattr(
+        stt_engine, "_cloud_stt", lambda name: cloud if name == "groq" else None
+    )
+
+    from audio_utils import _rebuild_wav
+
+    samples = (np.sin(np.arange(16000) / 10) * 3000).astype(np.int16)
+    return SimpleNamespace(
+        engine=stt_engine, cloud=cloud, settings=settings, wav=_rebuild_wav(samples)
+    )
+
+
+class TestAsyncRouter:
+    """stt_engine.transcribe_audio_async() awaits cloud calls on the loop."""
+
+    def test_concurrency_not_bounded_by_threads(self, async_router):
+        """64 concurrent 200ms requests finish in about one request's time."""
+        n = 64
+
+        async def main():
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(
+                    async_router.engine.transcribe_audio_async(async_router.wav, "en")
+                    for _ in range(n)
+                )
+            )
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(main())
+
+        assert all(r["text"] == "ok" for r in results)
+        assert async_router.cloud.peak == n
+        assert elapsed < 0.2 * 4
+
+    def test_failover_on_async_error(self, async_router, monkeypatch):
+        class Failing:
+            async def transcribe_async(self, *args, **kwargs):
+                raise TimeoutError("timed out")
+
+        clouds = {"groq": Failing(), "gemini": async_router.cloud}
+        monkeypatch.setattr(async_router.engine, "_cloud_stt", clouds.get)
+        async_router.settings["fallback_order"] = "gemini"
+
+        result = asyncio.run(
+            async_router.engine.transcribe_audio_async(async_router.wav, "en")
+        )
+
+        assert result["failover_from"] == "groq"
+        assert async_router.engine.breaker_states()["groq"]["failures"] == 1
+
+
+class TestEventLoopNotBlocked:
+    """Slow per-request work runs off the event loop."""
+
+    def test_post_processing_runs_on_a_thread(self, monkeypatch):
+        import simulated_stt
+
+        settings = {
+            "simulated_latency_ms": 0,
+            "simulated_latency_per_audio_s_ms": 0,
+            "simulated_jitter_ms": 0,
+            "simulated_error_rate": 0.0,
+            "simulated_max_concurrency": 8,
+            "replacements_enabled": False,
+            "content_filter": False,
+        }
+        monkeypatch.setattr(simulated_stt, "get_setting", settings.get)
+        stt = simulated_stt.SimulatedSTT(seed=1)
+        build_result = stt._build_result
+
+        def slow_build_result(*args):
+            time.sleep(0.3)  # e.g. thousands of replacement rules
+            return build_result(*args)
+
+        stt._build_result = slow_build_result
+
+        async def main():
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                while True:
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            task = asyncio.create_task(ticker())
+            result = await stt.transcribe_async(WAV, "en")
+            task.cancel()
+            return result, max(gaps)
+
+        result, max_gap = asyncio.run(main())
+
+        assert result["provider"] == "simulated"
+        assert max_gap < 0.15
+
+    def test_settings_read_once_per_snapshot(self, monkeypatch):
+        import settings
+
+        reads = []
+        load = settings._load_settings
+        monkeypatch.setattr(
+            settings, "_load_settings", lambda: reads.append(1) or load()
+        )
+
+        async def main():
+            with settings.settings_snapshot():
+                settings.get_setting("stt_provider")
+                settings.get_setting("language")
+                await asyncio.to_thread(settings.get_setting, "content_filter")
+
+        asyncio.run(main())
+        assert len(reads) == 1
+
+        settings.get_setting("stt_provider")
+        assert len(reads) == 2
@@ -0,0 +1,130 @@
+"""Tests for the latency-aware `auto` provider."""
+
+import pytest
+
+
+class TestAutoRouter:
+    """auto_router.AutoRouter estimates and choices."""
+
+    def test_untried_providers_go_first(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter()
+        router.observe("groq", 10.0, "en", 1.0)
+
+        assert router.choose(["groq", "openai"], 10.0, "en") == ("openai", "untried")
+
+    def test_picks_fastest_for_clip(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter(explore_every=1000)
+        router.observe("groq", 10.0, "en", 1.0)
+        router.observe("openai", 10.0, "en", 3.0)
+
+        provider, reason = router.choose(["groq", "openai"], 10.0, "en")
+        assert provider == "groq"
+        assert reason.startswith("expected")
+
+    def test_estimates_are_per_length_band(self):
+        """A provider fast on long clips can be slow on short ones (fixed overhead)."""
+        from auto_router import AutoRouter
+
+        router = AutoRouter(explore_every=1000)
+        router.observe("local", 2.0, "en", 0.4)
+        router.observe("groq", 2.0, "en", 0.8)
+        router.observe("local", 60.0, "en", 30.0)
+        router.observe("groq", 60.0, "en", 3.0)
+
+        assert router.choose(["local", "groq"], 2.0, "en")[0] == "local"
+        assert router.choose(["local", "groq"], 60.0, "en")[0] == "groq"
+
+    def test_unseen_bucket_uses_provider_wide_estimate(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter()
+        router.observe("groq", 10.0, "en", 1.0)
+
+        assert router.expected_seconds("groq", 10.0, "zh") == pytest.approx(1.0)
+
+    def test_errors_penalize_provider(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter(explore_every=1000)
+        router.observe("groq", 10.0, "en", 1.0)
+        router.observe("openai", 10.0, "en", 1.5)
+        for _ in range(3):
+            router.observe("groq", 10.0, "en", 5.0, ok=False)
+
+        assert router.choose(["groq", "openai"], 10.0, "en")[0] == "openai"
+
+    def test_always_failing_provider_is_not_chosen_forever(self):
+        """A provider with attempts but no successes is not "untried"."""
+        from auto_router import AutoRouter
+
+        router = AutoRouter(explore_every=1000)
+        router.observe("groq", 10.0, "en", 1.0)
+        router.observe("openai", 10.0, "en", 5.0, ok=False)
+
+        assert router.choose(["openai", "groq"], 10.0, "en")[0] == "groq"
+        assert router.expected_seconds("openai", 10.0, "en") is None
+
+    def test_all_failing_picks_lowest_error_rate(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter(explore_every=1000)
+        for _ in range(3):
+            router.observe("groq", 10.0, "en", 5.0, ok=False)
+        router.observe("openai", 10.0, "en", 5.0, ok=False)
+
+        provider, reason = router.choose(["groq", "openai"], 10.0, "en")
+        assert provider == "openai"
+        assert reason.startswith("no successes")
+
+    def test_periodic_exploration_picks_stalest(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter(explore_every=3)
+        router.observe("openai", 10.0, "en", 3.0)
+        router.observe("groq", 10.0, "en", 1.0)
+
+        choices = [router.choose(["groq", "openai"], 10.0, "en") for _ in range(3)]
+        assert [c[0] for c in choices] == ["groq", "groq", "openai"]
+        assert choices[2][1] == "exploring"
+
+    def test_estimates_snapshot(self):
+        from auto_router import AutoRouter
+
+        router = AutoRouter()
+        router.observe("groq", 10.0, None, 2.0)
+
+        estimates = router.estimates()["groq"]
+        assert estimates["medium/auto"]["sec_per_audio_sec"] == pytest.approx(0.2)
+        assert estimates["all"]["samples"] == 1
+        assert estimates["all"]["successes"] == 1
+
+
+class TestAutoCandidates:
+    """stt_engine._auto_candidates() only offers usable providers."""
+
+    def test_local_only_when_allowed_or_needed(self, monkeypatch):
+        import stt_engine
+
+        settings = {
+            "auto_include_local": False,
+            "breaker_failure_threshold": 3,
+            "breaker_reset_s": 30,
+        }
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        available = {"groq"}
+        monkeypatch.setattr(
+            stt_engine,
+            "_cloud_stt",
+            lambda name: object() if name in available else None,
+        )
+
+        assert stt_engine._auto_candidates() == ["groq"]
+        settings["auto_include_local"] = True
+        assert stt_engine._auto_candidates() == ["groq", "local"]
+        available.clear()
+        settings["auto_include_local"] = False
+        assert stt_engine._auto_candidates() == ["local"]
@@ -0,0 +1,152 @@
+"""Tests for pause-aligned chunking and parallel chunked transcription."""
+
+import itertools
+import threading
+import time
+
+import numpy as np
+
+
+def _speech_with_pauses(duration: float, pauses: list[float], rate: int = 16000):
+    """Loud noise with 1s silent gaps starting at each time in `pauses`."""
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(duration * rate)) * 3000).astype(np.int16)
+    for start in pauses:
+        audio[int(start * rate) : int((start + 1.0) * rate)] = 0
+    return audio
+
+
+class TestSplitAtPauses:
+    """Unit tests for audio_utils.split_at_pauses()."""
+
+    def test_short_audio_is_single_chunk(self):
+        """Audio shorter than the target is not split."""
+        from audio_utils import split_at_pauses
+
+        audio = np.zeros(16000 * 10, dtype=np.int16)
+        assert split_at_pauses(audio, target_duration=30) == [(0, len(audio))]
+
+    def test_cuts_land_in_pauses(self):
+        """Cuts move to the silent gaps near each 30s boundary."""
+        from audio_utils import split_at_pauses
+
+        audio = _speech_with_pauses(70, pauses=[27.0, 58.0])
+        bounds = split_at_pauses(audio, target_duration=30, overlap=0.0)
+
+        assert len(bounds) == 3
+        cut_times = [end / 16000 for _, end in bounds[:-1]]
+        assert 27.0 <= cut_times[0] <= 28.0
+        assert 58.0 <= cut_times[1] <= 59.0
+
+    def test_chunks_cover_input_with_overlap(self):
+        """Chunks span the whole recording and overlap by the requested amount."""
+        from audio_utils import split_at_pauses
+
+        audio = _speech_with_pauses(95, pauses=[29.0, 61.0])
+        bounds = split_at_pauses(audio, target_duration=30, overlap=0.5)
+
+        assert bounds[0][0] == 0
+        assert bounds[-1][1] == len(audio)
+        for (_, prev_end), (next_start, _) in itertools.pairwise(bounds):
+            assert prev_end - next_start == 8000  # 0.5s at 16kHz
+
+
+class TestMergeChunkTexts:
+    """Unit tests for chunking.merge_chunk_texts()."""
+
+    def test_overlap_is_deduplicated(self):
+        """Words repeated across a chunk boundary are kept once."""
+        from chunking import merge_chunk_texts
+
+        merged = merge_chunk_texts(
+            ["Set the DM timeout to thirty", "timeout to thirty minutes please."]
+        )
+        assert merged == "Set the DM timeout to thirty minutes please."
+
+    def test_single_repeated_word_is_kept(self):
+        """One shared word at the boundary is a real repetition, not overlap."""
+        from chunking import merge_chunk_texts
+
+        merged = merge_chunk_texts(
+            ["I'll be there next week for the meeting.", "Meeting notes are shared."]
+        )
+        assert merged == (
+            "I'll be there next week for the meeting. Meeting notes are shared."
+        )
+
+    def test_no_overlap_joins_with_space(self):
+        """Chunks without shared words are joined as-is."""
+        from chunking import merge_chunk_texts
+
+        assert merge_chunk_texts(["Commit and push.", "", "Check my email."]) == (
+            "Commit and push. Check my email."
+        )
+
+    def test_cjk_overlap_is_character_level(self):
+        """Chinese/Japanese text (no spaces) de-duplicates by character."""
+        from chunking import merge_chunk_texts
+
+        assert (
+            merge_chunk_texts(["今天天气很好", "很好我们去公园"])
+            == "今天天气很好我们去公园"
+        )
+
+
+def _chunk_id(audio_data: bytes) -> str:
+    """Unique text for a chunk: its length plus its first sample bytes."""
+    return f"{len(audio_data)}-{audio_data[44:52].hex()}"
+
+
+class TestTranscribeChunked:
+    """Tests for chunking.transcribe_chunked() with a stand-in provider."""
+
+    class FakeSTT:
+        """Returns an id of the chunk as text and tracks concurrency."""
+
+        def __init__(self):
+            self.active = 0
+            self.max_active = 0
+            self.lock = threading.Lock()
+
+        def transcribe(self, audio_data, language=None, max_vocab_words=0):
+            with self.lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            time.sleep(0.05)
+            with self.lock:
+                self.active -= 1
+            return {"text": _chunk_id(audio_data), "language": "en", "provider": "fake"}
+
+    def _wav(self, samples):
+        from audio_utils import _rebuild_wav
+
+        return _rebuild_wav(samples)
+
+    def test_results_merged_in_order_within_concurrency_cap(self):
+        """Chunks run in parallel (capped) and merge back in order."""
+        from audio_utils import split_wav_at_pauses
+        from chunking import transcribe_chunked
+
+        stt = self.FakeSTT()
+        wav = self._wav(_speech_with_pauses(125, pauses=[29.0, 59.0, 89.0, 119.0]))
+        result = transcribe_chunked(
+            stt, wav, "en", target_duration=30, max_concurrency=2
+        )
+
+        expected = [_chunk_id(c) for c in split_wav_at_pauses(wav, target_duration=30)]
+        assert result["chunks"] == 5
+        assert stt.max_active == 2
+        assert result["text"].split() == expected
+        assert result["provider"] == "fake"
+        assert abs(result["duration"] - 125) < 0.01
+
+    def test_short_audio_uses_single_call(self):
+        """Audio below the target duration is sent as one request."""
+        from chunking import transcribe_chunked
+
+        stt = self.FakeSTT()
+        audio = _speech_with_pauses(12, pauses=[])
+        result = transcribe_chunked(stt, self._wav(audio), "en", target_duration=30)
+
+        assert result["text"] == _chunk_id(self._wav(audio))
+        assert "chunks" not in result
@@ -0,0 +1,149 @@
+"""Tests for per-provider circuit breakers and the failover chain."""
+
+import threading
+import time
+
+import pytest
+
+
+class TestCircuitBreaker:
+    """circuit_breaker.CircuitBreaker state machine."""
+
+    def test_opens_after_consecutive_failures(self):
+        from circuit_breaker import CLOSED, OPEN, CircuitBreaker
+
+        breaker = CircuitBreaker("groq", failure_threshold=3, reset_timeout=60)
+        breaker.record_failure(RuntimeError("timeout"))
+        breaker.record_failure(RuntimeError("timeout"))
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+        breaker.record_failure(RuntimeError("timeout"))
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.snapshot()["last_error"] == "timeout"
+
+    def test_success_resets_failure_count(self):
+        from circuit_breaker import CLOSED, CircuitBreaker
+
+        breaker = CircuitBreaker("groq", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_probe_success_closes(self):
+        from circuit_breaker import CLOSED, CircuitBreaker
+
+        probed = threading.Event()
+        breaker = CircuitBreaker(
+            "groq", failure_threshold=1, reset_timeout=0, probe=probed.set
+        )
+        breaker.record_failure()
+
+        # Real requests keep skipping the provider while the probe runs
+        assert not breaker.allow()
+        assert probed.wait(2)
+        for _ in range(100):
+            if breaker.state == CLOSED:
+                break
+            time.sleep(0.01)
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_probe_failure_reopens(self):
+        from circuit_breaker import OPEN, CircuitBreaker
+
+        done = threading.Event()
+
+        def probe():
+            done.set()
+            raise RuntimeError("still down")
+
+        breaker = CircuitBreaker(
+            "groq", failure_threshold=1, reset_timeout=0, probe=probe
+        )
+        breaker.record_failure()
+        breaker.allow()
+        assert done.wait(2)
+        for _ in range(100):
+            if breaker.trips == 2:
+                break
+            time.sleep(0.01)
+        assert breaker.state == OPEN
+        assert breaker.trips == 2
+
+    def test_without_probe_one_trial_request(self):
+        from circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker("groq", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_probe_clip_is_short_wav(self):
+        from audio_utils import as_int16_samples
+        from circuit_breaker import PROBE_SECONDS, probe_clip
+
+        clip = probe_clip()
+        assert clip[:4] == b"RIFF"
+        assert len(as_int16_samples(clip)) == int(16000 * PROBE_SECONDS)
+
+
+@pytest.fixture
+def router_settings():
+    return {
+        "fallback_order": "gemini,local",
+        "breaker_failure_threshold": 1,
+        "breaker_reset_s": 60,
+    }
+
+
+@pytest.fixture
+def router(router):
+    router.clouds["groq"] = router.cloud_cls("groq", error=TimeoutError("timed out"))
+    return router
+
+
+class TestFailoverChain:
+    """stt_engine routes down fallback_order past failing providers."""
+
+    def test_error_fails_over_to_next_provider(self, router):
+        result = router.run()
+
+        assert result["provider"] == "gemini"
+        assert result["failover_from"] == "groq"
+
+    def test_open_circuit_skips_provider(self, router):
+        router.run()
+        router.run()
+
+        assert router.clouds["groq"].calls == 1
+        assert router.engine.breaker_states()["groq"]["state"] == "open"
+
+    def test_chain_without_local_raises_last_error(self, router):
+        router.settings["fallback_order"] = ""
+
+        with pytest.raises(TimeoutError):
+            router.run()
+
+    def test_default_does_not_fail_over(self, router):
+        from settings import _get_defaults
+
+        router.settings["fallback_order"] = _get_defaults()["fallback_order"]
+
+        with pytest.raises(TimeoutError):
+            router.run()
+        assert router.clouds["gemini"].calls == 0
+
+    def test_missing_key_falls_back_to_local(self, router):
+        router.settings["fallback_order"] = ""
+
+        assert router.engine._provider_chain("openai") == ["openai", "local"]
+        assert router.engine._provider_chain("groq") == ["groq"]
+
+    def test_fallback_order_parsing(self, router):
+        router.settings["fallback_order"] = " OpenAI, bogus,groq , local"
+
+        assert router.engine._provider_chain("groq") == ["groq", "openai", "local"]
@@ -0,0 +1,169 @@
+"""Tests for Gemma 4 token budgeting and runaway-generation detection."""
+
+import sys
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+class TestTokenBudget:
+    """Unit tests for gemma4_stt.token_budget()."""
+
+    def test_scales_with_duration(self):
+        from gemma4_stt import token_budget
+
+        assert token_budget(2.0, "en") < token_budget(10.0, "en")
+
+    def test_cjk_gets_more_tokens_per_second(self):
+        from gemma4_stt import token_budget
+
+        assert token_budget(10.0, "zh") > token_budget(10.0, "en")
+        assert token_budget(10.0, None) == token_budget(10.0, "fr")
+
+    def test_bounds(self):
+        from gemma4_stt import MAX_TOKENS, MIN_TOKENS, token_budget
+
+        assert token_budget(0.0) == MIN_TOKENS
+        assert token_budget(300.0, "ja") == MAX_TOKENS
+
+
+class TestRepetitionDetector:
+    """Unit tests for gemma4_stt.RepetitionDetector."""
+
+    def _feed(self, tokens, texts=None):
+        from gemma4_stt import RepetitionDetector
+
+        detector = RepetitionDetector()
+        for i, token in enumerate(tokens):
+            if detector.add(token, texts[i] if texts else None):
+                return detector, i
+        return detector, None
+
+    def test_normal_text_not_flagged(self):
+        _, stopped_at = self._feed(list(range(200)))
+        assert stopped_at is None
+
+    def test_phrase_loop_detected(self):
+        """A 3-token phrase repeated over 32+ tokens trips the detector."""
+        prefix = [100, 101, 102, 103]
+        detector, stopped_at = self._feed(prefix + [7, 8, 9] * 20)
+
+        assert stopped_at == len(prefix) + 3 * 11 - 1
+        assert detector.period == 3
+        # Keep the text up to and including one copy of the phrase
+        assert detector.loop_start == len(prefix) + 3
+
+    def test_short_repeats_allowed(self):
+        """"no, no, no, no" and runs of one token (e.g. "...") are kept."""
+        _, stopped_at = self._feed([1, 2] + [5, 6] * 15)
+        assert stopped_at is None
+
+        _, stopped_at = self._feed([1, 2] + [5] * 31)
+        assert stopped_at is None
+
+        _, stopped_at = self._feed([1, 2] + [5] * 32)
+        assert stopped_at == 33
+
+    @pytest.mark.parametrize(
+        "texts",
+        [
+            ["1"] + ["0"] * 40,  # "100000...": one token per digit
+            ["1"] + [",", "0", "0", "0"] * 10,  # "1,000,000,..."
+            ["5"] + ["."] * 40,
+        ],
+    )
+    def test_digit_and_punctuation_runs_not_flagged(self, texts):
+        ids = {text: i for i, text in enumerate(dict.fromkeys(texts))}
+        _, stopped_at = self._feed([ids[t] for t in texts], texts)
+        assert stopped_at is None
+
+    def test_word_loop_with_text_flagged(self):
+        texts = [" no", ","] * 16
+        _, stopped_at = self._feed([5, 6] * 16, texts)
+        assert stopped_at == 31
+
+
+class TestGenerateStopReason:
+    """Gemma4STT._generate() reports why generation ended."""
+
+    @pytest.fixture
+    def stt(self, monkeypatch):
+        import gemma4_stt
+
+        stt = gemma4_stt.Gemma4STT()
+        stt.processor = SimpleNamespace(
+            tokenizer=SimpleNamespace(
+                stopping_criteria=SimpleNamespace(reset=lambda eos: None)
+            )
+        )
+        stt.model = SimpleNamespace(config=SimpleNamespace(eos_token_id=1))
+        stt.stream = []
+
+        stt.texts = {}
+
+        def stream_generate(model, processor, prompt, audio, max_tokens, **kwargs):
+            # Mirror mlx-vlm: one chunk per token, then a flush chunk
+            if not stt.stream:
+                return
+            for n, token in enumerate(stt.stream[:max_tokens]):
+                yield SimpleNamespace(
+                    text=stt.texts.get(token, f"w{token} "),
+                    token=token,
+                    generation_tokens=n + 1,
+                )
+            yield SimpleNamespace(text="", token=token, generation_tokens=n + 1)
+
+        mlx_vlm = ModuleType("mlx_vlm")
+        mlx_vlm.stream_generate = stream_generate
+        monkeypatch.setitem(sys.modules, "mlx_vlm", mlx_vlm)
+        return stt
+
+    def _run(self, stt, tokens, max_tokens=100):
+        stt.stream = tokens
+        return stt._generate("prompt", np.zeros(10, np.float32), None, max_tokens)
+
+    def test_eos(self, stt):
+        result = self._run(stt, [10, 11, 12])
+        assert result["stop_reason"] == "eos"
+        assert result["text"] == "w10 w11 w12 "
+
+    def test_max_tokens(self, stt):
+        result = self._run(stt, list(range(100, 200)), max_tokens=20)
+        assert result["stop_reason"] == "max_tokens"
+        assert result["tokens"] == 20
+
+    def test_loop_at_budget_is_trimmed(self, stt):
+        result = self._run(stt, [10, 11] + [7, 8] * 50)
+        assert result["stop_reason"] == "repetition"
+        assert result["tokens"] == 100
+        assert result["text"] == "w10 w11 w7 w8 "
+
+    def test_repeat_that_ends_is_kept(self, stt):
+        """A long repeat the model finishes on its own is not cut."""
+        tokens = [10] + [7, 8] * 20 + [11]
+        result = self._run(stt, tokens)
+        assert result["stop_reason"] == "eos"
+        assert result["text"] == "".join(f"w{t} " for t in tokens)
+
+    def test_long_number_is_not_truncated(self, stt):
+        """One token per digit: "1" + "0" * 60 hits the budget untouched."""
+        stt.texts = {1: "1", 0: "0"}
+        result = self._run(stt, [1] + [0] * 60, max_tokens=40)
+        assert result["stop_reason"] == "max_tokens"
+        assert result["text"] == "1" + "0" * 39
+
+    def test_partials_grow_with_each_token(self, stt):
+        partials = []
+        stt.stream = [10, 11, 12]
+        stt._generate(
+            "prompt", np.zeros(10, np.float32), None, 100, on_partial=partials.append
+        )
+        assert partials == ["w10", "w10 w11", "w10 w11 w12"]
+
+    def test_no_tokens_reports_zero_ttft(self, stt):
+        """An empty stream still returns a numeric ttft."""
+        result = self._run(stt, [])
+        assert result["text"] == ""
+        assert result["tokens"] == 0
+        assert result["ttft"] == 0.0
@@ -0,0 +1,128 @@
+"""Tests for the Gemma 4 prompt-prefix cache (no model or mlx-vlm needed)."""
+
+import sys
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+class _FakeKVCache:
+    """Shape-compatible stand-in for mlx_lm's KVCache."""
+
+    def __init__(self, filled: int, capacity: int = 256):
+        self.keys = np.zeros((1, 2, capacity, 4))
+        self.values = np.zeros((1, 2, capacity, 4))
+        self.offset = filled
+
+
+class _FakeRotatingKVCache(_FakeKVCache):
+    max_size = 512
+
+
+class TestPromptPrefixState:
+    """Unit tests for gemma4_stt._PromptPrefixState / _snapshot_cache."""
+
+    def test_reuses_only_matching_prefix(self):
+        from gemma4_stt import _PromptPrefixState
+
+        state = _PromptPrefixState([1, 2, 3], [])
+        assert state.find_prefix_length([1, 2, 3, 99, 99]) == 3
+        assert state.reused == 3
+        assert state.find_prefix_length([1, 2, 4, 99]) == 0
+        assert state.reused == 0
+
+    def test_update_keeps_prefix(self):
+        """Generated tokens are not appended to the reusable prefix."""
+        from gemma4_stt import _PromptPrefixState
+
+        snapshot = [_FakeKVCache(3)]
+        state = _PromptPrefixState([1, 2, 3], snapshot)
+        state.update([1, 2, 3, 7, 8, 9], state.cache)
+
+        assert state.token_ids == [1, 2, 3]
+        assert state.find_prefix_length([1, 2, 3, 5]) == 3
+
+    def test_cache_returns_independent_copies(self):
+        from gemma4_stt import _PromptPrefixState
+
+        state = _PromptPrefixState([1], [_FakeKVCache(1)])
+        first = state.cache
+        first[0].offset = 100
+        first[0].keys = None
+
+        second = state.cache
+        assert second[0].offset == 1
+        assert second[0].keys is not None
+
+    def test_snapshot_trims_full_attention_buffers(self):
+        """KVCache spare capacity is dropped so restored copies must reallocate."""
+        from gemma4_stt import _snapshot_cache
+
+        full = _FakeKVCache(10)
+        sliding = _FakeRotatingKVCache(10, capacity=10)
+        snapshot = _snapshot_cache([full, sliding])
+
+        assert snapshot[0].keys.shape[2] == 10
+        assert snapshot[0].values.shape[2] == 10
+        assert snapshot[1].keys is sliding.keys
+        assert full.keys.shape[2] == 256  # Original untouched
+
+
+class TestPromptReuse:
+    """Gemma4STT._get_prompt builds each prompt/prefix once."""
+
+    @pytest.fixture
+    def stt(self, monkeypatch):
+        import gemma4_stt
+
+        prompt_utils = ModuleType("mlx_vlm.prompt_utils")
+        prompt_utils.apply_chat_template = lambda processor, config, text, **kw: (
+            f"<user>{text}<|audio|><model>"
+        )
+        monkeypatch.setitem(sys.modules, "mlx_vlm", ModuleType("mlx_vlm"))
+        monkeypatch.setitem(sys.modules, "mlx_vlm.prompt_utils", prompt_utils)
+
+        settings = {"gemma4_prompt_cache": True}
+        monkeypatch.setattr(gemma4_stt, "get_setting", settings.get)
+
+        stt = gemma4_stt.Gemma4STT()
+        stt.model = SimpleNamespace(config=None)
+        stt.prefills = []
+
+        def fake_prefill(prompt):
+            stt.prefills.append(prompt)
+            return gemma4_stt._PromptPrefixState([1, 2], [])
+
+        stt._prefill_prefix = fake_prefill
+        stt.settings = settings
+        return stt
+
+    def test_prefix_built_once_per_language(self, stt):
+        stt.set_vocabulary(["Kubernetes"])
+        prompt_en, prefix_en = stt._get_prompt("en", 0)
+        again, prefix_again = stt._get_prompt("en", 0)
+        prompt_fr, _ = stt._get_prompt("fr", 0)
+
+        assert again == prompt_en
+        assert prefix_again is prefix_en
+        assert "Kubernetes" in prompt_en
+        assert prompt_fr != prompt_en
+        assert len(stt.prefills) == 2
+
+    def test_set_vocabulary_invalidates(self, stt):
+        stt.set_vocabulary(["Kubernetes"])
+        stt._get_prompt("en", 0)
+        stt.set_vocabulary(["FastAPI"])
+        prompt, _ = stt._get_prompt("en", 0)
+
+        assert "FastAPI" in prompt
+        assert len(stt.prefills) == 2
+
+    def test_disabled_setting_skips_prefix(self, stt):
+        stt.settings["gemma4_prompt_cache"] = False
+        prompt, prefix = stt._get_prompt("en", 0)
+
+        assert prefix is None
+        assert prompt
+        assert stt.prefills == []
@@ -0,0 +1,334 @@
+"""Tests for hedged cloud requests."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+def _call(text, delay=0.0, error=None, started=None):
+    def call():
+        if started is not None:
+            started.append(text)
+        time.sleep(delay)
+        if error:
+            raise error
+        return {"text": text, "provider": text}
+
+    return call
+
+
+class TestTranscribeHedged:
+    """hedging.transcribe_hedged() races a secondary provider."""
+
+    def test_fast_primary_is_not_hedged(self):
+        from hedging import HedgeStats, transcribe_hedged
+
+        stats = HedgeStats()
+        started = []
+        result = transcribe_hedged(
+            ("groq", _call("groq", started=started)),
+            ("gemini", _call("gemini", started=started)),
+            delay=1.0,
+            stats=stats,
+        )
+
+        assert result["text"] == "groq"
+        assert "hedged" not in result
+        assert started == ["groq"]
+        assert stats.hedges == 0
+
+    def test_slow_primary_secondary_wins(self):
+        from hedging import HedgeStats, transcribe_hedged
+
+        stats = HedgeStats()
+        release = threading.Event()
+        result = transcribe_hedged(
+            ("groq", lambda: release.wait(5) and {"text": "groq"}),
+            ("gemini", _call("gemini")),
+            delay=0.05,
+            stats=stats,
+        )
+        release.set()
+
+        assert result["text"] == "gemini"
+        assert result["hedged"] is True
+        assert stats.summary()["hedges"] == 1
+        assert stats.summary()["secondary_wins"] == 1
+
+    def test_primary_can_still_win_after_hedge(self):
+        from hedging import HedgeStats, transcribe_hedged
+
+        stats = HedgeStats()
+        result = transcribe_hedged(
+            ("groq", _call("groq", delay=0.3)),
+            ("openai", _call("openai", delay=2.0)),
+            delay=0.05,
+            stats=stats,
+        )
+
+        assert result["text"] == "groq"
+        assert stats.summary()["primary_wins_after_hedge"] == 1
+
+    def test_primary_failure_hedges_immediately(self):
+        from hedging import HedgeStats, transcribe_hedged
+
+        start = time.perf_counter()
+        result = transcribe_hedged(
+            ("groq", _call("groq", error=RuntimeError("503"))),
+            ("gemini", _call("gemini")),
+            delay=5.0,
+            stats=HedgeStats(),
+        )
+
+        assert result["text"] == "gemini"
+        assert time.perf_counter() - start < 2.0
+
+    def test_both_fail_raises_primary_error(self):
+        from hedging import HedgeStats, transcribe_hedged
+
+        with pytest.raises(RuntimeError, match="primary"):
+            transcribe_hedged(
+                ("groq", _call("groq", error=RuntimeError("primary"))),
+                ("gemini", _call("gemini", error=ValueError("secondary"))),
+                delay=0.0,
+                stats=HedgeStats(),
+            )
+
+    def test_abandoned_losers_do_not_queue_primaries(self):
+        from hedging import HedgeStats, transcribe_hedged
+
+        release = threading.Event()
+        start = time.perf_counter()
+        for _ in range(8):
+            transcribe_hedged(
+                ("groq", lambda: release.wait(10) and {"text": "groq"}),
+                ("gemini", _call("gemini")),
+                delay=0.01,
+                stats=HedgeStats(),
+            )
+
+        stats = HedgeStats()
+        try:
+            result = transcribe_hedged(
+                ("groq", _call("groq")),
+                ("gemini", _call("gemini")),
+                delay=1.0,
+                stats=stats,
+            )
+        finally:
+            release.set()
+
+        assert result["text"] == "groq"
+        assert stats.hedges == 0
+        assert time.perf_counter() - start < 5.0
+
+
+def _async_call(text, delay=0.0, error=None, cancelled=None):
+    async def call():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(text)
+            raise
+        if error:
+            raise error
+        return {"text": text, "provider": text}
+
+    return call
+
+
+class TestTranscribeHedgedAsync:
+    """hedging.transcribe_hedged_async() cancels the losing request."""
+
+    def test_fast_primary_is_not_hedged(self):
+        from hedging import HedgeStats, transcribe_hedged_async
+
+        stats = HedgeStats()
+        result = asyncio.run(
+            transcribe_hedged_async(
+                ("groq", _async_call("groq")),
+                ("gemini", _async_call("gemini")),
+                delay=1.0,
+                stats=stats,
+            )
+        )
+
+        assert result["text"] == "groq"
+        assert "hedged" not in result
+        assert stats.hedges == 0
+
+    def test_slow_primary_is_cancelled(self):
+        from hedging import HedgeStats, transcribe_hedged_async
+
+        stats = HedgeStats()
+        cancelled = []
+
+        async def main():
+            result = await transcribe_hedged_async(
+                ("groq", _async_call("groq", delay=5.0, cancelled=cancelled)),
+                ("gemini", _async_call("gemini")),
+                delay=0.05,
+                stats=stats,
+            )
+            await asyncio.sleep(0)  # Let the cancellation land
+            return result
+
+        start = time.perf_counter()
+        result = asyncio.run(main())
+
+        assert result["text"] == "gemini"
+        assert result["hedged"] is True
+        assert cancelled == ["groq"]
+        assert stats.secondary_wins == 1
+        assert time.perf_counter() - start < 2.0
+
+    def test_primary_win_cancels_secondary(self):
+        from hedging import HedgeStats, transcribe_hedged_async
+
+        stats = HedgeStats()
+        cancelled = []
+
+        async def main():
+            result = await transcribe_hedged_async(
+                ("groq", _async_call("groq", delay=0.2)),
+                ("openai", _async_call("openai", delay=5.0, cancelled=cancelled)),
+                delay=0.05,
+                stats=stats,
+            )
+            await asyncio.sleep(0)
+            return result
+
+        result = asyncio.run(main())
+
+        assert result["text"] == "groq"
+        assert cancelled == ["openai"]
+        assert stats.summary()["primary_wins_after_hedge"] == 1
+
+    def test_both_fail_raises_primary_error(self):
+        from hedging import HedgeStats, transcribe_hedged_async
+
+        with pytest.raises(RuntimeError, match="primary"):
+            asyncio.run(
+                transcribe_hedged_async(
+                    ("groq", _async_call("groq", error=RuntimeError("primary"))),
+                    ("gemini", _async_call("gemini", error=ValueError("secondary"))),
+                    delay=0.0,
+                    stats=HedgeStats(),
+                )
+            )
+
+
+class TestHedgeTarget:
+    """stt_engine._hedge_target() picks an affordable secondary."""
+
+    @pytest.fixture
+    def router(self, monkeypatch):
+        import stt_engine
+        from hedging import HedgeStats
+        from provider_stats import LatencyStats
+
+        settings = {
+            "hedge_max_cost_cents": 0.5,
+            "breaker_failure_threshold": 3,
+            "breaker_reset_s": 30,
+        }
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        monkeypatch.setattr(stt_engine, "_cloud_stt", lambda name: object())
+        monkeypatch.setattr(stt_engine, "_breakers", {})
+        monkeypatch.setattr("rate_limit._limiters", {})
+        stats = LatencyStats()
+        monkeypatch.setattr("provider_stats.get_latency_stats", lambda: stats)
+        hedge_stats = HedgeStats()
+        monkeypatch.setattr("hedging.get_hedge_stats", lambda: hedge_stats)
+        return stt_engine, settings, stats, hedge_stats
+
+    def test_prefers_fastest_observed_provider(self, router):
+        stt_engine, _, stats, _ = router
+        stats.record("gemini", 2.0, 5.0)
+        stats.record("openai", 0.5, 5.0)
+
+        assert stt_engine._hedge_target("groq", 5.0) == "openai"
+
+    def test_cost_cap_excludes_expensive_providers(self, router):
+        """A 2-minute clip on OpenAI (~1.2 cents) exceeds a 0.5 cent cap."""
+        stt_engine, _, stats, _ = router
+        stats.record("openai", 0.1, 5.0)
+
+        assert stt_engine._hedge_target("groq", 120.0) == "gemini"
+
+    def test_nothing_affordable(self, router):
+        stt_engine, settings, _, hedge_stats = router
+        settings["hedge_max_cost_cents"] = 0
+
+        assert stt_engine._hedge_target("groq", 10.0) is None
+        assert hedge_stats.skipped_cost == 1
+
+
+class TestHedgeDelay:
+    """The hedge delay scales with clip length."""
+
+    def test_long_clip_with_normal_speed_is_not_hedged(self, monkeypatch):
+        """0.1s per audio second makes a 10s clip's p90 about 1s, not 0.1s."""
+        import time
+
+        import stt_engine
+        from hedging import HedgeStats
+        from provider_stats import LatencyStats
+
+        settings = {
+            "hedged_requests": True,
+            "hedge_max_cost_cents": 5.0,
+            "breaker_failure_threshold": 3,
+            "breaker_reset_s": 30,
+        }
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        monkeypatch.setattr(stt_engine, "_cloud_stt", lambda name: object())
+        monkeypatch.setattr(stt_engine, "_breakers", {})
+        monkeypatch.setattr("rate_limit._limiters", {})
+        stats = LatencyStats()
+        for _ in range(5):
+            stats.record("groq", 0.1, 1.0)
+        monkeypatch.setattr("provider_stats.get_latency_stats", lambda: stats)
+        hedge_stats = HedgeStats()
+        monkeypatch.setattr("hedging.get_hedge_stats", lambda: hedge_stats)
+        called = []
+
+        def fake_call_cloud(provider, stt, *args):
+            called.append(provider)
+            if provider == "groq":
+                time.sleep(0.3)
+            return {"text": provider}
+
+        monkeypatch.setattr(stt_engine, "_call_cloud", fake_call_cloud)
+
+        result = stt_engine._transcribe_cloud("groq", object(), b"", "en", 0, 10.0)
+
+        assert result["text"] == "groq"
+        assert called == ["groq"]
+        assert hedge_stats.hedges == 0
+
+    def test_short_clip_delay_has_floor(self, monkeypatch):
+        import stt_engine
+        from hedging import MIN_HEDGE_DELAY
+        from provider_stats import LatencyStats
+
+        stats = LatencyStats()
+        for _ in range(5):
+            stats.record("groq", 0.1, 1.0)
+        monkeypatch.setattr("provider_stats.get_latency_stats", lambda: stats)
+
+        assert stt_engine._hedge_delay("groq", 0.5) == MIN_HEDGE_DELAY
+        assert stt_engine._hedge_delay("groq", 20.0) == pytest.approx(2.0)
+
+    def test_default_delay_without_samples(self, monkeypatch):
+        import stt_engine
+        from hedging import DEFAULT_HEDGE_DELAY
+        from provider_stats import LatencyStats
+
+        stats = LatencyStats()
+        monkeypatch.setattr("provider_stats.get_latency_stats", lambda: stats)
+
+        assert stt_engine._hedge_delay("groq", 10.0) == DEFAULT_HEDGE_DELAY
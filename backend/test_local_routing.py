@@ -0,0 +1,132 @@
+"""Tests for duration-tiered local routing (Gemma 4 E2B fast path / E4B)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+class _FakeGemma:
+    """Records calls and returns a canned result."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def transcribe(self, audio_data, language, max_vocab_words=0, on_partial=None):
+        self.calls += 1
+        return dict(self.result)
+
+
+@pytest.fixture
+def router(monkeypatch):
+    import gemma4_stt
+    import stt_engine
+    from provider_stats import LatencyStats
+
+    settings = {
+        "local_fast_path": True,
+        "local_fast_path_max_duration": 5,
+        "local_fast_path_escalate": True,
+    }
+    monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+
+    tiers = {
+        "e2b": _FakeGemma({"text": "hi there", "stop_reason": "eos"}),
+        "e4b": _FakeGemma({"text": "Hi there.", "stop_reason": "eos"}),
+    }
+    monkeypatch.setattr(gemma4_stt, "get_gemma4_stt", lambda tier="e4b": tiers[tier])
+
+    stats = LatencyStats()
+    monkeypatch.setattr("provider_stats.get_latency_stats", lambda: stats)
+    return SimpleNamespace(
+        run=lambda duration: stt_engine._transcribe_local_tiered(
+            b"", "en", 0, duration
+        ),
+        settings=settings,
+        tiers=tiers,
+        stats=stats,
+    )
+
+
+class TestLocalTierRouting:
+    """stt_engine._transcribe_local_tiered() picks and escalates tiers."""
+
+    def test_short_clip_uses_fast_tier(self, router):
+        result = router.run(2.0)
+
+        assert result["model_tier"] == "e2b"
+        assert "escalated_from" not in result
+        assert router.tiers["e4b"].calls == 0
+
+    def test_long_clip_uses_full_tier(self, router):
+        result = router.run(12.0)
+
+        assert result["model_tier"] == "e4b"
+        assert router.tiers["e2b"].calls == 0
+
+    def test_fast_path_disabled(self, router):
+        router.settings["local_fast_path"] = False
+        assert router.run(2.0)["model_tier"] == "e4b"
+
+    def test_degenerate_output_escalates(self, router):
+        router.tiers["e2b"].result = {"text": "la la la", "stop_reason": "repetition"}
+        result = router.run(2.0)
+
+        assert result["model_tier"] == "e4b"
+        assert result["escalated_from"] == "e2b"
+        assert result["text"] == "Hi there."
+
+    def test_escalation_can_be_disabled(self, router):
+        router.settings["local_fast_path_escalate"] = False
+        router.tiers["e2b"].result = {"text": "", "stop_reason": "eos"}
+
+        assert router.run(2.0)["model_tier"] == "e2b"
+
+    def test_latency_recorded_per_tier(self, router):
+        router.run(2.0)
+        router.run(12.0)
+
+        summary = router.stats.summary()
+        assert summary["local:e2b"]["count"] == 1
+        assert summary["local:e4b"]["count"] == 1
+
+
+class TestDegenerateReason:
+    """Heuristics for unreliable fast-path output."""
+
+    def test_reasons(self):
+        from stt_engine import _degenerate_reason
+
+        assert _degenerate_reason({"text": "ok", "stop_reason": "eos"}, 2.0) is None
+        assert _degenerate_reason({"text": "x", "stop_reason": "max_tokens"}, 2.0)
+        assert _degenerate_reason({"text": ""}, 3.0) == "empty output"
+        assert _degenerate_reason({"text": "a" * 200}, 2.0)
+
+
+class TestLatencyStats:
+    """provider_stats.LatencyStats summaries."""
+
+    def test_percentiles_and_errors(self):
+        from provider_stats import LatencyStats
+
+        stats = LatencyStats()
+        for latency in [0.1, 0.2, 0.3, 0.4, 1.0]:
+            stats.record("groq", latency, 2.0)
+        stats.record("groq", 5.0, 2.0, ok=False)
+
+        summary = stats.summary()["groq"]
+        assert summary["count"] == 6
+        assert summary["errors"] == 1
+        assert summary["p50_ms"] == 300.0
+        assert stats.percentile("groq", 50) == pytest.approx(0.3)
+        assert stats.percentile("openai", 50) is None
+
+    def test_window_limits_samples(self):
+        from provider_stats import LatencyStats
+
+        stats = LatencyStats(window=3)
+        for latency in [9.0, 9.0, 0.1, 0.1, 0.1]:
+            stats.record("local:e4b", latency, 1.0)
+
+        assert stats.summary()["local:e4b"]["count"] == 3
+        assert stats.percentile("local:e4b", 90) == pytest.approx(0.1)
@@ -0,0 +1,131 @@
+"""Tests for the local micro-batching scheduler."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+class _Runner:
+    """Fake batch runner: blocks the first batch until released."""
+
+    def __init__(self):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, batch):
+        self.started.set()
+        if not self.batches:
+            self.release.wait(timeout=5)
+        self.batches.append([r.audio_data for r in batch])
+        return [
+            ValueError("bad clip")
+            if r.audio_data == b"bad"
+            else {"text": r.audio_data.decode()}
+            for r in batch
+        ]
+
+
+@pytest.fixture
+def runner():
+    return _Runner()
+
+
+def _submit_all(scheduler, runner, requests):
+    """Submit a blocker, queue `requests` behind it, then release the worker."""
+    with ThreadPoolExecutor(max_workers=len(requests) + 1) as pool:
+        blocker = pool.submit(scheduler.submit, b"first", "en", 0, 1.0)
+        assert runner.started.wait(timeout=5)
+        futures = [pool.submit(scheduler.submit, *args) for args in requests]
+        while len(scheduler._queue) < len(requests):
+            time.sleep(0.001)
+        runner.release.set()
+        blocker.result(timeout=5)
+        return [f.exception(timeout=5) or f.result() for f in futures]
+
+
+class TestLocalBatchScheduler:
+    """local_scheduler.LocalBatchScheduler grouping rules."""
+
+    def test_queued_requests_run_as_one_batch(self, runner):
+        from local_scheduler import LocalBatchScheduler
+
+        scheduler = LocalBatchScheduler(runner, max_batch_size=4)
+        results = _submit_all(
+            scheduler, runner, [(b"a", "en", 0, 2.0), (b"b", "en", 0, 3.0)]
+        )
+
+        assert [r["text"] for r in results] == ["a", "b"]
+        assert runner.batches == [[b"first"], [b"a", b"b"]]
+        assert scheduler.stats()["largest_batch"] == 2
+
+    def test_incompatible_requests_split(self, runner):
+        """Different language / vocab limit / over-long clips are not batched."""
+        from local_scheduler import LocalBatchScheduler
+
+        scheduler = LocalBatchScheduler(runner, max_padded_seconds=30.0)
+        _submit_all(
+            scheduler,
+            runner,
+            [
+                (b"en", "en", 0, 2.0),
+                (b"fr", "fr", 0, 2.0),
+                (b"long", "en", 0, 45.0),
+                (b"en2", "en", 0, 2.0),
+            ],
+        )
+
+        assert runner.batches[1:] == [[b"en", b"en2"], [b"fr"], [b"long"]]
+
+    def test_max_batch_size(self, runner):
+        from local_scheduler import LocalBatchScheduler
+
+        scheduler = LocalBatchScheduler(runner, max_batch_size=2)
+        _submit_all(
+            scheduler, runner, [(bytes([97 + i]), "en", 0, 1.0) for i in range(5)]
+        )
+
+        assert [len(b) for b in runner.batches[1:]] == [2, 2, 1]
+
+    def test_errors_reach_only_their_request(self, runner):
+        from local_scheduler import LocalBatchScheduler
+
+        scheduler = LocalBatchScheduler(runner)
+        results = _submit_all(
+            scheduler, runner, [(b"bad", "en", 0, 1.0), (b"ok", "en", 0, 1.0)]
+        )
+
+        assert isinstance(results[0], ValueError)
+        assert results[1] == {"text": "ok"}
+
+    def test_bad_runner_output_fails_requests_not_worker(self):
+        """A runner returning the wrong number of results fails that batch only."""
+        from local_scheduler import LocalBatchScheduler
+
+        calls = []
+
+        def run_batch(batch):
+            calls.append(len(batch))
+            return [] if len(calls) == 1 else [{"text": "ok"}] * len(batch)
+
+        scheduler = LocalBatchScheduler(run_batch)
+        with pytest.raises(RuntimeError, match="0 results"):
+            scheduler.submit(b"a", "en", 0, 1.0)
+
+        assert scheduler.submit(b"b", "en", 0, 1.0) == {"text": "ok"}
+
+    def test_window_collects_late_arrivals(self, runner):
+        """With a window, a lone request waits for a companion."""
+        from local_scheduler import LocalBatchScheduler
+
+        runner.release.set()
+        scheduler = LocalBatchScheduler(runner, window=0.5, max_batch_size=2)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(scheduler.submit, b"a", "en", 0, 1.0)
+            second = pool.submit(scheduler.submit, b"b", "en", 0, 1.0)
+            first.result(timeout=5)
+            second.result(timeout=5)
+
+        assert runner.batches == [[b"a", b"b"]]
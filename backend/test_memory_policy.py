@@ -0,0 +1,135 @@
+"""Tests for the adaptive memory-release policy."""
+
+import sys
+import threading
+from types import ModuleType
+
+import pytest
+
+
+@pytest.fixture
+def fake_mlx(monkeypatch):
+    """A loaded mlx.core stand-in with a controllable buffer cache."""
+    import memory_policy
+
+    mx = ModuleType("mlx.core")
+    mx.cache_mb = 0.0
+    mx.clears = 0
+
+    def clear_cache():
+        mx.clears += 1
+        mx.cache_mb = 0.0
+
+    mx.get_cache_memory = lambda: mx.cache_mb * memory_policy.MB
+    mx.clear_cache = clear_cache
+    monkeypatch.setitem(sys.modules, "mlx.core", mx)
+
+    rss = {"mb": 1000.0}
+    monkeypatch.setattr(memory_policy, "current_rss_mb", lambda: rss["mb"])
+    mx.rss = rss
+    return mx
+
+
+class TestMemoryPolicy:
+    """memory_policy.MemoryPolicy release decisions."""
+
+    def test_below_high_water_skips(self, fake_mlx):
+        from memory_policy import MemoryPolicy
+
+        policy = MemoryPolicy(rss_high_mb=4000, cache_high_mb=512)
+        fake_mlx.cache_mb = 100
+
+        assert policy.after_request() is False
+        assert fake_mlx.clears == 0
+        assert policy.skipped == 1
+
+    def test_cache_high_water_releases(self, fake_mlx):
+        from memory_policy import MemoryPolicy
+
+        policy = MemoryPolicy(rss_high_mb=4000, cache_high_mb=512)
+        policy.after_request()
+        policy.after_request()
+        fake_mlx.cache_mb = 900
+
+        assert policy.after_request() is True
+        assert fake_mlx.clears == 1
+        assert policy.reclaimed_mb == pytest.approx(900)
+
+    def test_rss_high_water_releases(self, fake_mlx):
+        from memory_policy import MemoryPolicy
+
+        policy = MemoryPolicy(rss_high_mb=4000)
+        fake_mlx.rss["mb"] = 5000
+
+        assert policy.after_request() is True
+
+    def test_release_reports_skipped_requests(self, fake_mlx):
+        from memory_policy import MemoryPolicy
+
+        policy = MemoryPolicy(rss_high_mb=4000)
+        for _ in range(3):
+            policy.after_request()
+
+        assert policy.release("test")["skipped"] == 3
+        assert policy.release("test")["skipped"] == 0
+
+    def test_self_releasing_requests_not_counted(self, fake_mlx):
+        """Gemma 4 requests: mlx-vlm already clears the cache, nothing saved."""
+        from memory_policy import MemoryPolicy
+
+        policy = MemoryPolicy(rss_high_mb=4000)
+        policy.after_request(count_skip=False)
+
+        assert policy.skipped == 0
+        assert policy.release("test")["skipped"] == 0
+        assert policy.stats()["est_saved_ms"] == 0
+
+    def test_idle_releases_once_per_idle_spell(self, fake_mlx):
+        from memory_policy import MemoryPolicy
+
+        policy = MemoryPolicy(rss_high_mb=4000)
+        policy.on_idle()
+        policy.on_idle()
+        assert fake_mlx.clears == 1
+
+        policy.after_request()
+        policy.on_idle()
+        assert fake_mlx.clears == 2
+
+    def test_without_mlx_only_gc(self, monkeypatch):
+        """Processes that never loaded MLX (cloud-only, hotkey client) just GC."""
+        import memory_policy
+
+        monkeypatch.delitem(sys.modules, "mlx.core", raising=False)
+        assert memory_policy.mlx_cache_mb() == 0.0
+        memory_policy.MemoryPolicy().release("test")
+        assert "mlx.core" not in sys.modules
+
+    def test_current_rss_is_positive(self):
+        from memory_policy import current_rss_mb
+
+        assert current_rss_mb() > 0
+
+
+class TestSchedulerIdleHook:
+    """LocalBatchScheduler runs on_idle on its worker once the queue goes quiet."""
+
+    def test_on_idle_called_on_worker(self):
+        from local_scheduler import LocalBatchScheduler
+
+        idle = threading.Event()
+        threads = []
+
+        def on_idle():
+            threads.append(threading.current_thread().name)
+            idle.set()
+
+        scheduler = LocalBatchScheduler(
+            lambda batch: [{"text": ""} for _ in batch],
+            on_idle=on_idle,
+            idle_seconds=0.05,
+        )
+        scheduler.submit(b"a", "en", 0, 1.0)
+
+        assert idle.wait(timeout=5)
+        assert threads == ["local-batch"]
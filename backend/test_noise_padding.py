@@ -0,0 +1,102 @@
+"""Tests for noise padding (add_noise_padding / pad_samples_with_noise in audio_utils)."""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+
+def _wav(samples: np.ndarray) -> bytes:
+    from audio_utils import _rebuild_wav
+
+    return _rebuild_wav(samples)
+
+
+class TestAddNoisePadding:
+    """Unit tests for audio_utils.add_noise_padding()."""
+
+    def test_layout_and_header(self):
+        """Output is a valid WAV: 200ms noise, untouched signal, 300ms noise."""
+        from audio_utils import add_noise_padding
+
+        signal = np.arange(-8000, 8000, 2, dtype=np.int16)
+        padded = add_noise_padding(_wav(signal), pre_ms=200, post_ms=300)
+
+        assert isinstance(padded, bytearray)
+        with wave.open(io.BytesIO(padded), "rb") as f:
+            assert f.getframerate() == 16000
+            assert f.getnchannels() == 1
+            out = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+
+        assert len(out) == 3200 + len(signal) + 4800
+        np.testing.assert_array_equal(out[3200 : 3200 + len(signal)], signal)
+
+    def test_noise_statistics(self):
+        """Padding is zero-mean noise at the requested amplitude."""
+        from audio_utils import add_noise_padding
+
+        padded = add_noise_padding(
+            _wav(np.zeros(100, dtype=np.int16)), pre_ms=1000, post_ms=1000
+        )
+        noise = np.frombuffer(padded, dtype=np.int16, offset=44)[:16000].astype(float)
+
+        assert abs(noise.mean()) < 2
+        assert 25 < noise.std() < 35
+
+    def test_padding_varies_between_calls(self):
+        """Each call takes a different slice of the noise pool."""
+        from audio_utils import add_noise_padding
+
+        wav = _wav(np.zeros(100, dtype=np.int16))
+        first = add_noise_padding(wav)
+        second = add_noise_padding(wav)
+        assert first != second
+
+    def test_header_only_input_returned_unchanged(self):
+        """Input with no samples is passed through."""
+        from audio_utils import add_noise_padding
+
+        header_only = _wav(np.zeros(0, dtype=np.int16))
+        assert add_noise_padding(header_only) == header_only
+
+
+class TestPadSamplesWithNoise:
+    """Unit tests for audio_utils.pad_samples_with_noise()."""
+
+    def test_writes_into_preallocated_output(self):
+        """The provided buffer is filled in place and returned."""
+        from audio_utils import pad_samples_with_noise
+
+        signal = np.full(50, 1234, dtype=np.int16)
+        out = np.zeros(10 + 50 + 20, dtype=np.int16)
+        result = pad_samples_with_noise(signal, 10, 20, out=out)
+
+        assert result is out
+        np.testing.assert_array_equal(out[10:60], signal)
+
+    def test_leading_and_trailing_noise_differ(self):
+        """Pre and post padding come from different parts of the pool."""
+        from audio_utils import pad_samples_with_noise
+
+        for _ in range(20):
+            result = pad_samples_with_noise(np.zeros(10, dtype=np.int16), 3200, 3200)
+            assert not np.array_equal(result[:3200], result[-3200:])
+
+    def test_wrong_output_size_raises(self):
+        """A buffer of the wrong length is rejected."""
+        from audio_utils import pad_samples_with_noise
+
+        with pytest.raises(ValueError, match="expected"):
+            pad_samples_with_noise(
+                np.zeros(10, dtype=np.int16), 5, 5, out=np.zeros(19, dtype=np.int16)
+            )
+
+    def test_padding_longer_than_pool(self):
+        """Padding longer than the precomputed pool still works."""
+        from audio_utils import NOISE_POOL_SECONDS, SAMPLE_RATE, pad_samples_with_noise
+
+        pre = (NOISE_POOL_SECONDS + 1) * SAMPLE_RATE
+        result = pad_samples_with_noise(np.zeros(10, dtype=np.int16), pre, 0)
+        assert len(result) == pre + 10
+        assert result[:pre].std() > 0
@@ -0,0 +1,207 @@
+"""Tests for warming providers up when recording starts."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+
+class _FakeCloud:
+    def __init__(self):
+        self.prewarms = 0
+
+    async def prewarm(self):
+        self.prewarms += 1
+
+
+@pytest.fixture
+def warm(monkeypatch):
+    import stt_engine
+    from prewarm import Prewarmer
+
+    settings = {
+        "auto_include_local": False,
+        "breaker_failure_threshold": 3,
+        "breaker_reset_s": 30,
+    }
+    monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+    monkeypatch.setattr(stt_engine, "_breakers", {})
+    clouds = {"groq": _FakeCloud(), "gemini": _FakeCloud()}
+    monkeypatch.setattr(stt_engine, "_cloud_stt", clouds.get)
+    local_calls = []
+    monkeypatch.setattr(stt_engine, "prewarm_local", local_calls.append)
+
+    prewarmer = Prewarmer(min_interval=60)
+    return prewarmer, clouds, local_calls
+
+
+class TestPrewarmer:
+    """prewarm.Prewarmer picks what to warm and throttles connections."""
+
+    def test_cloud_connection_warmed_once_per_interval(self, warm):
+        prewarmer, clouds, local_calls = warm
+
+        asyncio.run(prewarmer.prewarm("groq", "en"))
+        asyncio.run(prewarmer.prewarm("groq", "en"))
+
+        assert clouds["groq"].prewarms == 1
+        assert clouds["gemini"].prewarms == 0
+        assert local_calls == []
+        assert prewarmer.stats()["skipped_recent"] == 1
+
+    def test_local_provider_queues_local_prewarm(self, warm):
+        prewarmer, clouds, local_calls = warm
+
+        asyncio.run(prewarmer.prewarm("local", "fr"))
+
+        assert local_calls == ["fr"]
+        assert clouds["groq"].prewarms == 0
+
+    def test_auto_warms_every_candidate(self, warm):
+        prewarmer, clouds, _ = warm
+
+        asyncio.run(prewarmer.prewarm("auto", None))
+
+        assert clouds["groq"].prewarms == 1
+        assert clouds["gemini"].prewarms == 1
+
+    def test_failed_connection_retried_next_time(self, warm):
+        prewarmer, clouds, _ = warm
+
+        async def fail():
+            raise httpx.ConnectError("offline")
+
+        clouds["groq"].prewarm = fail
+        asyncio.run(prewarmer.prewarm("groq", None))
+        assert prewarmer.stats()["connection_errors"] == 1
+
+        clouds["groq"].prewarm = _FakeCloud().prewarm
+        asyncio.run(prewarmer.prewarm("groq", None))
+        assert prewarmer.stats()["connections"] == 1
+
+
+class TestPrewarmLocal:
+    """stt_engine.prewarm_local() builds the prompts requests will look up."""
+
+    def test_warms_normal_and_short_clip_prompts(self, monkeypatch):
+        from types import SimpleNamespace
+
+        import gemma4_stt
+        import stt_engine
+
+        settings = {
+            "local_fast_path": False,
+            "short_clip_language_override": "en",
+            "short_clip_vocab_limit": 20,
+        }
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        monkeypatch.setattr(
+            stt_engine,
+            "get_local_scheduler",
+            lambda: SimpleNamespace(prewarm=lambda task: task()),
+        )
+        prepared = []
+        monkeypatch.setattr(gemma4_stt, "is_gemma4_available", lambda: True)
+        monkeypatch.setattr(
+            gemma4_stt,
+            "get_gemma4_stt",
+            lambda tier: SimpleNamespace(
+                prepare=lambda language, max_words: prepared.append(
+                    (tier, language, max_words)
+                )
+            ),
+        )
+
+        stt_engine.prewarm_local(None)
+
+        assert prepared == [("e4b", None, 0), ("e4b", "en", 20)]
+
+        prepared.clear()
+        stt_engine.prewarm_local("fr")
+
+        assert prepared == [("e4b", "fr", 0), ("e4b", "fr", 20)]
+
+
+class TestSchedulerPrewarm:
+    """LocalBatchScheduler.prewarm() runs tasks on the worker thread first."""
+
+    def test_task_runs_on_worker_before_request(self):
+        from local_scheduler import LocalBatchScheduler
+
+        order = []
+
+        def run_batch(requests):
+            order.append(("batch", threading.current_thread().name))
+            return [{"text": "ok"} for _ in requests]
+
+        scheduler = LocalBatchScheduler(run_batch)
+        scheduler.prewarm(
+            lambda: order.append(("prewarm", threading.current_thread().name))
+        )
+        scheduler.submit(b"", "en", 0, 1.0)
+
+        assert order == [("prewarm", "local-batch"), ("batch", "local-batch")]
+        assert scheduler.stats()["prewarms"] == 1
+
+    def test_failing_task_does_not_stop_worker(self):
+        from local_scheduler import LocalBatchScheduler
+
+        def boom():
+            raise RuntimeError("model download failed")
+
+        scheduler = LocalBatchScheduler(lambda requests: [{"text": "ok"}])
+        scheduler.prewarm(boom)
+
+        assert scheduler.submit(b"", "en", 0, 1.0) == {"text": "ok"}
+
+
+class TestStatusEndpoint:
+    """POST /api/status {recording: true} starts a prewarm."""
+
+    def test_recording_start_triggers_prewarm(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        import main
+
+        calls = []
+
+        class FakePrewarmer:
+            async def prewarm(self, provider, language):
+                calls.append(provider)
+
+        monkeypatch.setattr(main, "get_prewarmer", FakePrewarmer)
+        monkeypatch.setattr(
+            main.settings, "get_setting", lambda key: key == "prewarm_on_record"
+        )
+        monkeypatch.setattr(main.settings, "get_stt_provider", lambda: "groq")
+        monkeypatch.setattr(main.settings, "get_language", lambda: None)
+        client = TestClient(main.app)
+
+        client.post("/api/status", json={"recording": True})
+        client.post("/api/status", json={"recording": False})
+
+        assert calls == ["groq"]
+
+
+class TestCloudPrewarmRequest:
+    """A client's prewarm() opens a connection to its API host."""
+
+    def test_groq_prewarm_hits_api_host(self, monkeypatch):
+        import groq_stt
+
+        monkeypatch.setenv("GROQ_API_KEY", "test-key")
+        seen = []
+
+        def handler(request):
+            seen.append((request.method, request.url.host))
+            return httpx.Response(404)
+
+        async def main():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            monkeypatch.setattr(groq_stt, "get_async_http_client", lambda: client)
+            await groq_stt.GroqSTT().prewarm()
+
+        asyncio.run(main())
+
+        assert seen == [("HEAD", "api.groq.com")]
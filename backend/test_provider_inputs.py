@@ -0,0 +1,148 @@
+"""Tests for in-memory audio inputs (no temp files) and provider capability metadata."""
+
+import tempfile
+
+import numpy as np
+import pytest
+
+
+class TestSampleConversions:
+    """Unit tests for audio_utils.as_int16_samples() / as_float32_samples()."""
+
+    def test_wav_bytes_to_int16_view(self):
+        """WAV bytes decode to the original int16 samples."""
+        from audio_utils import _rebuild_wav, as_int16_samples
+
+        samples = np.array([0, 1000, -1000, 32767, -32768], dtype=np.int16)
+        np.testing.assert_array_equal(as_int16_samples(_rebuild_wav(samples)), samples)
+
+    def test_float32_scaling_matches_wav_loaders(self):
+        """float32 output is int16 / 32768, like miniaudio/ffmpeg loaders."""
+        from audio_utils import _rebuild_wav, as_float32_samples
+
+        samples = np.array([0, 16384, -32768], dtype=np.int16)
+        result = as_float32_samples(_rebuild_wav(samples))
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, [0.0, 0.5, -1.0])
+
+    def test_float32_array_passes_through(self):
+        """An array that is already float32 is returned as-is."""
+        from audio_utils import as_float32_samples
+
+        audio = np.zeros(10, dtype=np.float32)
+        assert as_float32_samples(audio) is audio
+
+    def test_float_array_to_int16(self):
+        """Float arrays are scaled back to int16 and clipped."""
+        from audio_utils import as_int16_samples
+
+        result = as_int16_samples(np.array([0.5, -1.0, 1.5], dtype=np.float32))
+        np.testing.assert_array_equal(result, [16384, -32768, 32767])
+
+
+class TestCloudUploadsInMemory:
+    """SDK providers upload an in-memory file instead of a temp file."""
+
+    @pytest.fixture
+    def no_temp_files(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("temp file created")
+
+        monkeypatch.setattr(tempfile, "NamedTemporaryFile", fail)
+
+    @pytest.mark.parametrize(
+        "module_name, class_name, env_var",
+        [
+            ("groq_stt", "GroqSTT", "GROQ_API_KEY"),
+            ("openai_stt", "OpenAISTT", "OPENAI_API_KEY"),
+        ],
+    )
+    def test_upload_is_file_object(
+        self, monkeypatch, no_temp_files, module_name, class_name, env_var
+    ):
+        import importlib
+        from types import SimpleNamespace
+
+        from audio_utils import _rebuild_wav
+
+        module = importlib.import_module(module_name)
+        monkeypatch.setenv(env_var, "test-key")
+        monkeypatch.setattr(module, "get_setting", lambda key: False)
+
+        uploads = []
+
+        def create(**params):
+            uploads.append(params["file"])
+            response = SimpleNamespace(text="hello", duration=1.0, language="en")
+            return SimpleNamespace(headers={}, parse=lambda: response)
+
+        stt = getattr(module, class_name)()
+        raw = SimpleNamespace(create=create)
+        stt.client = SimpleNamespace(
+            audio=SimpleNamespace(transcriptions=SimpleNamespace(with_raw_response=raw))
+        )
+        wav = _rebuild_wav(np.zeros(16000, dtype=np.int16))
+
+        result = stt.transcribe(wav, "en")
+
+        assert result["text"] == "hello"
+        name, file_obj, mime = uploads[0]
+        assert name == "audio.wav"
+        assert mime == "audio/wav"
+        assert file_obj.read() == wav
+
+
+class TestRouterHandsWhisperArrays:
+    """The router gives lightning-whisper-mlx the preprocessed float32 array."""
+
+    def test_local_whisper_receives_float32(self, monkeypatch):
+        import audio_utils
+        import gemma4_stt
+        import stt_engine
+        from audio_utils import _rebuild_wav
+        from settings import _get_defaults
+
+        settings = {**_get_defaults(), "save_debug_audio": False}
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        monkeypatch.setattr(audio_utils, "get_setting", settings.get)
+        monkeypatch.setattr(audio_utils, "get_min_volume_rms", lambda: 0)
+        monkeypatch.setattr(stt_engine, "get_stt_provider", lambda: "local")
+        monkeypatch.setattr(gemma4_stt, "is_gemma4_available", lambda: False)
+
+        received = []
+
+        class FakeScheduler:
+            def submit(self, audio, language, max_vocab_words, duration, on_partial):
+                received.append(audio)
+                return {"text": "hi", "language": "en"}
+
+        monkeypatch.setattr(stt_engine, "get_local_scheduler", FakeScheduler)
+        samples = (np.sin(np.arange(16000) / 10) * 3000).astype(np.int16)
+
+        result = stt_engine._transcribe_uncached(_rebuild_wav(samples), "en")
+
+        assert result["provider"] == "local"
+        assert received[0].dtype == np.float32
+        assert len(received[0]) == len(samples)
+
+
+class TestProviderCapabilities:
+    """Every provider declares which audio input forms it accepts."""
+
+    def test_all_providers_declare_input_forms(self):
+        from stt_engine import STTEngine, get_provider_capabilities
+
+        capabilities = get_provider_capabilities()
+        assert set(capabilities) == {"local", "openai", "groq", "gemini", "simulated"}
+        for name, caps in capabilities.items():
+            assert "wav_bytes" in caps["input_forms"], name
+            assert caps["backend_input"], name
+
+        assert "float32_array" in STTEngine.CAPABILITIES["input_forms"]
+
+    def test_mlx_providers_take_arrays(self):
+        from gemma4_stt import Gemma4STT
+        from stt_engine import STTEngine
+
+        for cls in (Gemma4STT, STTEngine):
+            assert cls.CAPABILITIES["backend_input"] == "float32_array"
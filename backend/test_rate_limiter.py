@@ -0,0 +1,287 @@
+"""Tests for per-provider rate limiting."""
+
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def limiter():
+    from rate_limit import ProviderLimiter
+
+    clock = _Clock()
+    limiter = ProviderLimiter("groq", clock=clock)
+    limiter.configure(requests_per_minute=60, audio_seconds_per_hour=3600)
+    return SimpleNamespace(limiter=limiter, clock=clock)
+
+
+class TestParseReset:
+    @pytest.mark.parametrize(
+        ("value", "seconds"),
+        [
+            ("2", 2.0),
+            ("7.66s", 7.66),
+            ("6m0s", 360.0),
+            ("2m59.56s", 179.56),
+            ("120ms", 0.12),
+            ("1h", 3600.0),
+            ("", None),
+            ("soon", None),
+        ],
+    )
+    def test_formats(self, value, seconds):
+        from rate_limit import parse_reset
+
+        result = parse_reset(value)
+        assert result == pytest.approx(seconds) if seconds else result is None
+
+
+class TestProviderLimiter:
+    """rate_limit.ProviderLimiter paces requests against both budgets."""
+
+    def test_burst_then_paced(self, limiter):
+        for _ in range(60):
+            assert limiter.limiter.reserve(1.0) == 0
+
+        # Quota used: the next request waits until the first leaves the window
+        limiter.clock.t = 10
+        assert limiter.limiter.reserve(1.0) == pytest.approx(50)
+        # Reservations queue behind each other
+        limiter.clock.t = 30
+        assert limiter.limiter.reserve(1.0) == pytest.approx(30)
+
+    def test_audio_budget_limits_long_recordings(self, limiter):
+        assert limiter.limiter.reserve(3000) == 0
+        assert limiter.limiter.peek(600) == 0
+        # 900s doesn't fit until the first recording leaves the hour
+        assert limiter.limiter.peek(900) == pytest.approx(3600)
+
+    def test_over_max_wait_reserves_nothing(self, limiter):
+        for _ in range(60):
+            limiter.limiter.reserve(1.0)
+
+        assert limiter.limiter.reserve(1.0, max_wait=5) is None
+        assert limiter.limiter.peek(1.0) == pytest.approx(60)
+        assert limiter.limiter.stats()["rerouted"] == 1
+
+    def test_unconfigured_is_unlimited(self):
+        from rate_limit import ProviderLimiter
+
+        unlimited = ProviderLimiter("openai")
+        assert all(unlimited.reserve(60.0) == 0 for _ in range(1000))
+
+    def test_unconfigured_ignores_429_and_headers(self):
+        """Rate limiting off: a 429 or exhausted header never delays requests."""
+        from rate_limit import ProviderLimiter
+
+        unlimited = ProviderLimiter("groq")
+        assert unlimited.on_rate_limited({"retry-after": "300"}) == 0
+        unlimited.observe_headers(
+            {
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "6h0m0s",
+            }
+        )
+
+        assert unlimited.reserve(1.0) == 0
+        assert unlimited.stats()["throttled"] == 1
+
+    def test_disabling_clears_backoff(self, limiter):
+        limiter.limiter.on_rate_limited({"retry-after": "300"})
+        limiter.limiter.configure(0, 0)
+
+        assert limiter.limiter.reserve(1.0) == 0
+
+    def test_headers_cap_remaining_budget(self, limiter):
+        limiter.limiter.observe_headers({"x-ratelimit-remaining-requests": "1"})
+
+        assert limiter.limiter.reserve(1.0) == 0
+        assert limiter.limiter.peek(1.0) == pytest.approx(60)
+
+    def test_exhausted_headers_block_until_reset(self, limiter):
+        limiter.limiter.observe_headers(
+            {
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "7.5s",
+            }
+        )
+
+        assert limiter.limiter.peek(1.0) == pytest.approx(7.5)
+
+    def test_429_backs_off_for_retry_after(self, limiter):
+        backoff = limiter.limiter.on_rate_limited({"retry-after": "12"})
+
+        assert backoff == 12
+        assert limiter.limiter.peek(1.0) == pytest.approx(12)
+        limiter.clock.t = 12
+        assert limiter.limiter.peek(1.0) == 0
+
+    def test_sustained_load_stays_at_quota(self, limiter):
+        """Ten minutes of back-to-back requests: no 429s, ~quota throughput."""
+        quota = 60
+        window = deque()  # Provider side: sliding 60s window of request times
+        sent = rejected = 0
+
+        while True:
+            limiter.clock.t += limiter.limiter.reserve(1.0)
+            if limiter.clock.t >= 600:
+                break
+            while window and window[0] <= limiter.clock.t - 60:
+                window.popleft()
+            if len(window) >= quota:
+                rejected += 1
+                limiter.limiter.on_rate_limited({})
+                continue
+            window.append(limiter.clock.t)
+            sent += 1
+
+        assert rejected == 0
+        assert sent == quota * 10
+
+
+@pytest.fixture
+def router_settings():
+    return {
+        "fallback_order": "gemini,local",
+        "rate_limit_enabled": True,
+        "groq_requests_per_minute": 1,
+        "rate_limit_max_wait_s": 1.0,
+    }
+
+
+class TestRouterRateLimits:
+    """The router queues or reroutes requests for providers over quota."""
+
+    def test_over_quota_reroutes_down_the_chain(self, router):
+        first = router.engine.transcribe_audio_with_provider(router.wav, "en")
+        second = router.engine.transcribe_audio_with_provider(router.wav, "en")
+
+        assert first["provider"] == "groq"
+        assert second["provider"] == "gemini"
+        assert second["failover_from"] == "groq"
+        assert router.calls == ["groq", "gemini"]
+
+    def test_429_backs_off_without_tripping_breaker(self, router):
+        import rate_limit
+
+        error = RuntimeError("rate limited")
+        error.status_code = 429
+        error.response = SimpleNamespace(headers={"retry-after": "30"})
+        router.clouds["groq"] = router.cloud_cls("groq", error=error)
+        router.settings["groq_requests_per_minute"] = 0
+        router.settings["breaker_failure_threshold"] = 1
+
+        result = router.engine.transcribe_audio_with_provider(router.wav, "en")
+
+        assert result["provider"] == "gemini"
+        assert router.engine.breaker_states()["groq"]["state"] == "closed"
+        limiter = rate_limit.get_rate_limiter("groq")
+        assert limiter.stats()["throttled"] == 1
+        assert limiter.peek(1.0) > 25
+
+    def test_hedge_reserves_budget_and_never_queues(self, router):
+        engine, groq = router.engine, router.clouds["groq"]
+
+        engine._call_hedge("groq", groq, router.wav, "en", 0, 1.0)
+        with pytest.raises(RuntimeError, match="hedge not sent"):
+            engine._call_hedge("groq", groq, router.wav, "en", 0, 1.0)
+
+        assert router.calls == ["groq"]
+
+    def test_breaker_probe_reserves_budget(self, router):
+        router.engine._probe_provider("groq")
+        with pytest.raises(RuntimeError, match="probe not sent"):
+            router.engine._probe_provider("groq")
+
+        assert router.calls == ["groq"]
+
+    def test_disabled_by_default(self, router):
+        from settings import _get_defaults
+
+        router.settings["rate_limit_enabled"] = _get_defaults()["rate_limit_enabled"]
+
+        router.engine._probe_provider("groq")
+        router.engine._probe_provider("groq")
+
+        assert router.calls == ["groq", "groq"]
+
+    def test_last_provider_over_quota_fails_fast(self, router):
+        from rate_limit import RateLimitedError
+
+        router.settings["fallback_order"] = ""
+        router.engine.transcribe_audio_with_provider(router.wav, "en")
+
+        start = time.monotonic()
+        with pytest.raises(RateLimitedError):
+            router.engine.transcribe_audio_with_provider(router.wav, "en")
+        assert time.monotonic() - start < 1.0
+        assert router.calls == ["groq"]
+
+    def test_default_settings_never_wait_after_429(self, router):
+        """With the defaults a 429 is returned, not slept out on later requests."""
+        from settings import _get_defaults
+
+        defaults = _get_defaults()
+        router.settings["rate_limit_enabled"] = defaults["rate_limit_enabled"]
+        router.settings["fallback_order"] = defaults["fallback_order"]
+        error = RuntimeError("rate limited")
+        error.status_code = 429
+        error.response = SimpleNamespace(headers={"retry-after": "300"})
+        router.clouds["groq"] = router.cloud_cls("groq", error=error)
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            router.engine.transcribe_audio_with_provider(router.wav, "en")
+
+        router.clouds["groq"] = router.cloud_cls("groq")
+        start = time.monotonic()
+        result = router.engine.transcribe_audio_with_provider(router.wav, "en")
+        assert result["provider"] == "groq"
+        assert time.monotonic() - start < 1.0
+
+
+class TestClientHeaders:
+    """Groq/OpenAI clients feed x-ratelimit-* headers to the limiter."""
+
+    def test_groq_response_headers_update_limiter(self, monkeypatch):
+        from groq import Groq
+
+        import groq_stt
+        import rate_limit
+        from audio_utils import _rebuild_wav
+
+        monkeypatch.setenv("GROQ_API_KEY", "test-key")
+        monkeypatch.setattr(groq_stt, "get_setting", lambda key: False)
+        monkeypatch.setattr(rate_limit, "_limiters", {})
+        rate_limit.get_rate_limiter("groq").configure(20, 7200)
+
+        def handler(request):
+            return httpx.Response(
+                200,
+                json={"text": "hello", "language": "english", "duration": 1.0},
+                headers={
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": "20s",
+                },
+            )
+
+        stt = groq_stt.GroqSTT()
+        stt.client = Groq(
+            api_key="test-key",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+        result = stt.transcribe(_rebuild_wav(np.zeros(16000, dtype=np.int16)), "en")
+
+        assert result["text"] == "hello"
+        assert rate_limit.get_rate_limiter("groq").peek(1.0) > 15
@@ -203,3 +203,150 @@ class TestResampleWithDebugAudio:
                 f"{wav_path.name}: duration mismatch "
                 f"{original_duration:.3f}s vs {result_duration:.3f}s"
             )
+
+
+class TestStreamingResampler:
+    """Chunked StreamingResampler output must match one-shot resample_to_16k()."""
+
+    @staticmethod
+    def _stream(audio, rate, chunk_sizes):
+        from audio_utils import StreamingResampler
+
+        resampler = StreamingResampler(rate)
+        parts, i, n = [], 0, 0
+        while i < len(audio):
+            size = chunk_sizes[n % len(chunk_sizes)]
+            parts.append(resampler.process(audio[i : i + size]))
+            i += size
+            n += 1
+        parts.append(resampler.flush())
+        return np.concatenate(parts)
+
+    @pytest.mark.parametrize("rate", [48000, 44100, 96000, 22050])
+    @pytest.mark.parametrize("chunk_sizes", [[512], [1], [1000, 7, 333, 4096]])
+    def test_chunked_matches_one_shot(self, rate, chunk_sizes):
+        """Any chunking gives bit-identical output to the one-shot path."""
+        from audio_utils import resample_to_16k
+
+        rng = np.random.default_rng(rate)
+        n = rate // 5 if chunk_sizes == [1] else rate * 2 + 17
+        audio = (rng.standard_normal(n) * 8000).astype(np.int16)
+
+        streamed = self._stream(audio, rate, chunk_sizes)
+        np.testing.assert_array_equal(streamed, resample_to_16k(audio, rate))
+
+    def test_sounddevice_shaped_chunks(self):
+        """(frames, 1) chunks from the input stream callback are accepted."""
+        from audio_utils import StreamingResampler, resample_to_16k
+
+        t = np.arange(48000) / 48000.0
+        audio = (np.sin(2 * np.pi * 440 * t) * 16000).astype(np.int16)
+        resampler = StreamingResampler(48000)
+        parts = [resampler.process(c.reshape(-1, 1)) for c in np.split(audio, 100)]
+        parts.append(resampler.flush())
+        np.testing.assert_array_equal(
+            np.concatenate(parts), resample_to_16k(audio, 48000)
+        )
+
+    def test_short_input_matches_one_shot(self):
+        """Input shorter than the filter still matches (output all from flush)."""
+        from audio_utils import resample_to_16k
+
+        audio = np.array([1000, -1000, 500, -500, 200], dtype=np.int16)
+        streamed = self._stream(audio, 48000, [2])
+        np.testing.assert_array_equal(streamed, resample_to_16k(audio, 48000))
+
+    def test_passthrough_at_16k(self):
+        """At the target rate, chunks come back unchanged."""
+        from audio_utils import StreamingResampler
+
+        resampler = StreamingResampler(16000)
+        chunk = np.array([100, -200, 300], dtype=np.int16)
+        np.testing.assert_array_equal(resampler.process(chunk), chunk)
+        assert len(resampler.flush()) == 0
+
+    def test_reusable_after_flush(self):
+        """flush() resets state so the next recording starts clean."""
+        from audio_utils import StreamingResampler, resample_to_16k
+
+        rng = np.random.default_rng(0)
+        first = (rng.standard_normal(4800) * 8000).astype(np.int16)
+        second = (rng.standard_normal(9600) * 8000).astype(np.int16)
+        resampler = StreamingResampler(48000)
+        resampler.process(first)
+        resampler.flush()
+
+        out = np.concatenate([resampler.process(second), resampler.flush()])
+        np.testing.assert_array_equal(out, resample_to_16k(second, 48000))
+
+    def test_invalid_rate_raises(self):
+        """Non-positive rates raise ValueError like resample_to_16k()."""
+        from audio_utils import StreamingResampler
+
+        with pytest.raises(ValueError, match="positive"):
+            StreamingResampler(0)
+
+
+class TestResamplePrecision:
+    """Cached filter design and float32 accuracy limits for resample_to_16k()."""
+
+    @pytest.mark.parametrize("rate", [44100, 48000, 96000])
+    def test_float64_matches_resample_poly(self, rate):
+        """Default path is bit-identical to scipy's resample_poly."""
+        from scipy.signal import resample_poly
+
+        from audio_utils import resample_to_16k
+
+        rng = np.random.default_rng(rate)
+        audio = (rng.standard_normal(rate) * 8000).astype(np.int16)
+        expected = resample_poly(audio.astype(np.float64), 16000, rate)
+        np.clip(expected, -32768, 32767, out=expected)
+
+        np.testing.assert_array_equal(
+            resample_to_16k(audio, rate), expected.astype(np.int16)
+        )
+
+    @pytest.mark.parametrize("rate", [44100, 48000, 96000])
+    def test_float32_within_one_lsb(self, rate):
+        """float32 path differs from float64 by at most 1 LSB, on <1% of samples."""
+        from audio_utils import resample_to_16k
+
+        rng = np.random.default_rng(rate)
+        audio = (rng.standard_normal(rate * 2) * 8000).astype(np.int16)
+        ref = resample_to_16k(audio, rate).astype(np.int32)
+        fast = resample_to_16k(audio, rate, dtype=np.float32)
+
+        assert fast.dtype == np.int16
+        assert len(fast) == len(ref)
+        diff = np.abs(fast.astype(np.int32) - ref)
+        assert diff.max() <= 1
+        assert np.mean(diff > 0) < 0.01
+
+    def test_float32_clips_full_scale(self):
+        """Filter overshoot past int16 range clips like the float64 path."""
+        from scipy.signal import resample_poly
+
+        from audio_utils import resample_to_16k
+
+        # 100 Hz full-scale square wave: the filter rings past +/-32768
+        t = np.arange(48000)
+        audio = np.where((t // 240) % 2 == 0, 32767, -32768).astype(np.int16)
+        unclipped = resample_poly(audio.astype(np.float64), 16000, 48000)
+        overshoot = (unclipped > 32768) | (unclipped < -32769)
+        assert overshoot.sum() > 100
+
+        ref = resample_to_16k(audio, 48000)
+        fast = resample_to_16k(audio, 48000, dtype=np.float32)
+
+        np.testing.assert_array_equal(fast[overshoot], ref[overshoot])
+        assert set(np.unique(fast[overshoot])) == {-32768, 32767}
+        assert np.abs(fast.astype(np.int32) - ref).max() <= 1
+
+    def test_filter_taps_cached_and_read_only(self):
+        """Filter design runs once per rate pair and can't be mutated by callers."""
+        from audio_utils import _polyphase_filter
+
+        taps, _ = _polyphase_filter(160, 441)
+        again, _ = _polyphase_filter(160, 441)
+        assert taps is again
+        assert not taps.flags.writeable
@@ -0,0 +1,201 @@
+"""Tests for the transcription result cache (result_cache.py)."""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+
+def _result(text: str) -> dict:
+    return {"text": text, "language": "en", "provider": "test"}
+
+
+class TestResultCache:
+    """Unit tests for result_cache.ResultCache."""
+
+    def test_hit_after_miss(self):
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return _result("hello")
+
+        first, status1 = cache.get_or_compute("k", compute)
+        second, status2 = cache.get_or_compute("k", compute)
+
+        assert (status1, status2) == ("miss", "hit")
+        assert first == second
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_returned_results_are_copies(self):
+        """Callers can annotate a hit without corrupting the cached entry."""
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+        cache.get_or_compute("k", lambda: _result("hello"))
+        hit, _ = cache.get_or_compute("k", lambda: _result("other"))
+        hit["text"] = "modified"
+
+        again, _ = cache.get_or_compute("k", lambda: _result("other"))
+        assert again["text"] == "hello"
+
+    def test_lru_eviction_under_memory_cap(self):
+        """Least-recently-used entries are dropped once the cap is exceeded."""
+        from result_cache import ENTRY_OVERHEAD_BYTES, ResultCache
+
+        cache = ResultCache(max_bytes=3 * (ENTRY_OVERHEAD_BYTES + 100))
+        for key in ("a", "b", "c"):
+            cache.get_or_compute(key, lambda: _result("x"))
+        cache.get_or_compute("a", lambda: _result("x"))  # Touch "a"
+        cache.get_or_compute("d", lambda: _result("x"))
+
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+        _, status_a = cache.get_or_compute("a", lambda: _result("x"))
+        _, status_b = cache.get_or_compute("b", lambda: _result("x"))
+        assert status_a == "hit"
+        assert status_b == "miss"
+
+    def test_concurrent_identical_requests_coalesce(self):
+        """Only one inference runs for simultaneous identical requests."""
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+        calls = []
+        statuses = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return _result("shared")
+
+        def worker():
+            result, status = cache.get_or_compute("k", compute)
+            assert result["text"] == "shared"
+            statuses.append(status)
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert sorted(statuses) == ["coalesced"] * 4 + ["miss"]
+
+    def test_errors_are_not_cached(self):
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+
+        def fail():
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute("k", fail)
+
+        result, status = cache.get_or_compute("k", lambda: _result("ok"))
+        assert status == "miss"
+        assert result["text"] == "ok"
+
+    def test_async_requests_coalesce(self):
+        """Awaiting callers share one in-flight computation too."""
+        from result_cache import ResultCache
+
+        cache = ResultCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return _result("shared")
+
+        async def main():
+            return await asyncio.gather(
+                *(cache.get_or_compute_async("k", compute) for _ in range(5))
+            )
+
+        results = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert sorted(status for _, status in results) == ["coalesced"] * 4 + ["miss"]
+        assert cache.get_or_compute("k", lambda: _result("other"))[1] == "hit"
+
+
+class TestCacheKey:
+    """The key changes with anything that changes the transcription."""
+
+    def test_key_depends_on_audio_and_settings(self):
+        from result_cache import make_key
+
+        base = make_key(b"\x01\x02", "groq", "en", 1, 1)
+        assert make_key(b"\x01\x02", "groq", "en", 1, 1) == base
+        assert make_key(b"\x01\x03", "groq", "en", 1, 1) != base
+        assert make_key(b"\x01\x02", "openai", "en", 1, 1) != base
+        assert make_key(b"\x01\x02", "groq", "fr", 1, 1) != base
+        assert make_key(b"\x01\x02", "groq", "en", 2, 1) != base
+        assert make_key(b"\x01\x02", "groq", "en", 1, 2) != base
+
+    def test_router_key_ignores_wav_header(self, monkeypatch):
+        """Same PCM in differently-laid-out WAV files maps to the same key."""
+        from types import SimpleNamespace
+
+        import stt_engine
+        from audio_utils import _rebuild_wav
+
+        manager = SimpleNamespace(version=0)
+        monkeypatch.setattr(stt_engine, "get_stt_provider", lambda: "groq")
+        monkeypatch.setattr(stt_engine.vocabulary, "get_manager", lambda: manager)
+        monkeypatch.setattr(stt_engine.replacements, "get_manager", lambda: manager)
+        pcm = np.arange(1600, dtype=np.int16)
+        wav = _rebuild_wav(pcm)
+        # Insert a LIST chunk before "data" (as some encoders do)
+        extra = b"LIST" + (4).to_bytes(4, "little") + b"INFO"
+        wav_with_list = wav[:36] + extra + wav[36:]
+
+        assert stt_engine._result_cache_key(wav, "en") == stt_engine._result_cache_key(
+            wav_with_list, "en"
+        )
+
+
+class TestVersionCounters:
+    """Vocabulary and replacement managers expose a change counter."""
+
+    def test_vocabulary_version_bumps(self, monkeypatch, tmp_path):
+        import vocabulary
+
+        monkeypatch.setattr(vocabulary, "VOCABULARY_FILE", tmp_path / "vocab.txt")
+        monkeypatch.setattr(vocabulary, "USAGE_FILE", tmp_path / "usage.json")
+        manager = vocabulary.VocabularyManager()
+
+        before = manager.version
+        manager.add_word("Kubernetes")
+        assert manager.version > before
+
+        before = manager.version
+        manager.set_words(["Kubernetes", "FastAPI"])
+        assert manager.version > before
+
+    def test_replacements_version_bumps(self, monkeypatch, tmp_path):
+        import replacements
+
+        monkeypatch.setattr(
+            replacements, "REPLACEMENTS_FILE", tmp_path / "replacements.json"
+        )
+        manager = replacements.ReplacementManager()
+
+        before = manager.version
+        manager.add_replacement("pie torch", "PyTorch")
+        assert manager.version > before
+
+        before = manager.version
+        manager.set_replacements([])
+        assert manager.version > before
@@ -0,0 +1,140 @@
+"""Tests for the simulated provider."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    import simulated_stt
+
+    settings = {
+        "simulated_latency_ms": 20,
+        "simulated_latency_per_audio_s_ms": 0,
+        "simulated_jitter_ms": 0,
+        "simulated_error_rate": 0.0,
+        "simulated_max_concurrency": 8,
+        "replacements_enabled": False,
+        "content_filter": False,
+    }
+    monkeypatch.setattr(simulated_stt, "get_setting", settings.get)
+
+    from audio_utils import _rebuild_wav
+
+    samples = (np.sin(np.arange(32000) / 10) * 3000).astype(np.int16)
+    return SimpleNamespace(
+        stt=simulated_stt.SimulatedSTT(seed=1),
+        settings=settings,
+        wav=_rebuild_wav(samples),  # 2s
+    )
+
+
+class TestSimulatedSTT:
+    """simulated_stt.SimulatedSTT behaves like a configurable provider."""
+
+    def test_text_is_deterministic_and_sized_to_clip(self, sim):
+        first = sim.stt.transcribe(sim.wav, "en")
+        second = sim.stt.transcribe(sim.wav, "en")
+
+        assert first["text"] == second["text"]
+        assert len(first["text"].split()) == 5  # 2s at 2.5 words/s
+        assert first["provider"] == "simulated"
+        assert first["duration"] == pytest.approx(2.0)
+
+    def test_latency_includes_per_audio_second(self, sim):
+        sim.settings["simulated_latency_ms"] = 10
+        sim.settings["simulated_latency_per_audio_s_ms"] = 50
+
+        start = time.perf_counter()
+        sim.stt.transcribe(sim.wav)
+
+        assert time.perf_counter() - start >= 0.11
+
+    def test_error_injection(self, sim):
+        from simulated_stt import SimulatedProviderError
+
+        sim.settings["simulated_error_rate"] = 1.0
+
+        with pytest.raises(SimulatedProviderError):
+            sim.stt.transcribe(sim.wav)
+        assert sim.stt.stats()["errors"] == 1
+
+    def test_concurrency_limit_queues_async_requests(self, sim):
+        sim.settings["simulated_max_concurrency"] = 2
+        sim.settings["simulated_latency_ms"] = 50
+
+        async def main():
+            start = time.perf_counter()
+            await asyncio.gather(*(sim.stt.transcribe_async(sim.wav) for _ in range(6)))
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(main())
+
+        assert sim.stt.stats()["peak_in_flight"] == 2
+        assert elapsed >= 0.15
+
+
+class TestSimulatedRouting:
+    """stt_provider=simulated goes through the normal router."""
+
+    def test_router_uses_simulated_provider(self, sim, monkeypatch):
+        import audio_utils
+        import rate_limit
+        import simulated_stt
+        import stt_engine
+        from settings import _get_defaults
+
+        settings = {
+            **_get_defaults(),
+            **sim.settings,
+            "save_debug_audio": False,
+            "result_cache_enabled": False,
+        }
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        monkeypatch.setattr(audio_utils, "get_setting", settings.get)
+        monkeypatch.setattr(audio_utils, "get_min_volume_rms", lambda: 0)
+        monkeypatch.setattr(stt_engine, "get_stt_provider", lambda: "simulated")
+        monkeypatch.setattr(stt_engine, "_breakers", {})
+        monkeypatch.setattr(rate_limit, "_limiters", {})
+        monkeypatch.setattr(simulated_stt, "_simulated_stt", sim.stt)
+
+        result = asyncio.run(stt_engine.transcribe_audio_async(sim.wav, "en"))
+
+        assert result["provider"] == "simulated"
+        assert result["text"]
+        assert "failover_from" not in result
+
+    def test_injected_error_reaches_caller(self, sim, monkeypatch):
+        """Errors are not failed over to local or counted by a breaker."""
+        import audio_utils
+        import rate_limit
+        import simulated_stt
+        import stt_engine
+        from settings import _get_defaults
+
+        sim.settings["simulated_error_rate"] = 1.0
+        settings = {
+            **_get_defaults(),
+            **sim.settings,
+            "save_debug_audio": False,
+            "result_cache_enabled": False,
+            "fallback_order": "local",
+            "breaker_failure_threshold": 1,
+        }
+        monkeypatch.setattr(stt_engine, "get_setting", settings.get)
+        monkeypatch.setattr(audio_utils, "get_setting", settings.get)
+        monkeypatch.setattr(audio_utils, "get_min_volume_rms", lambda: 0)
+        monkeypatch.setattr(stt_engine, "get_stt_provider", lambda: "simulated")
+        monkeypatch.setattr(stt_engine, "_breakers", {})
+        monkeypatch.setattr(rate_limit, "_limiters", {})
+        monkeypatch.setattr(simulated_stt, "_simulated_stt", sim.stt)
+
+        for _ in range(2):
+            with pytest.raises(simulated_stt.SimulatedProviderError):
+                asyncio.run(stt_engine.transcribe_audio_async(sim.wav, "en"))
+
+        assert "simulated" not in stt_engine._breakers
@@ -0,0 +1,61 @@
+"""Tests for partial-transcript streaming (/api/transcribe?stream=true and /ws relay)."""
+
+import json
+
+import pytest
+
+
+async def _fake_transcribe(audio_data, language=None, on_partial=None):
+    """Stand-in for transcribe_audio_async that streams two partials."""
+    if on_partial is not None:
+        on_partial("hel")
+        on_partial("hello wor")
+    return {"text": "Hello world.", "language": "en", "provider": "local"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setattr(main, "transcribe_audio_async", _fake_transcribe)
+    monkeypatch.setattr(main.history, "add_entry", lambda text: None)
+    monkeypatch.setattr(main, "log_memory", lambda label: None)
+    return TestClient(main.app)
+
+
+def _post(client, **params):
+    return client.post(
+        "/api/transcribe",
+        params=params,
+        files={"file": ("audio.wav", b"RIFF0000WAVE", "audio/wav")},
+    )
+
+
+class TestTranscribeStream:
+    """The HTTP endpoint relays partials to the requesting client."""
+
+    def test_ndjson_partials_then_final(self, client):
+        response = _post(client, stream="true")
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        messages = [json.loads(line) for line in response.text.splitlines() if line]
+        assert [m["type"] for m in messages] == ["partial", "partial", "final"]
+        assert messages[1]["text"] == "hello wor"
+        assert messages[-1]["text"] == "Hello world."
+
+    def test_plain_response_unchanged(self, client):
+        """Without ?stream the endpoint still returns one JSON result."""
+        result = _post(client).json()
+
+        assert result["text"] == "Hello world."
+        assert "type" not in result
+
+    def test_observers_receive_partials(self, client):
+        with client.websocket_connect("/ws") as ws:
+            _post(client)
+            received = [ws.receive_json() for _ in range(3)]
+
+        assert [m["type"] for m in received] == ["partial", "partial", "final"]
+        assert received[-1]["text"] == "Hello world."
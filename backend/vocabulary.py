@@ -37,6 +37,7 @@ class VocabularyManager:
         self._last_modified: float = 0
         self._watcher_thread: threading.Thread | None = None
         self._stop_watcher = threading.Event()
+        self._version = 0  # Bumped whenever the word list or its order changes
 
         # Usage tracking
         self._usage: dict[str, int] = {}
@@ -51,6 +52,11 @@ class VocabularyManager:
         """Get current vocabulary words."""
         return self._words.copy()
 
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the vocabulary (or its order) changes."""
+        return self._version
+
     def _load_from_file(self) -> bool:
         """Load vocabulary from file. Returns True if changed."""
         if not VOCABULARY_FILE.exists():
@@ -87,6 +93,7 @@ class VocabularyManager:
             self._words = words
 
             if words != old_words:
+                self._version += 1
                 print(
                     f"[Vocabulary] Loaded {len(words)} words: {words[:5]}{'...' if len(words) > 5 else ''}"
                 )
@@ -103,7 +110,10 @@ class VocabularyManager:
         """Save vocabulary to file, ordered by usage frequency (most-used first)."""
         try:
             # Reorder by usage before saving
-            self._words = self._reorder_by_usage()
+            reordered = self._reorder_by_usage()
+            if reordered != self._words:
+                self._version += 1
+            self._words = reordered
 
             with open(VOCABULARY_FILE, "w", encoding="utf-8") as f:
                 f.write("# Custom vocabulary for speech-to-text\n")
@@ -148,6 +158,7 @@ class VocabularyManager:
             return False, "Word already exists"
 
         self._words.append(word)
+        self._version += 1
 
         # Initialize usage count for new word
         with self._usage_lock:
@@ -175,6 +186,7 @@ class VocabularyManager:
         for i, w in enumerate(self._words):
             if w.lower() == word.lower():
                 removed = self._words.pop(i)
+                self._version += 1
 
                 # Clean up usage data
                 with self._usage_lock:
@@ -194,6 +206,7 @@ class VocabularyManager:
     def set_words(self, words: list[str]) -> None:
         """Replace entire vocabulary (for bulk operations)."""
         self._words = [w.strip() for w in words if w.strip()]
+        self._version += 1
         self._save_to_file()
 
         if self._on_change:
@@ -429,6 +429,12 @@ function connectWebSocket() {
             return;
         }
 
+        // Handle partial text while a local model is still generating
+        if (data.type === 'partial') {
+            handlePartialResult(data);
+            return;
+        }
+
         // Handle transcription results
         handleTranscriptionResult(data);
     };
@@ -558,6 +564,8 @@ const PROVIDER_CONFIG = {
     openai: { icon: '☁️', name: 'OpenAI', title: 'OpenAI Whisper API' },
     groq: { icon: '🚀', name: 'Groq', title: 'Groq Whisper API (Fast)' },
     gemini: { icon: '✦', name: 'Gemini', title: 'Gemini API (LLM-based)' },
+    auto: { icon: '⚡', name: 'Auto', title: 'Auto (fastest provider for each clip)' },
+    simulated: { icon: '🧪', name: 'Sim', title: 'Simulated provider (offline load testing)' },
 };
 
 async function initProviderToggle() {
@@ -972,6 +980,14 @@ function handleStatusUpdate(data) {
     }
 }
 
+function handlePartialResult(data) {
+    if (!data.text) return;
+    // Show the tail of the text generated so far under the TRANSCRIBING label
+    const maxChars = 80;
+    const text = data.text.length > maxChars ? '…' + data.text.slice(-maxChars) : data.text;
+    elements.recHint.textContent = text;
+}
+
 function handleTranscriptionResult(result) {
     state.isProcessing = false;
     resetRecordingState();
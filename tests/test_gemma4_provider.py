@@ -126,7 +126,7 @@ for path, lang, label in TEST_FILES:
 
 print("\n=== Test 4: Transcription WITHOUT vocabulary (English only) ===")
 # Reset singleton to clear vocabulary
-gemma4_stt._gemma4_stt = None
+gemma4_stt.reset_gemma4_stt()
 stt_no_vocab = gemma4_stt.get_gemma4_stt()
 # Explicitly set empty vocabulary
 stt_no_vocab.set_vocabulary([])
@@ -165,7 +165,7 @@ except Exception as e:
 # ── Test 6: Auto-detect language (no language hint) ──────────────────────────
 
 print("\n=== Test 6: Auto-detect language (French audio, no lang hint) ===")
-gemma4_stt._gemma4_stt = None
+gemma4_stt.reset_gemma4_stt()
 stt_auto = gemma4_stt.get_gemma4_stt()
 stt_auto.set_vocabulary(VOCAB)
 